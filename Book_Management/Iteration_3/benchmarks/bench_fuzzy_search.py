@@ -0,0 +1,100 @@
+"""
+Latency benchmark for the fuzzy client-name search.
+
+Loads clients with names built from random syllables (tens of thousands of
+distinct first and last names, unlike the small name lists of datagen.py), then
+times building the name index and fuzzy searches for names with typos, against
+a linear scan comparing the query with every distinct name word.
+
+Run from the Iteration_3 folder:
+    python -m benchmarks.bench_fuzzy_search --clients 1000000
+"""
+
+import argparse
+import random
+import time
+
+from domain.domain import Client
+from repo.bk_tree import edit_distance
+from repo.repo_client import RepoClient
+from server.http_api import percentile
+
+SYLLABLES = ["an", "ba", "ce", "da", "el", "fi", "go", "ha", "in", "jo", "ka", "li", "ma", "ne",
+             "or", "pa", "qu", "ra", "si", "to", "ul", "va", "we", "xa", "yo", "za", "ber", "cor"]
+
+
+def make_words(rng, count):
+    """
+    Create distinct capitalised words from random syllables.
+
+    Args:
+        rng: The random generator
+        count: The number of words
+
+    Returns:
+        list: The words
+    """
+    words = set()
+    while len(words) < count:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize())
+    return sorted(words)
+
+
+def add_typo(rng, word):
+    """
+    Change one random character of a word (substitute, delete or insert).
+
+    Args:
+        rng: The random generator
+        word: The word to change
+
+    Returns:
+        str: The word with one typo
+    """
+    position = rng.randrange(len(word))
+    kind = rng.randrange(3)
+    if kind == 0:
+        return word[:position] + rng.choice("abcdefghijklmnopqrstuvwxyz") + word[position + 1:]
+    if kind == 1:
+        return word[:position] + word[position + 1:]
+    return word[:position] + rng.choice("abcdefghijklmnopqrstuvwxyz") + word[position:]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the fuzzy client-name search")
+    parser.add_argument("--clients", type=int, default=1000000)
+    parser.add_argument("--first-names", type=int, default=5000)
+    parser.add_argument("--last-names", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    first_names = make_words(rng, args.first_names)
+    last_names = make_words(rng, args.last_names)
+    repo = RepoClient()
+    start = time.perf_counter()
+    repo.add_clients([Client(i, f"{rng.choice(first_names)} {rng.choice(last_names)}") for i in range(args.clients)])
+    print(f"add {args.clients} clients: {time.perf_counter() - start:.2f} s")
+
+    start = time.perf_counter()
+    repo.fuzzy_search_by_name("warm up")
+    print(f"build name index ({len(repo._name_tree)} distinct words): {time.perf_counter() - start:.2f} s")
+
+    distinct_words = list(repo._name_index)
+    for max_distance in (1, 2):
+        queries = [add_typo(rng, rng.choice(last_names)).lower() for _ in range(args.queries)]
+        latencies = []
+        for query in queries:
+            start = time.perf_counter()
+            repo.fuzzy_search_by_name(query, max_distance)
+            latencies.append(time.perf_counter() - start)
+        latencies.sort()
+        scan = []
+        for query in queries[:20]:
+            start = time.perf_counter()
+            [word for word in distinct_words if edit_distance(query, word, max_distance) <= max_distance]
+            scan.append(time.perf_counter() - start)
+        print(f"k={max_distance}: BK-tree p50 {percentile(latencies, 0.5) * 1000:.2f} ms, "
+              f"p99 {percentile(latencies, 0.99) * 1000:.2f} ms; "
+              f"linear scan of the words mean {sum(scan) / len(scan) * 1000:.2f} ms")
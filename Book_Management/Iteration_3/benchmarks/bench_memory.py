@@ -0,0 +1,102 @@
+"""
+Memory benchmark for the author dictionary and the interned client names.
+
+The seeded catalog (see benchmarks/datagen.py) is written to CSV text and parsed
+back, so every record gets its own strings like records read from a file or a
+request do. The same records are then loaded into the Iteration_2 repositories,
+which keep every string as it arrives, and into the Iteration_3 repositories.
+Prints the bytes held per book and per client, and the time of an author filter.
+
+Run from the Iteration_3 folder:
+    python -m benchmarks.bench_memory --books 200000 --clients 200000
+"""
+
+import argparse
+import csv
+import io
+import time
+import tracemalloc
+
+from domain.domain import Book, Client
+from repo.repo_book import RepoBook
+from repo.repo_client import RepoClient
+from benchmarks.datagen import generate_books, generate_clients
+from benchmarks.compare_iterations import load_generation
+
+
+def parsed_rows(rows):
+    """
+    Round-trip rows through CSV text so that every field is a separate string object.
+
+    Args:
+        rows: An iterable of tuples
+
+    Returns:
+        list: The parsed rows, with the integer first column converted back
+    """
+    text = io.StringIO()
+    csv.writer(text).writerows(rows)
+    text.seek(0)
+    return [(int(row[0]), *row[1:]) for row in csv.reader(text)]
+
+
+def measure(load):
+    """
+    Measure the memory held after running a loading function.
+
+    Args:
+        load: A function loading the records and returning the repository
+
+    Returns:
+        tuple: (repository, bytes allocated and still held)
+    """
+    tracemalloc.start()
+    try:
+        repo = load()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return repo, current
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure the memory of the book and client repositories")
+    parser.add_argument("--books", type=int, default=200000)
+    parser.add_argument("--clients", type=int, default=200000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    book_rows = parsed_rows(generate_books(args.books, args.seed))
+    client_rows = parsed_rows(generate_clients(args.clients, args.seed))
+    baseline = load_generation('Iteration_2')
+
+    def load_books(repo_class, book_class):
+        repo = repo_class()
+        for fields in parsed_rows(book_rows):
+            repo.add_book(book_class(*fields))
+        return repo
+
+    def load_clients(repo_class, client_class):
+        repo = repo_class()
+        for fields in parsed_rows(client_rows):
+            repo.add_client(client_class(*fields))
+        return repo
+
+    old_books, old_book_bytes = measure(lambda: load_books(baseline.RepoBook, baseline.Book))
+    new_books, new_book_bytes = measure(lambda: load_books(RepoBook, Book))
+    _, old_client_bytes = measure(lambda: load_clients(baseline.RepoClient, baseline.Client))
+    _, new_client_bytes = measure(lambda: load_clients(RepoClient, Client))
+
+    print(f"{'':<24}{'Iteration_2':>14}{'Iteration_3':>14}")
+    print(f"{'bytes per book':<24}{old_book_bytes / args.books:>14.0f}{new_book_bytes / args.books:>14.0f}")
+    print(f"{'bytes per client':<24}{old_client_bytes / args.clients:>14.0f}{new_client_bytes / args.clients:>14.0f}")
+
+    author = book_rows[0][3]
+    start = time.perf_counter()
+    expected = [book for book in old_books.get_all_books() if book.author == author]
+    old_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    found = new_books.find_books_by_author(author)
+    new_seconds = time.perf_counter() - start
+    assert len(found) == len(expected)
+    print(f"{'author filter (ms)':<24}{old_seconds * 1000:>14.2f}{new_seconds * 1000:>14.2f}")
@@ -0,0 +1,92 @@
+"""
+Benchmark for the parallel ServiceRental reports.
+
+Times get_most_rented_books and get_most_active_clients with the serial
+repository counting and with a ParallelRentalCounter using 1, 2, 4, 8 and 16
+worker processes, and prints the speed-up over the serial version.
+
+Run from the Iteration_3 folder:
+    python -m benchmarks.bench_parallel_reports --rentals 2000000
+"""
+
+import argparse
+import random
+import time
+
+from domain.domain import Book, Client, Rental
+from repo.repo_book import RepoBook
+from repo.repo_client import RepoClient
+from repo.repo_rental import RepoRental
+from controller.service_rental import ServiceRental
+from controller.parallel_reports import ParallelRentalCounter
+
+
+def build_service(rental_count, book_count, client_count, seed):
+    """
+    Create repositories filled with random rentals.
+
+    Args:
+        rental_count: The number of rentals to generate
+        book_count: The number of books to generate
+        client_count: The number of clients to generate
+        seed: The seed for the random generator
+
+    Returns:
+        tuple: The rental, book and client repositories
+    """
+    rng = random.Random(seed)
+    book_repo = RepoBook()
+    client_repo = RepoClient()
+    rental_repo = RepoRental()
+    for i in range(book_count):
+        book_repo.add_book(Book(i, f"Book {i}", "Desc", "Author"))
+    for i in range(client_count):
+        client_repo.add_client(Client(i, f"Client {i}"))
+    for i in range(rental_count):
+        rental_repo.add_rental(Rental(i, rng.randrange(book_count), rng.randrange(client_count),
+                                      "2024-01-01", "2024-01-02"))
+    return rental_repo, book_repo, client_repo
+
+
+def time_reports(service, repeat):
+    """
+    Return the best time of running both reports.
+
+    Args:
+        service: The ServiceRental to time
+        repeat: How many times to run the reports
+
+    Returns:
+        float: The fastest run in seconds
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        service.get_most_rented_books()
+        service.get_most_active_clients()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the parallel rental reports")
+    parser.add_argument("--rentals", type=int, default=1000000)
+    parser.add_argument("--books", type=int, default=10000)
+    parser.add_argument("--clients", type=int, default=5000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    repos = build_service(args.rentals, args.books, args.clients, args.seed)
+    serial = time_reports(ServiceRental(*repos), args.repeat)
+    print(f"{args.rentals} rentals")
+    print(f"{'mode':>12} {'seconds':>10} {'speed-up':>10}")
+    print(f"{'serial':>12} {serial:>10.4f} {1.0:>10.2f}")
+    for workers in args.workers:
+        counter = ParallelRentalCounter(workers)
+        try:
+            elapsed = time_reports(ServiceRental(*repos, counter), args.repeat)
+        finally:
+            counter.close()
+        print(f"{f'{workers} workers':>12} {elapsed:>10.4f} {serial / elapsed:>10.2f}")
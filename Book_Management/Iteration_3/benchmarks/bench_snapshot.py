@@ -0,0 +1,79 @@
+"""
+Benchmark for the binary repository snapshots.
+
+Writes a snapshot of a seeded catalog (see benchmarks/datagen.py), then compares
+opening it lazily with re-creating every Book, Client and Rental object, and
+times a few typical operations on the lazy repositories.
+
+Run from the Iteration_3 folder:
+    python -m benchmarks.bench_snapshot --size 1000000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from domain.domain import Book, Client, Rental
+from repo.repo_book import RepoBook
+from repo.repo_client import RepoClient
+from repo.repo_rental import RepoRental
+from repo.repo_snapshot import load_snapshot, write_snapshot
+from benchmarks.datagen import generate_books, generate_clients, generate_rentals
+
+
+def timed(label, function):
+    """
+    Run a function and print how long it took.
+
+    Args:
+        label: The name printed for the step
+        function: The function to run
+
+    Returns:
+        The result of the function
+    """
+    start = time.perf_counter()
+    result = function()
+    print(f"{label:<36} {(time.perf_counter() - start) * 1000:>10.1f} ms")
+    return result
+
+
+def build_repositories(size, seed):
+    """
+    Create in-memory repositories holding a seeded catalog.
+
+    Args:
+        size: The number of books, clients and rentals
+        seed: The seed for the synthetic data
+
+    Returns:
+        tuple: (RepoBook, RepoClient, RepoRental)
+    """
+    book_repo, client_repo, rental_repo = RepoBook(), RepoClient(), RepoRental()
+    book_repo.add_books([Book(*fields) for fields in generate_books(size, seed)])
+    client_repo.add_clients([Client(*fields) for fields in generate_clients(size, seed)])
+    rental_repo.add_rentals([Rental(*fields) for fields in generate_rentals(size, size, size, seed)])
+    return book_repo, client_repo, rental_repo
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the binary repository snapshots")
+    parser.add_argument("--size", type=int, default=1000000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.gettempdir(), f"bench_snapshot_{args.size}.snap")
+    repos = timed(f"create {args.size} records of each type", lambda: build_repositories(args.size, args.seed))
+    timed("write snapshot", lambda: write_snapshot(path, *repos))
+    print(f"{'snapshot size':<36} {os.path.getsize(path) / 2 ** 20:>10.1f} MB")
+    del repos
+
+    snapshot, book_repo, client_repo, rental_repo = timed("open snapshot (lazy)", lambda: load_snapshot(path))
+    timed("find client by ID", lambda: client_repo.find_client_by_id(args.size // 2))
+    timed("find book by ID", lambda: book_repo.find_book_by_id(args.size // 2))
+    timed("search books by title", lambda: book_repo.search_by_title("Forgotten Star"))
+    timed("count rentals by book", rental_repo.count_by_book)
+    timed("materialise every book", lambda: list(book_repo.get_all_books()))
+    snapshot.close()
+    os.remove(path)
@@ -0,0 +1,189 @@
+"""
+Benchmark suite for the Book Management System (Iteration_3).
+
+For every requested catalog size the suite loads seeded synthetic books, clients
+and rentals (see benchmarks/datagen.py) through the services and times:
+adding books and clients, finding by ID, searching by title and name, renting,
+returning and every ServiceRental report. Results are written as JSON, and a
+previous results file can be passed with --compare to print the change per
+operation, so runs of different backends or commits can be compared.
+
+Run from the Iteration_3 folder:
+    python -m benchmarks.bench_suite --sizes 10000 100000 --out results.json
+    python -m benchmarks.bench_suite --sizes 10000 100000 --compare results.json
+
+Sizes of 10M need several GB of memory for the in-memory repositories.
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from datetime import datetime
+
+from domain.domain import Book, Client, Rental
+from repo.repo_book import RepoBook
+from repo.repo_client import RepoClient
+from repo.repo_rental import RepoRental
+from repo.repo_sharded import ShardedRepoBook, ShardedRepoClient, ShardedRepoRental
+from controller.service_book import ServiceBook
+from controller.service_client import ServiceClient
+from controller.service_rental import ServiceRental
+from benchmarks.datagen import WORDS, FIRST_NAMES, generate_books, generate_clients, generate_rentals
+
+# Backend name -> function creating the (book, client, rental) repositories
+BACKENDS = {
+    'iteration3': lambda: (RepoBook(), RepoClient(), RepoRental()),
+    'sharded': lambda: (ShardedRepoBook(4), ShardedRepoClient(4), ShardedRepoRental(4)),
+}
+
+
+class Timer:
+    def __init__(self, results, size, operation, ops):
+        """
+        Initialize a timer that appends one result when its block ends.
+
+        Args:
+            results: The list receiving the result dictionaries
+            size: The catalog size of the run
+            operation: The name of the timed operation
+            ops: The number of operations performed in the block
+        """
+        self._results = results
+        self._size = size
+        self._operation = operation
+        self._ops = ops
+
+    def __enter__(self):
+        """
+        Start timing the block.
+        """
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        """
+        Stop timing the block and append its result.
+        """
+        seconds = time.perf_counter() - self._start
+        self._results.append({'size': self._size, 'operation': self._operation, 'ops': self._ops,
+                              'seconds': seconds, 'us_per_op': seconds * 1e6 / max(1, self._ops)})
+        return False
+
+
+def run_size(backend, size, queries, seed):
+    """
+    Load a catalog of the given size and time every operation on it.
+
+    Args:
+        backend: The name of the backend in BACKENDS
+        size: The number of books, clients and rentals to load
+        queries: The number of operations timed for finds, searches, rents and returns
+        seed: The seed for the synthetic data and the queries
+
+    Returns:
+        list: One result dictionary per operation
+    """
+    results = []
+    rng = random.Random(seed)
+    book_repo, client_repo, rental_repo = BACKENDS[backend]()
+    book_service = ServiceBook(book_repo)
+    client_service = ServiceClient(client_repo)
+    rental_service = ServiceRental(rental_repo, book_repo, client_repo)
+
+    books = [Book(*fields) for fields in generate_books(size, seed)]
+    clients = [Client(*fields) for fields in generate_clients(size, seed)]
+    rentals = [Rental(*fields) for fields in generate_rentals(size, size, size, seed)]
+
+    with Timer(results, size, 'add_book', size):
+        for book in books:
+            book_service.add_book(book)
+    with Timer(results, size, 'add_client', size):
+        for client in clients:
+            client_service.add_client(client)
+    with Timer(results, size, 'add_rentals_batch', size):
+        rental_repo.add_rentals(rentals)
+
+    ids = [rng.randrange(size) for _ in range(queries)]
+    with Timer(results, size, 'find_book', queries):
+        for book_id in ids:
+            book_service.find_book_by_id(book_id)
+    with Timer(results, size, 'find_client', queries):
+        for client_id in ids:
+            client_service.find_client_by_id(client_id)
+    with Timer(results, size, 'search_title', queries):
+        for _ in range(queries):
+            book_service.search_by_title(rng.choice(WORDS))
+    with Timer(results, size, 'search_name', queries):
+        for _ in range(queries):
+            client_service.search_by_name(rng.choice(FIRST_NAMES))
+
+    rented = rng.sample(range(size), min(queries, size))
+    with Timer(results, size, 'rent', len(rented)):
+        for offset, book_id in enumerate(rented):
+            rental_service.add_rental(size + offset, book_id, rng.randrange(size), "2025-01-01")
+    with Timer(results, size, 'return', len(rented)):
+        for offset in range(len(rented)):
+            rental_service.return_book(size + offset, "2025-01-15")
+
+    with Timer(results, size, 'report_most_rented', 1):
+        rental_service.get_most_rented_books()
+    with Timer(results, size, 'report_most_active', 1):
+        rental_service.get_most_active_clients()
+    with Timer(results, size, 'report_borrowers', 10):
+        for _ in range(10):
+            rental_service.get_report_book_borrowers(rng.randrange(size))
+
+    for repo in (book_repo, client_repo, rental_repo):
+        if hasattr(repo, 'close'):
+            repo.close()
+    return results
+
+
+def compare(results, previous):
+    """
+    Print the change of every operation against a previous results file.
+
+    Args:
+        results: The result dictionaries of this run
+        previous: The parsed JSON of a previous run
+    """
+    before = {(item['size'], item['operation']): item['us_per_op'] for item in previous['results']}
+    print(f"\nCompared with {previous['meta']['backend']} run of {previous['meta']['timestamp']}:")
+    for item in results:
+        key = (item['size'], item['operation'])
+        if key in before and before[key] > 0:
+            change = (item['us_per_op'] - before[key]) / before[key] * 100
+            print(f"{item['size']:>10} {item['operation']:<20} {before[key]:>12.2f} -> {item['us_per_op']:>12.2f} us/op ({change:+.1f}%)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Book Management repositories and services")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--queries", type=int, default=100,
+                        help="operations timed for finds, searches, rents and returns")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default='iteration3')
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="a previous JSON results file to compare with")
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        size_results = run_size(args.backend, size, args.queries, args.seed)
+        for item in size_results:
+            print(f"{size:>10} {item['operation']:<20} {item['ops']:>10} ops {item['us_per_op']:>12.2f} us/op")
+        results.extend(size_results)
+
+    report = {'meta': {'backend': args.backend, 'seed': args.seed, 'queries': args.queries,
+                       'timestamp': datetime.now().isoformat(timespec='seconds'),
+                       'python': sys.version.split()[0], 'platform': platform.platform()},
+              'results': results}
+    if args.out:
+        with open(args.out, 'w') as file:
+            json.dump(report, file, indent=2)
+    if args.compare:
+        with open(args.compare) as file:
+            compare(results, json.load(file))
@@ -0,0 +1,387 @@
+"""
+Regression gate comparing the repository generations of the Book Management System.
+
+Iteration_1, Iteration_2 and Iteration_3 all use the same module names (domain,
+repo, controller), so each generation is imported on its own with its folder at
+the front of sys.path. The same seeded workloads run against every generation's
+RepoBook/RepoClient through its ServiceBook/ServiceClient. The harness records
+throughput and memory per record, and exits with status 1 if a generation is
+slower than the one before it by more than the allowed ratio.
+
+Run from the Iteration_3 folder:
+    python -m benchmarks.compare_iterations --size 20000 --threshold 1.10
+    python -m benchmarks.compare_iterations --thresholds thresholds.json --out history.json
+
+A thresholds file maps workload names to allowed slowdown ratios, with an optional
+"default" entry, e.g. {"default": 1.10, "search_title": 1.25}. A generation label
+maps to overrides for that generation only, for a slowdown it trades on purpose,
+e.g. {"Iteration_3": {"add_book": 2.0}}.
+
+To evaluate a new storage backend, add its folder to GENERATIONS after the
+generation it should be compared with.
+
+In each of --repeat interleaved rounds every workload runs, again and again on a
+fresh setup, for at least --min-time seconds. A workload fails the gate only if
+it is slower than allowed in every round: noise from other processes only ever
+adds time, so it can hide a regression in one round but cannot make a workload
+fail in all of them. Raise --repeat to make a failure more certain.
+"""
+
+import argparse
+import gc
+import importlib
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+from benchmarks.datagen import WORDS, FIRST_NAMES, generate_books, generate_clients
+
+BOOK_MANAGEMENT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Generations in the order they are compared (each one against the previous)
+GENERATIONS = ['Iteration_1', 'Iteration_2', 'Iteration_3']
+
+# Top-level packages every generation defines
+GENERATION_PACKAGES = ('domain', 'repo', 'controller')
+
+WORKLOADS = ('add_book', 'add_client', 'search_title', 'search_name',
+             'update_book', 'update_client', 'remove_book', 'remove_client')
+
+
+class Generation:
+    def __init__(self, label, modules):
+        """
+        Initialize a generation from its imported modules.
+
+        Args:
+            label: The generation name (its folder name)
+            modules: A dictionary of the imported modules by dotted name
+        """
+        self.label = label
+        self.Book = modules['domain.domain'].Book
+        self.Client = modules['domain.domain'].Client
+        self.RepoBook = modules['repo.repo_book'].RepoBook
+        self.RepoClient = modules['repo.repo_client'].RepoClient
+        self.ServiceBook = modules['controller.service_book'].ServiceBook
+        self.ServiceClient = modules['controller.service_client'].ServiceClient
+
+
+def _is_generation_module(name):
+    """
+    Return True if a module name belongs to one of the generation packages.
+
+    Args:
+        name: The dotted module name
+
+    Returns:
+        bool: True for domain, repo and controller modules
+    """
+    return name.split('.')[0] in GENERATION_PACKAGES
+
+
+def load_generation(folder):
+    """
+    Import one generation without mixing its modules with those of other generations.
+
+    Args:
+        folder: The generation folder name inside Book_Management
+
+    Returns:
+        Generation: The classes of the generation
+    """
+    path = os.path.join(BOOK_MANAGEMENT_DIR, folder)
+    saved = {name: module for name, module in sys.modules.items() if _is_generation_module(name)}
+    for name in saved:
+        del sys.modules[name]
+    sys.path.insert(0, path)
+    try:
+        modules = {name: importlib.import_module(name) for name in
+                   ('domain.domain', 'repo.repo_book', 'repo.repo_client',
+                    'controller.service_book', 'controller.service_client')}
+    finally:
+        sys.path.remove(path)
+        for name in [name for name in sys.modules if _is_generation_module(name)]:
+            del sys.modules[name]
+        sys.modules.update(saved)
+    return Generation(folder, modules)
+
+
+def build_workloads(generation, size, queries, seed):
+    """
+    Build the workloads of a generation as (setup, step) pairs.
+
+    setup() returns fresh services in the state the workload starts from and is not
+    timed; step(services) runs the workload and returns the number of operations. The
+    queries are drawn once, so every run of a workload does the same work.
+
+    Args:
+        generation (Generation): The generation to run
+        size: The number of books and clients to load
+        queries: The number of searches, updates and removals
+        seed: The seed for the data and the queries
+
+    Returns:
+        dict: Workload name -> (setup, step), in the order of WORKLOADS
+    """
+    rng = random.Random(seed)
+    books = [generation.Book(*fields) for fields in generate_books(size, seed)]
+    clients = [generation.Client(*fields) for fields in generate_clients(size, seed)]
+    ids = rng.sample(range(size), min(queries, size))
+    titles = [rng.choice(WORDS) for _ in range(queries)]
+    names = [rng.choice(FIRST_NAMES) for _ in range(queries)]
+
+    def empty_books():
+        return generation.ServiceBook(generation.RepoBook())
+
+    def empty_clients():
+        return generation.ServiceClient(generation.RepoClient())
+
+    def loaded_books():
+        service = empty_books()
+        for book in books:
+            service.add_book(book)
+        return service
+
+    def loaded_clients():
+        service = empty_clients()
+        for client in clients:
+            service.add_client(client)
+        return service
+
+    def add_books(service):
+        for book in books:
+            service.add_book(book)
+        return len(books)
+
+    def add_clients(service):
+        for client in clients:
+            service.add_client(client)
+        return len(clients)
+
+    def search_titles(service):
+        for title in titles:
+            service.search_by_title(title)
+        return len(titles)
+
+    def search_names(service):
+        for name in names:
+            service.search_by_name(name)
+        return len(names)
+
+    def update_books(service):
+        for i in ids:
+            service.update_book(generation.Book(i, "Updated", "Desc", "Author"))
+        return len(ids)
+
+    def update_clients(service):
+        for i in ids:
+            service.update_client(generation.Client(i, "Updated"))
+        return len(ids)
+
+    def remove_books(service):
+        for i in ids:
+            service.remove_book(i)
+        return len(ids)
+
+    def remove_clients(service):
+        for i in ids:
+            service.remove_client(i)
+        return len(ids)
+
+    return {'add_book': (empty_books, add_books),
+            'add_client': (empty_clients, add_clients),
+            'search_title': (loaded_books, search_titles),
+            'search_name': (loaded_clients, search_names),
+            'update_book': (loaded_books, update_books),
+            'update_client': (loaded_clients, update_clients),
+            'remove_book': (loaded_books, remove_books),
+            'remove_client': (loaded_clients, remove_clients)}
+
+
+def time_workload(setup, step, min_time):
+    """
+    Time a workload, running it again on a fresh setup until it has run for min_time.
+
+    The garbage collector is paused while timing; setup is not timed.
+
+    Args:
+        setup: Returns the fresh state the workload starts from
+        step: Runs the workload on that state and returns the number of operations
+        min_time: The minimum total time in seconds to run the workload for
+
+    Returns:
+        tuple: (seconds, operations) summed over all the runs
+    """
+    seconds = operations = 0
+    while seconds < min_time or not operations:
+        state = setup()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            operations += step(state)
+            seconds += time.perf_counter() - start
+        finally:
+            gc.enable()
+    return seconds, operations
+
+
+def run_workloads(generation, size, queries, seed):
+    """
+    Run every workload once on fresh repositories of a generation.
+
+    Args:
+        generation (Generation): The generation to run
+        size: The number of books and clients to load
+        queries: The number of searches, updates and removals
+        seed: The seed for the data and the queries
+
+    Returns:
+        dict: Workload name -> (seconds, operations)
+    """
+    return {name: time_workload(setup, step, 0)
+            for name, (setup, step) in build_workloads(generation, size, queries, seed).items()}
+
+
+def measure_memory(generation, size, seed):
+    """
+    Measure the memory held by a generation's repositories after loading the catalog.
+
+    Args:
+        generation (Generation): The generation to measure
+        size: The number of books and clients to load
+        seed: The seed for the data
+
+    Returns:
+        float: Bytes allocated per loaded record (book or client)
+    """
+    tracemalloc.start()
+    try:
+        book_repo = generation.RepoBook()
+        client_repo = generation.RepoClient()
+        for fields in generate_books(size, seed):
+            book_repo.add_book(generation.Book(*fields))
+        for fields in generate_clients(size, seed):
+            client_repo.add_client(generation.Client(*fields))
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return current / (2 * size)
+
+
+def benchmark_generations(generations, size, queries, seed, repeat, min_time=0.2):
+    """
+    Benchmark every generation, keeping the time per operation of each workload in every round.
+
+    Each of the repeat rounds times every workload of every generation for at least
+    min_time seconds, with the generations interleaved (1, 2, 3, 1, 2, 3, ...) so
+    that a round compares the generations under the same load. The fastest round
+    of each workload is reported.
+
+    Args:
+        generations: The Generation objects in comparison order
+        size: The number of books and clients to load
+        queries: The number of searches, updates and removals
+        seed: The seed for the data and the queries
+        repeat: The number of rounds
+        min_time: The minimum time in seconds each workload runs for in a round
+
+    Returns:
+        list: One dictionary per generation with the seconds per operation of every
+        round, the fastest of them, the throughputs and the memory per record
+    """
+    workloads = [build_workloads(generation, size, queries, seed) for generation in generations]
+    samples = [{name: [] for name in WORKLOADS} for _ in generations]
+    for _ in range(repeat):
+        for name in WORKLOADS:
+            for generation_workloads, generation_samples in zip(workloads, samples):
+                seconds, operations = time_workload(*generation_workloads[name], min_time)
+                generation_samples[name].append(seconds / operations)
+    fastest = [{name: min(times) for name, times in generation_samples.items()}
+               for generation_samples in samples]
+    return [{'label': generation.label,
+             'seconds': generation_fastest,
+             'rounds': generation_samples,
+             'ops_per_sec': {name: 1 / seconds if seconds else float('inf')
+                             for name, seconds in generation_fastest.items()},
+             'bytes_per_record': measure_memory(generation, size, seed)}
+            for generation, generation_fastest, generation_samples in zip(generations, fastest, samples)]
+
+
+def check_regressions(results, thresholds):
+    """
+    Compare each generation with the previous one and list the workloads that got too slow.
+
+    A workload is too slow if its ratio to the previous generation exceeds the allowed
+    ratio in every round, so the smallest ratio over the rounds is compared. Results
+    without rounds are compared by their seconds.
+
+    Args:
+        results: The benchmark results in generation order
+        thresholds: Workload name -> allowed ratio of new time to old time ("default" for the
+            rest); a generation label maps to its own overrides, e.g. {"Iteration_3": {"add_book": 2.0}}
+
+    Returns:
+        list: A message for every workload that exceeds its threshold
+    """
+    failures = []
+    for old, new in zip(results, results[1:]):
+        for name, new_seconds in new['seconds'].items():
+            old_seconds = old['seconds'].get(name)
+            if not old_seconds:
+                continue
+            rounds = zip(new.get('rounds', {}).get(name, ()), old.get('rounds', {}).get(name, ()))
+            ratio = min((new_time / old_time for new_time, old_time in rounds if old_time),
+                        default=new_seconds / old_seconds)
+            allowed = thresholds.get(new['label'], {}).get(
+                name, thresholds.get(name, thresholds.get('default', 1.10)))
+            if ratio > allowed:
+                failures.append(f"{new['label']} {name} is at least {ratio:.2f}x slower than {old['label']} "
+                                f"in every round (allowed {allowed:.2f}x)")
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the Book Management repository generations")
+    parser.add_argument("--size", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="minimum seconds each workload runs for in a round")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--threshold", type=float, default=1.10,
+                        help="allowed slowdown ratio of a generation over the previous one")
+    parser.add_argument("--thresholds", help="JSON file with per-workload slowdown ratios")
+    parser.add_argument("--out", help="append the results of this run to a JSON history file")
+    args = parser.parse_args()
+
+    thresholds = {'default': args.threshold}
+    if args.thresholds:
+        with open(args.thresholds) as file:
+            thresholds.update(json.load(file))
+
+    generations = [load_generation(folder) for folder in GENERATIONS]
+    results = benchmark_generations(generations, args.size, args.queries, args.seed, args.repeat,
+                                    args.min_time)
+
+    print(f"{'workload':<16}" + "".join(f"{result['label']:>16}" for result in results) + "   (ops/s)")
+    for name in WORKLOADS:
+        print(f"{name:<16}" + "".join(f"{result['ops_per_sec'][name]:>16.0f}" for result in results))
+    print(f"{'bytes/record':<16}" + "".join(f"{result['bytes_per_record']:>16.0f}" for result in results))
+
+    if args.out:
+        history = []
+        if os.path.exists(args.out):
+            with open(args.out) as file:
+                history = json.load(file)
+        history.append({'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'), 'size': args.size,
+                        'queries': args.queries, 'seed': args.seed, 'results': results})
+        with open(args.out, 'w') as file:
+            json.dump(history, file, indent=2)
+
+    failures = check_regressions(results, thresholds)
+    for failure in failures:
+        print(f"REGRESSION: {failure}")
+    sys.exit(1 if failures else 0)
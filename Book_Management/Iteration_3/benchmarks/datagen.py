@@ -0,0 +1,89 @@
+"""
+Seeded synthetic data for the Book Management benchmarks.
+
+The generators yield plain tuples instead of domain objects, so the same data can
+be loaded into any generation of the repositories (Iteration_1, 2 or 3). The
+same seed always produces the same data.
+"""
+
+import random
+
+WORDS = ["Shadow", "River", "Empire", "Garden", "Winter", "Silent", "Golden", "Broken",
+         "Stone", "Night", "Ocean", "Iron", "Secret", "Last", "Hidden", "Wild",
+         "Glass", "Crimson", "Forgotten", "Northern", "Paper", "Burning", "Lost", "Star"]
+
+FIRST_NAMES = ["Alice", "Bob", "Carol", "David", "Elena", "Filip", "Greta", "Horia",
+               "Ioana", "Jonas", "Katya", "Luca", "Maria", "Nikolai", "Olivia", "Paul",
+               "Radu", "Sofia", "Tudor", "Vera"]
+
+LAST_NAMES = ["Popescu", "Smith", "Ionescu", "Novak", "Meyer", "Rossi", "Dumitru", "Kowalski",
+              "Garcia", "Stan", "Berg", "Moreau", "Costa", "Lindqvist", "Marin", "Horvat"]
+
+
+def generate_books(count, seed=0, author_count=None):
+    """
+    Generate book records.
+
+    Args:
+        count: The number of books to generate
+        seed: The seed for the random generator
+        author_count: The number of distinct authors (defaults to count // 20, at least 1)
+
+    Yields:
+        tuple: (id, title, description, author)
+    """
+    rng = random.Random(seed)
+    author_count = author_count or max(1, count // 20)
+    authors = [f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {i}" for i in range(author_count)]
+    for book_id in range(count):
+        title = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4)))
+        description = f"A {rng.choice(WORDS).lower()} story about {rng.choice(WORDS).lower()} things."
+        yield book_id, title, description, authors[rng.randrange(author_count)]
+
+
+def generate_clients(count, seed=0):
+    """
+    Generate client records.
+
+    Args:
+        count: The number of clients to generate
+        seed: The seed for the random generator
+
+    Yields:
+        tuple: (id, name)
+    """
+    rng = random.Random(seed + 1)
+    for client_id in range(count):
+        yield client_id, f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def generate_rentals(count, book_count, client_count, seed=0, open_fraction=0.0):
+    """
+    Generate rental records over existing book and client IDs.
+
+    Popular books and active clients are rented more often (the IDs are drawn
+    from a skewed distribution), like in a real library.
+
+    Args:
+        count: The number of rentals to generate
+        book_count: The number of books the rentals refer to
+        client_count: The number of clients the rentals refer to
+        seed: The seed for the random generator
+        open_fraction: The fraction of rentals that are not returned yet
+
+    Yields:
+        tuple: (id, book_id, client_id, rented_date, returned_date or None)
+    """
+    rng = random.Random(seed + 2)
+    open_books = set()
+    for rental_id in range(count):
+        book_id = min(book_count - 1, int(rng.paretovariate(1.2)) - 1)
+        book_id = (book_id * 7919 + rng.randrange(book_count)) % book_count if rng.random() < 0.5 else book_id
+        client_id = min(client_count - 1, int(rng.expovariate(1 / max(1, client_count / 10))))
+        day = rng.randrange(1, 29)
+        rented_date = f"2024-{rng.randint(1, 12):02d}-{day:02d}"
+        returned_date = f"{rented_date[:8]}{min(28, day + rng.randint(0, 14)):02d}"
+        if rng.random() < open_fraction and book_id not in open_books:
+            open_books.add(book_id)
+            returned_date = None
+        yield rental_id, book_id, client_id, rented_date, returned_date
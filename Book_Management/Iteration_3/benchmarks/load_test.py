@@ -0,0 +1,132 @@
+"""
+Load test for the Book Management HTTP API.
+
+Starts the API on a free local port (or targets --port of an already running
+server), loads some books and clients, then runs a number of client threads that
+each keep one connection open and send a mix of book lookups, title searches
+and report requests. Prints the throughput and the p50/p99 latency.
+
+Run from the Iteration_3 folder:
+    python -m benchmarks.load_test --threads 8 --requests 2000
+"""
+
+import argparse
+import http.client
+import json
+import random
+import threading
+import time
+
+from repo.repo_book import RepoBook
+from repo.repo_client import RepoClient
+from repo.repo_rental import RepoRental
+from controller.service_book import ServiceBook
+from controller.service_client import ServiceClient
+from controller.service_rental import ServiceRental
+from server.http_api import BookManagementApi, ThreadPoolHTTPServer, percentile
+
+
+def start_server(workers):
+    """
+    Start the API on a free local port in a background thread.
+
+    Args:
+        workers: The number of server worker threads
+
+    Returns:
+        ThreadPoolHTTPServer: The running server
+    """
+    book_repo = RepoBook()
+    client_repo = RepoClient()
+    rental_repo = RepoRental()
+    api = BookManagementApi(ServiceBook(book_repo), ServiceClient(client_repo),
+                            ServiceRental(rental_repo, book_repo, client_repo))
+    server = ThreadPoolHTTPServer(('127.0.0.1', 0), api, workers)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def load_data(port, books, clients):
+    """
+    Add books, clients and one rental per client through the API.
+
+    Args:
+        port: The port of the API
+        books: The number of books to add
+        clients: The number of clients to add
+    """
+    connection = http.client.HTTPConnection('127.0.0.1', port)
+    requests = [('/books', {'id': i, 'title': f"Book {i}", 'description': "Desc", 'author': f"Author {i % 50}"})
+                for i in range(books)]
+    requests += [('/clients', {'id': i, 'name': f"Client {i}"}) for i in range(clients)]
+    requests += [('/rentals', {'id': i, 'book_id': i % books, 'client_id': i, 'rented_date': "2024-01-01"})
+                 for i in range(min(books, clients))]
+    for path, body in requests:
+        connection.request('POST', path, json.dumps(body), {'Content-Type': 'application/json'})
+        connection.getresponse().read()
+    connection.close()
+
+
+def run_client(port, request_count, books, seed, latencies):
+    """
+    Send requests over one kept-alive connection and record their latencies.
+
+    Args:
+        port: The port of the API
+        request_count: The number of requests to send
+        books: The number of books in the catalog
+        seed: The seed for choosing the requests
+        latencies: The list the latencies (in seconds) are appended to
+    """
+    rng = random.Random(seed)
+    connection = http.client.HTTPConnection('127.0.0.1', port)
+    for _ in range(request_count):
+        roll = rng.random()
+        if roll < 0.7:
+            path = f"/books/{rng.randrange(books)}"
+        elif roll < 0.9:
+            path = f"/books?title=Book%20{rng.randrange(books)}"
+        else:
+            path = "/reports/most-rented"
+        start = time.perf_counter()
+        connection.request('GET', path)
+        connection.getresponse().read()
+        latencies.append(time.perf_counter() - start)
+    connection.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the Book Management HTTP API")
+    parser.add_argument("--port", type=int, help="port of a running server (default: start one)")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=1000, help="requests per thread")
+    parser.add_argument("--books", type=int, default=1000)
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=16, help="server worker threads")
+    args = parser.parse_args()
+
+    server = None
+    port = args.port
+    if port is None:
+        server = start_server(args.workers)
+        port = server.server_port
+        load_data(port, args.books, args.clients)
+
+    latencies = []
+    threads = [threading.Thread(target=run_client, args=(port, args.requests, args.books, seed, latencies))
+               for seed in range(args.threads)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"{len(latencies)} requests over {args.threads} connections in {elapsed:.2f} s")
+    print(f"throughput: {len(latencies) / elapsed:.0f} requests/s")
+    print(f"p50: {percentile(latencies, 0.50) * 1000:.2f} ms   p99: {percentile(latencies, 0.99) * 1000:.2f} ms")
+
+    if server is not None:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,156 @@
+"""
+Parallel rental counting for the ServiceRental reports.
+
+The ID column needed by a report (book_id or client_id) is kept in a shared
+memory block of 64-bit integers. Worker processes attach to that block by name,
+count their own slice of it and send back only the partial counts, which are
+then merged. The rental objects themselves are never pickled.
+
+The column is built once per attribute and, as long as the repository only had
+rentals appended (see RepoRental.generation), only the new rentals are copied on
+the next report; the block doubles in size when it is full.
+"""
+
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from multiprocessing import shared_memory
+
+
+def _count_slice(shm_name, start, stop):
+    """
+    Count the IDs stored in one slice of a shared memory column.
+
+    Args:
+        shm_name: The name of the shared memory block holding the column
+        start: The index of the first value to count
+        stop: The index after the last value to count
+
+    Returns:
+        Counter: A mapping of ID to number of occurrences in the slice
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        column = shm.buf.cast('q')
+        counts = Counter(column[start:stop])
+        column.release()
+        return counts
+    finally:
+        shm.close()
+
+
+class _SharedColumn:
+    def __init__(self, key, capacity):
+        """
+        Initialize an empty shared memory column.
+
+        Args:
+            key: What the column was built from: (id of the rental list, repository generation)
+            capacity: The number of values the block can hold
+        """
+        self.key = key
+        self.length = 0
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, capacity) * 8)
+
+    def append(self, values):
+        """
+        Copy values at the end of the column, moving it to a block twice as large if needed.
+
+        Args:
+            values (array): The 64-bit integer values to append
+        """
+        end = self.length + len(values)
+        if end * 8 > self.shm.size:
+            grown = shared_memory.SharedMemory(create=True, size=max(end, 2 * self.length) * 8)
+            grown.buf[:self.length * 8] = self.shm.buf[:self.length * 8]
+            self.release()
+            self.shm = grown
+        self.shm.buf[self.length * 8:end * 8] = values.tobytes()
+        self.length = end
+
+    def release(self):
+        """
+        Free the shared memory block.
+        """
+        self.shm.close()
+        self.shm.unlink()
+
+
+class ParallelRentalCounter:
+    def __init__(self, workers):
+        """
+        Initialize the counter with a pool of worker processes.
+
+        Args:
+            workers: The number of worker processes to split the counting across
+
+        Raises:
+            ValueError: If workers is smaller than 1
+        """
+        if workers < 1:
+            raise ValueError("Worker count must be at least 1.")
+        self._workers = workers
+        self._executor = ProcessPoolExecutor(max_workers=workers)
+        self._columns = {}
+
+    def _column(self, rentals, attribute, generation):
+        """
+        Return the shared column of an attribute, copying only the rentals added since the last call.
+
+        The column is rebuilt when the rentals are another list, when rentals were
+        removed (the generation changed) or when no generation is given.
+
+        Args:
+            rentals: The list of Rental objects to count
+            attribute: The name of the ID attribute
+            generation: The generation of the repository holding the rentals, or None
+
+        Returns:
+            _SharedColumn: The up-to-date column
+        """
+        key = (id(rentals), generation)
+        column = self._columns.get(attribute)
+        if column is None or generation is None or column.key != key or column.length > len(rentals):
+            if column is not None:
+                column.release()
+            column = self._columns[attribute] = _SharedColumn(key, len(rentals))
+        if column.length < len(rentals):
+            column.append(array('q', [getattr(rental, attribute) for rental in islice(rentals, column.length, None)]))
+        return column
+
+    def count(self, rentals, attribute, generation=None):
+        """
+        Count how many rentals share each value of an integer ID attribute.
+
+        Args:
+            rentals: The list of Rental objects to count
+            attribute: The name of the ID attribute to count ('book_id' or 'client_id')
+            generation: The generation of the repository holding the rentals (defaults to None,
+                copying the whole column again)
+
+        Returns:
+            dict: A dictionary mapping each ID to its rental count
+
+        Raises:
+            TypeError: If an ID is not an integer
+        """
+        if not rentals:
+            return {}
+        column = self._column(rentals, attribute, generation)
+        step = -(-column.length // self._workers)
+        futures = [self._executor.submit(_count_slice, column.shm.name, start, min(start + step, column.length))
+                   for start in range(0, column.length, step)]
+        counts = Counter()
+        for future in futures:
+            counts.update(future.result())
+        return dict(counts)
+
+    def close(self):
+        """
+        Shut down the worker processes and free the shared columns.
+        """
+        self._executor.shutdown()
+        for column in self._columns.values():
+            column.release()
+        self._columns = {}
@@ -0,0 +1,312 @@
+"""
+Lazy query builder over the rental repository.
+
+A RentalQuery only records what is asked for; nothing is read from the
+repository until the query is iterated. Every builder method returns a new
+query, so partial queries can be shared and extended:
+
+    recent = RentalQuery(repo_rental).rented_between("2024-01-01", "2024-06-30")
+    top_books = recent.group_by('book_id').order_by('count', descending=True).limit(3).all()
+    open_rentals_of_client = recent.client(7).open().all()
+
+When the query filters on a book or a client and the repository can look them
+up by index (its INDEXED_FIELDS), only those rentals are read; otherwise the
+rentals are scanned once. Rows flow through generators, grouping keeps only the
+counts, and rows are sorted only when an order is requested, with a heap
+instead of a full sort when a limit is given too.
+"""
+
+import heapq
+from itertools import islice
+
+# Rental attributes an ungrouped query can be ordered by
+ORDER_FIELDS = ('id', 'book_id', 'client_id', 'rented_date')
+
+# Keys a grouped query can be ordered by
+GROUP_ORDER_FIELDS = ('key', 'count')
+
+
+class RentalQuery:
+    def __init__(self, repo_rental):
+        """
+        Initialize a query returning every rental of a repository.
+
+        Args:
+            repo_rental: The rental repository to query (plain, sharded or snapshot)
+        """
+        self._repo = repo_rental
+        self._equals = {}
+        self._start = None
+        self._end = None
+        self._open = None
+        self._group = None
+        self._order = None
+        self._limit = None
+
+    def _copy(self, **changes):
+        """
+        Return a copy of the query with some settings changed.
+
+        Args:
+            **changes: The settings to change, by attribute name without the underscore
+
+        Returns:
+            RentalQuery: The new query
+        """
+        query = RentalQuery(self._repo)
+        query.__dict__.update(self.__dict__)
+        query._equals = dict(self._equals)
+        for name, value in changes.items():
+            setattr(query, f"_{name}", value)
+        return query
+
+    def book(self, book_id):
+        """
+        Keep the rentals of a book.
+
+        Args:
+            book_id: The ID of the book
+
+        Returns:
+            RentalQuery: The new query
+        """
+        return self._copy(equals={**self._equals, 'book_id': book_id})
+
+    def client(self, client_id):
+        """
+        Keep the rentals of a client.
+
+        Args:
+            client_id: The ID of the client
+
+        Returns:
+            RentalQuery: The new query
+        """
+        return self._copy(equals={**self._equals, 'client_id': client_id})
+
+    def rented_between(self, start=None, end=None):
+        """
+        Keep the rentals made between two dates (inclusive, YYYY-MM-DD strings).
+
+        Args:
+            start: The first date (defaults to None, no lower bound)
+            end: The last date (defaults to None, no upper bound)
+
+        Returns:
+            RentalQuery: The new query
+        """
+        return self._copy(start=start, end=end)
+
+    def open(self, is_open=True):
+        """
+        Keep the rentals that are not returned yet (or only the returned ones).
+
+        Args:
+            is_open: True for rentals not returned yet, False for returned rentals
+
+        Returns:
+            RentalQuery: The new query
+        """
+        return self._copy(open=is_open)
+
+    def group_by(self, field):
+        """
+        Count the rentals per value of a field; the query then yields (value, count) tuples.
+
+        Args:
+            field: The rental attribute to group by (e.g. 'book_id' or 'client_id')
+
+        Returns:
+            RentalQuery: The new query
+        """
+        return self._copy(group=field)
+
+    def order_by(self, key, descending=False):
+        """
+        Order the results.
+
+        Whether the key fits the query (grouped or not) is checked when the query runs,
+        so order_by and group_by can be called in any order.
+
+        Args:
+            key: One of ORDER_FIELDS, or one of GROUP_ORDER_FIELDS for a grouped query
+            descending: True for the largest values first
+
+        Returns:
+            RentalQuery: The new query
+
+        Raises:
+            ValueError: If the key cannot order any query
+        """
+        if key not in ORDER_FIELDS and key not in GROUP_ORDER_FIELDS:
+            raise ValueError(f"Queries can only be ordered by {', '.join(ORDER_FIELDS + GROUP_ORDER_FIELDS)}.")
+        return self._copy(order=(key, descending))
+
+    def _check_order(self):
+        """
+        Check that the requested order fits the query as it is run.
+
+        Raises:
+            ValueError: If a grouped query is ordered by a rental attribute, or an ungrouped one by 'key' / 'count'
+        """
+        if self._order is None:
+            return
+        if self._group is not None and self._order[0] not in GROUP_ORDER_FIELDS:
+            raise ValueError("Grouped queries can only be ordered by 'key' or 'count'.")
+        if self._group is None and self._order[0] not in ORDER_FIELDS:
+            raise ValueError(f"Rentals can only be ordered by {', '.join(ORDER_FIELDS)}.")
+
+    def limit(self, count):
+        """
+        Return at most a number of results.
+
+        Args:
+            count: The maximum number of results
+
+        Returns:
+            RentalQuery: The new query
+
+        Raises:
+            ValueError: If count is negative
+        """
+        if count < 0:
+            raise ValueError("Limit must be non-negative.")
+        return self._copy(limit=count)
+
+    def _source(self):
+        """
+        Choose where the rentals are read from.
+
+        With filters on several indexed fields, the smallest of their index lookups is used.
+
+        Returns:
+            iterable: The rentals to filter
+        """
+        indexed = self._indexed_fields()
+        if not indexed:
+            return self._repo.get_all_rentals()
+        return min((self._repo.find_rentals_by(field, self._equals[field]) for field in indexed), key=len)
+
+    def _indexed_fields(self):
+        """
+        Return the filtered fields the repository can look up by index.
+
+        Returns:
+            list: The field names
+        """
+        return [field for field in getattr(self._repo, 'INDEXED_FIELDS', ()) if field in self._equals]
+
+    def _rows(self, rentals):
+        """
+        Filter the rentals of the source.
+
+        Args:
+            rentals: The rentals of the source
+
+        Yields:
+            Rental: The rentals matching every filter
+        """
+        equals = list(self._equals.items())
+        start, end, is_open = self._start, self._end, self._open
+        for rental in rentals:
+            if equals and any(getattr(rental, field) != value for field, value in equals):
+                continue
+            if start is not None and rental.rented_date < start:
+                continue
+            if end is not None and rental.rented_date > end:
+                continue
+            if is_open is not None and (rental.returned_date is None) != is_open:
+                continue
+            yield rental
+
+    def _results(self):
+        """
+        Run the query.
+
+        Returns:
+            iterator: The rentals, or (value, count) tuples for a grouped query
+
+        Raises:
+            ValueError: If the order does not fit the query
+        """
+        self._check_order()
+        rows = self._rows(self._source())
+        if self._group is not None:
+            counts = {}
+            field = self._group
+            for rental in rows:
+                value = getattr(rental, field)
+                counts[value] = counts.get(value, 0) + 1
+            rows = iter(counts.items())
+            sort_key = (lambda item: item[1]) if self._order and self._order[0] == 'count' else (lambda item: item[0])
+        elif self._order is not None:
+            field = self._order[0]
+            sort_key = lambda rental: getattr(rental, field)
+
+        if self._order is None:
+            return rows if self._limit is None else islice(rows, self._limit)
+        descending = self._order[1]
+        if self._limit is not None:
+            select = heapq.nlargest if descending else heapq.nsmallest
+            return iter(select(self._limit, rows, key=sort_key))
+        return iter(sorted(rows, key=sort_key, reverse=descending))
+
+    def __iter__(self):
+        """
+        Run the query and iterate over its results.
+
+        Returns:
+            iterator: The rentals, or (value, count) tuples for a grouped query
+        """
+        return self._results()
+
+    def all(self):
+        """
+        Run the query and collect its results.
+
+        Returns:
+            list: The rentals, or (value, count) tuples for a grouped query
+        """
+        return list(self._results())
+
+    def first(self):
+        """
+        Run the query and return its first result.
+
+        Returns:
+            The first rental or (value, count) tuple, or None if there is no result
+        """
+        return next(self._results(), None)
+
+    def count(self):
+        """
+        Run the query and count its results without keeping them.
+
+        Returns:
+            int: The number of rentals, or of groups for a grouped query
+        """
+        return sum(1 for _ in self._results())
+
+    def explain(self):
+        """
+        Describe how the query would be run.
+
+        Returns:
+            str: The steps of the plan, e.g. "index book_id -> filter -> top 3 by count"
+
+        Raises:
+            ValueError: If the order does not fit the query
+        """
+        self._check_order()
+        indexed = self._indexed_fields()
+        steps = [f"index {'/'.join(indexed)}" if indexed else "scan"]
+        if self._equals or self._start is not None or self._end is not None or self._open is not None:
+            steps.append("filter")
+        if self._group is not None:
+            steps.append(f"group by {self._group}")
+        if self._order is not None:
+            order = f"{self._order[0]}{' desc' if self._order[1] else ''}"
+            steps.append(f"top {self._limit} by {order}" if self._limit is not None else f"sort by {order}")
+        elif self._limit is not None:
+            steps.append(f"first {self._limit}")
+        return " -> ".join(steps)
@@ -43,6 +43,21 @@ class ServiceBook:
         self.__validate(book)
         self._repo.add_book(book)
 
+    def add_books(self, books):
+        """
+        Add several books to the repository after validating all of them.
+        
+        Args:
+            books: A list of book objects to add
+            
+        Raises:
+            TypeError: If one of the books is not a Book instance
+            ValueError: If a book ID is negative or a title is empty (no book is added)
+        """
+        for book in books:
+            self.__validate(book)
+        self._repo.add_books(books)
+
     def get_all_books(self):
         """
         Retrieve all books from the repository.
@@ -83,6 +98,18 @@ class ServiceBook:
         self.__validate(new_book)
         self._repo.update_book(new_book)
 
+    def find_book_by_id(self, id):
+        """
+        Find a book in the repository by its ID.
+        
+        Args:
+            id: The ID of the book to find
+            
+        Returns:
+            Book: The Book object if found, None otherwise
+        """
+        return self._repo.find_book_by_id(id)
+
     def search_by_title(self, title_query):
         """
         Search for books by title in the repository.
@@ -98,4 +125,21 @@ class ServiceBook:
         """
         if not isinstance(title_query, str):
             raise TypeError("Title query must be a string.")
-        return self._repo.search_by_title(title_query)
\ No newline at end of file
+        return self._repo.search_by_title(title_query)
+
+    def find_books_by_author(self, author):
+        """
+        Find the books of an author in the repository (exact match).
+        
+        Args:
+            author: The author to look for
+            
+        Returns:
+            list: A list of Book objects written by the author
+            
+        Raises:
+            TypeError: If the author is not a string
+        """
+        if not isinstance(author, str):
+            raise TypeError("Author must be a string.")
+        return self._repo.find_books_by_author(author)
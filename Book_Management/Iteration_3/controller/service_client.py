@@ -9,6 +9,16 @@ class ServiceClient:
             repo (RepoClient): The client repository to use for data operations
         """
         self._repo = repo
+        self._removal_listeners = []
+
+    def add_removal_listener(self, listener):
+        """
+        Register a function to be called after a client is removed.
+        
+        Args:
+            listener: A function receiving the ID of the removed client
+        """
+        self._removal_listeners.append(listener)
 
     def __validate(self, client):
         """
@@ -42,6 +52,21 @@ class ServiceClient:
         self.__validate(client)
         self._repo.add_client(client)
 
+    def add_clients(self, clients):
+        """
+        Add several clients to the repository after validating all of them.
+        
+        Args:
+            clients: A list of client objects to add
+            
+        Raises:
+            TypeError: If one of the clients is not a Client instance
+            ValueError: If a client is invalid or already exists (no client is added)
+        """
+        for client in clients:
+            self.__validate(client)
+        self._repo.add_clients(clients)
+
     def get_all_clients(self):
         """
         Retrieve all clients from the repository.
@@ -53,7 +78,7 @@ class ServiceClient:
 
     def remove_client(self, client_id):
         """
-        Remove a client from the repository by their ID.
+        Remove a client from the repository by their ID and notify the removal listeners.
         
         Args:
             client_id: The ID of the client to remove
@@ -67,6 +92,8 @@ class ServiceClient:
         if client_id < 0:
             raise ValueError("Client ID must be non-negative.")
         self._repo.remove_client(client_id)
+        for listener in self._removal_listeners:
+            listener(client_id)
 
     def update_client(self, client):
         """
@@ -82,6 +109,39 @@ class ServiceClient:
         self.__validate(client)
         self._repo.update_client(client)
 
+    def fuzzy_search_by_name(self, name_query, max_distance=1):
+        """
+        Search for clients whose name is close to the query, allowing typos.
+        
+        Args:
+            name_query: The name or part of the name to search for
+            max_distance: The largest edit distance accepted for each word of the query
+            
+        Returns:
+            list: A list of Client objects, closest matches first
+            
+        Raises:
+            TypeError: If the name_query is not a string
+            ValueError: If max_distance is negative
+        """
+        if not isinstance(name_query, str):
+            raise TypeError("Name query must be a string.")
+        if max_distance < 0:
+            raise ValueError("Maximum distance must be non-negative.")
+        return self._repo.fuzzy_search_by_name(name_query, max_distance)
+
+    def find_client_by_id(self, client_id):
+        """
+        Find a client in the repository by their ID.
+        
+        Args:
+            client_id: The ID of the client to find
+            
+        Returns:
+            Client: The Client object if found, None otherwise
+        """
+        return self._repo.find_client_by_id(client_id)
+
     def search_by_name(self, name_query):
         """
         Search for clients by name in the repository.
@@ -1,10 +1,15 @@
-from domain.domain import Rental
+import heapq
+
+from domain.domain import Rental, Reservation
 from repo.repo_rental import RepoRental
+from repo.repo_reservation import RepoReservation
+from controller.rental_query import RentalQuery
 from repo.repo_book import RepoBook
 from repo.repo_client import RepoClient
 
 class ServiceRental:
-    def __init__(self, repo_rental: RepoRental, repo_book: RepoBook, repo_client: RepoClient):
+    def __init__(self, repo_rental: RepoRental, repo_book: RepoBook, repo_client: RepoClient, counter=None,
+                 repo_reservation: RepoReservation = None):
         """
         Initialize the ServiceRental with repository instances for rentals, books, and clients.
         
@@ -12,10 +17,73 @@ class ServiceRental:
             repo_rental (RepoRental): The rental repository
             repo_book (RepoBook): The book repository
             repo_client (RepoClient): The client repository
+            counter (ParallelRentalCounter): Optional counter used to compute the reports
+                in worker processes (defaults to None, counting in the repository)
+            repo_reservation (RepoReservation): The reservation repository (defaults to a new, empty one)
         """
         self._repo_rental = repo_rental
         self._repo_book = repo_book
         self._repo_client = repo_client
+        self._counter = counter
+        self._repo_reservation = repo_reservation if repo_reservation is not None else RepoReservation()
+        self._hand_off_listeners = []
+
+    def add_hand_off_listener(self, listener):
+        """
+        Register a function to be called when a returned book is handed off to a waiting client.
+        
+        Args:
+            listener: A function receiving the Reservation of the client the book is now held for
+        """
+        self._hand_off_listeners.append(listener)
+
+    def __check_hold(self, book_id, client_id):
+        """
+        Check that a book is not held for another client.
+        
+        Args:
+            book_id: The ID of the book to rent
+            client_id: The ID of the client renting it
+            
+        Raises:
+            ValueError: If the book is held for a different client
+        """
+        holder = self._repo_reservation.held_for(book_id)
+        if holder is not None and holder != client_id:
+            raise ValueError(f"Book with ID {book_id} is held for client with ID {holder}.")
+
+    def __hand_off(self, book_id):
+        """
+        Hold a returned book for the first waiting client and notify the listeners.
+        
+        Reservations of clients that no longer exist are dropped. Only the reservation
+        queue of this book is touched, so the cost does not depend on the number of
+        reservations of other books.
+        
+        Args:
+            book_id: The ID of the returned book
+            
+        Returns:
+            Reservation: The reservation the book was handed off to, or None if nobody is waiting
+        """
+        self._repo_reservation.release(book_id)
+        reservation = self._repo_reservation.pop_next(book_id)
+        while reservation is not None and self._repo_client.find_client_by_id(reservation.client_id) is None:
+            reservation = self._repo_reservation.pop_next(book_id)
+        if reservation is not None:
+            self._repo_reservation.hold(book_id, reservation.client_id)
+            for listener in self._hand_off_listeners:
+                listener(reservation)
+        return reservation
+
+    def query(self):
+        """
+        Start a lazy query over the rentals, for reports that need no scan code of their own.
+        
+        Returns:
+            RentalQuery: A query returning every rental, to be narrowed with its builder methods
+        """
+        return RentalQuery(self._repo_rental)
 
     def get_report_book_borrowers(self, book_id):
         """
@@ -28,11 +96,10 @@ class ServiceRental:
             list: A list of dictionaries containing borrower names and rental dates
         """
         borrowers = []
-        for rental in self._repo_rental.get_all_rentals():
-            if rental.book_id == book_id:
-                client = self._repo_client.find_client_by_id(rental.client_id)
-                if client:
-                    borrowers.append({'Client': client.name, 'Rented Date': rental.rented_date})
+        for rental in self.query().book(book_id):
+            client = self._repo_client.find_client_by_id(rental.client_id)
+            if client:
+                borrowers.append({'Client': client.name, 'Rented Date': rental.rented_date})
         borrowers.sort(key=lambda item: (item['Client'], item['Rented Date']))
         return borrowers
 
@@ -47,26 +114,62 @@ class ServiceRental:
             rented_date: The date the book is rented
             
         Raises:
-            ValueError: If the book or client doesn't exist, or if the book is already rented
+            ValueError: If the book or client doesn't exist, if the book is already rented,
+                or if it is held for another client
         """
         if self._repo_book.find_book_by_id(book_id) is None:
             raise ValueError(f"Book with ID {book_id} does not exist.")
         if self._repo_client.find_client_by_id(client_id) is None:
             raise ValueError(f"Client with ID {client_id} does not exist.")
-        for rental in self._repo_rental.get_all_rentals():
-            if rental.book_id == book_id and rental.returned_date is None :
-                 raise ValueError(f"Book with ID {book_id} is already rented and not yet returned.")
+        if self.query().book(book_id).open().first() is not None:
+            raise ValueError(f"Book with ID {book_id} is already rented and not yet returned.")
+        self.__check_hold(book_id, client_id)
         rental = Rental(rental_id, book_id, client_id, rented_date)
         self._repo_rental.add_rental(rental)
+        self._repo_reservation.release(book_id)
+
+    def add_rentals(self, rentals):
+        """
+        Add several rental transactions, checking all of them against a single scan of the rentals.
+        
+        Args:
+            rentals: A list of (rental_id, book_id, client_id, rented_date) tuples
+            
+        Raises:
+            ValueError: If a book or client doesn't exist, if a book is already rented,
+                or if it is held for another client (no rental is added)
+        """
+        book_ids = {book.id for book in self._repo_book.get_all_books()}
+        rented_book_ids = {rental.book_id for rental in self._repo_rental.get_all_rentals()
+                           if rental.returned_date is None}
+        new_rentals = []
+        for rental_id, book_id, client_id, rented_date in rentals:
+            if book_id not in book_ids:
+                raise ValueError(f"Book with ID {book_id} does not exist.")
+            if self._repo_client.find_client_by_id(client_id) is None:
+                raise ValueError(f"Client with ID {client_id} does not exist.")
+            if book_id in rented_book_ids:
+                raise ValueError(f"Book with ID {book_id} is already rented and not yet returned.")
+            self.__check_hold(book_id, client_id)
+            rented_book_ids.add(book_id)
+            new_rentals.append(Rental(rental_id, book_id, client_id, rented_date))
+        self._repo_rental.add_rentals(new_rentals)
+        for rental in new_rentals:
+            self._repo_reservation.release(rental.book_id)
 
     def return_book(self, rental_id, returned_date):
         """
         Mark a rental as returned by updating the return date.
         
+        If clients are waiting for the book, it is handed off to the first of them.
+        
         Args:
             rental_id: The ID of the rental to mark as returned
             returned_date: The date the book is being returned
             
+        Returns:
+            Reservation: The reservation the book was handed off to, or None if nobody is waiting
+            
         Raises:
             ValueError: If the rental doesn't exist or has already been returned
         """
@@ -76,6 +179,120 @@ class ServiceRental:
         if rental.returned_date is not None:
             raise ValueError(f"Book for Rental ID {rental_id} has already been returned.")
         self._repo_rental.update_rental(rental_id, returned_date)
+        return self.__hand_off(rental.book_id)
+
+    def return_books(self, returns):
+        """
+        Mark several rentals as returned, checking all of them against a single scan of the rentals.
+        
+        Args:
+            returns: A list of (rental_id, returned_date) tuples
+            
+        Returns:
+            list: The reservations the returned books were handed off to
+            
+        Raises:
+            ValueError: If a rental doesn't exist or has already been returned (no rental is updated)
+        """
+        open_books = {rental.id: rental.book_id if rental.returned_date is None else None
+                      for rental in self._repo_rental.get_all_rentals()}
+        returned_dates = {}
+        for rental_id, returned_date in returns:
+            if rental_id not in open_books:
+                raise ValueError(f"Rental with ID {rental_id} not found.")
+            if open_books[rental_id] is None or rental_id in returned_dates:
+                raise ValueError(f"Book for Rental ID {rental_id} has already been returned.")
+            returned_dates[rental_id] = returned_date
+        self._repo_rental.update_rentals(returned_dates)
+        return [reservation for reservation in (self.__hand_off(open_books[rental_id]) for rental_id in returned_dates)
+                if reservation is not None]
+
+    def reserve_book(self, book_id, client_id, reserved_date):
+        """
+        Add a client to the end of the reservation queue of a rented book.
+        
+        Args:
+            book_id: The ID of the book to reserve
+            client_id: The ID of the client waiting for the book
+            reserved_date: The date of the reservation
+            
+        Raises:
+            ValueError: If the book or client doesn't exist, if the book can be rented right away,
+                if the client is renting it or it is held for them, or if they already reserved it
+        """
+        if self._repo_book.find_book_by_id(book_id) is None:
+            raise ValueError(f"Book with ID {book_id} does not exist.")
+        if self._repo_client.find_client_by_id(client_id) is None:
+            raise ValueError(f"Client with ID {client_id} does not exist.")
+        holder = self._repo_reservation.held_for(book_id)
+        open_rental = self.query().book(book_id).open().first()
+        renter = open_rental.client_id if open_rental is not None else None
+        if client_id in (holder, renter):
+            raise ValueError(f"Book with ID {book_id} is already rented by or held for client with ID {client_id}.")
+        if holder is None and renter is None:
+            raise ValueError(f"Book with ID {book_id} is available and can be rented.")
+        self._repo_reservation.add_reservation(Reservation(book_id, client_id, reserved_date))
+
+    def cancel_reservation(self, book_id, client_id):
+        """
+        Cancel the reservation of a client for a book.
+        
+        If the book was already handed off to the client, it is handed off to the next waiting client.
+        
+        Args:
+            book_id: The ID of the reserved book
+            client_id: The ID of the client
+            
+        Raises:
+            ValueError: If the client has no reservation for the book
+        """
+        if self._repo_reservation.held_for(book_id) == client_id:
+            self.__hand_off(book_id)
+        else:
+            self._repo_reservation.cancel_reservation(book_id, client_id)
+
+    def remove_client_reservations(self, client_id):
+        """
+        Drop the reservations of a removed client.
+        
+        The client leaves every queue, and the books held for them are handed off to the
+        next waiting client, so a removed client never blocks a book. Register it with
+        ServiceClient.add_removal_listener to run it whenever a client is removed.
+        
+        Args:
+            client_id: The ID of the removed client
+            
+        Returns:
+            list: The reservations the held books were handed off to
+        """
+        for reservation in self._repo_reservation.get_client_reservations(client_id):
+            self._repo_reservation.cancel_reservation(reservation.book_id, client_id)
+        handed_off = (self.__hand_off(book_id) for book_id in self._repo_reservation.get_held_books(client_id))
+        return [reservation for reservation in handed_off if reservation is not None]
+
+    def get_client_reservations(self, client_id):
+        """
+        Retrieve the books a client is waiting for.
+        
+        Args:
+            client_id: The ID of the client
+            
+        Returns:
+            list: A list of Reservation objects, in the order they were made
+        """
+        return self._repo_reservation.get_client_reservations(client_id)
+
+    def get_reservation_queue(self, book_id):
+        """
+        Retrieve the clients waiting for a book.
+        
+        Args:
+            book_id: The ID of the book
+            
+        Returns:
+            list: A list of Reservation objects, first in line first
+        """
+        return self._repo_reservation.get_queue(book_id)
 
     def get_all_rentals(self):
         """
@@ -93,13 +310,12 @@ class ServiceRental:
         Returns:
             list: A list of tuples containing (Book, rental_count) sorted by rental count in descending order
         """
-        rental_count = {}
-        for rental in self._repo_rental.get_all_rentals():
-            if rental.book_id not in rental_count:
-                rental_count[rental.book_id] = 0
-            rental_count[rental.book_id] += 1
-        sorted_books = sorted(rental_count.items(), key=lambda item: item[1], reverse=True)
-        sorted_books = sorted_books[:3]
+        if self._counter is None:
+            sorted_books = self._repo_rental.most_rented_books(3)
+        else:
+            rental_count = self._counter.count(self._repo_rental.get_all_rentals(), 'book_id',
+                                               getattr(self._repo_rental, 'generation', None))
+            sorted_books = heapq.nlargest(3, rental_count.items(), key=lambda item: item[1])
         result = []
         for book_id, count in sorted_books:
             book = self._repo_book.find_book_by_id(book_id)
@@ -114,11 +330,11 @@ class ServiceRental:
         Returns:
             list: A list of tuples containing (Client, rental_count) sorted by rental count in descending order
         """
-        client_rental_count = {}
-        for rental in self._repo_rental.get_all_rentals():
-            if rental.client_id not in client_rental_count:
-                client_rental_count[rental.client_id] = 0
-            client_rental_count[rental.client_id] += 1
+        if self._counter is None:
+            client_rental_count = self._repo_rental.count_by_client()
+        else:
+            client_rental_count = self._counter.count(self._repo_rental.get_all_rentals(), 'client_id',
+                                                      getattr(self._repo_rental, 'generation', None))
         sorted_clients = sorted(client_rental_count.items(), key=lambda item: item[1], reverse=True)
         top_20_percent_index = max(1, len(sorted_clients) * 20 // 100)
         sorted_clients = sorted_clients[:top_20_percent_index]
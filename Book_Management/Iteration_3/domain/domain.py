@@ -70,4 +70,27 @@ class Rental:
             str: A formatted string with rental details
         """
         return (f"Rental[ID: {self.id}, Book ID: {self.book_id}, Client ID: {self.client_id}, "
-                f"Rented Date: {self.rented_date}, Returned Date: {self.returned_date}]")
\ No newline at end of file
+                f"Rented Date: {self.rented_date}, Returned Date: {self.returned_date}]")
+    
+class Reservation:
+    def __init__(self, book_id, client_id, reserved_date):
+        """
+        Initialize a Reservation object.
+        
+        Args:
+            book_id: The ID of the reserved book
+            client_id: The ID of the client waiting for the book
+            reserved_date: The date the reservation was made
+        """
+        self.book_id = book_id
+        self.client_id = client_id
+        self.reserved_date = reserved_date
+
+    def __str__(self):
+        """
+        Return a string representation of the Reservation object.
+        
+        Returns:
+            str: A formatted string with reservation details
+        """
+        return f"Reservation[Book ID: {self.book_id}, Client ID: {self.client_id}, Reserved Date: {self.reserved_date}]"
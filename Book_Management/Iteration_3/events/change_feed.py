@@ -0,0 +1,430 @@
+"""
+In-process change feed for the Book Management repositories.
+
+track_changes() wraps the add, update and delete methods of one repository
+instance (like metrics.registry.instrument does), so that every successful call
+publishes ChangeEvents with increasing sequence numbers on a ChangeFeed.
+
+Every subscriber has a bounded buffer. A blocking subscriber applies back-pressure:
+publishing waits until it has room, so a slow consumer slows the writers down
+instead of losing events. A non-blocking subscriber never slows the writers; when
+its buffer overflows it is marked as lagged and must subscribe again from the last
+sequence number it processed, catching up from the persisted log.
+
+The log is a JSON-lines file with one event per line; a feed opened on an
+existing log continues its sequence numbers.
+"""
+
+import json
+import os
+import threading
+from collections import deque
+from collections.abc import Iterator
+from functools import partial, wraps
+
+from repo.repo_book import RepoBook
+from repo.repo_client import RepoClient
+from repo.repo_rental import RepoRental
+from repo.repo_sharded import ShardedRepoBook, ShardedRepoClient, ShardedRepoRental
+
+ADD = 'add'
+UPDATE = 'update'
+DELETE = 'delete'
+
+
+class SubscriptionLagged(Exception):
+    def __init__(self, last_sequence):
+        """
+        Initialize the error raised by a non-blocking subscription that lost events.
+
+        Args:
+            last_sequence: The sequence number of the last event the subscriber received
+        """
+        super().__init__(f"Subscriber fell behind after event {last_sequence}; subscribe again from that offset.")
+        self.last_sequence = last_sequence
+
+
+class ChangeEvent:
+    def __init__(self, sequence, entity, operation, key, data=None):
+        """
+        Initialize a change event.
+
+        Args:
+            sequence: The position of the event in the feed (starting at 1)
+            entity: The kind of record changed ('book', 'client' or 'rental')
+            operation: ADD, UPDATE or DELETE
+            key: The ID of the changed record
+            data: The fields of the record after the change (None for a delete)
+        """
+        self.sequence = sequence
+        self.entity = entity
+        self.operation = operation
+        self.key = key
+        self.data = data
+
+    def to_dict(self):
+        """
+        Return the event as a JSON-serialisable dictionary.
+
+        Returns:
+            dict: The fields of the event
+        """
+        return {'sequence': self.sequence, 'entity': self.entity, 'operation': self.operation,
+                'key': self.key, 'data': self.data}
+
+    def __str__(self):
+        """
+        Return a string representation of the ChangeEvent object.
+
+        Returns:
+            str: A formatted string with the event details
+        """
+        return f"ChangeEvent[#{self.sequence} {self.operation} {self.entity} {self.key}: {self.data}]"
+
+
+def event_from_dict(fields):
+    """
+    Create an event from the dictionary written to the log.
+
+    Args:
+        fields: The dictionary returned by ChangeEvent.to_dict
+
+    Returns:
+        ChangeEvent: The event
+    """
+    return ChangeEvent(fields['sequence'], fields['entity'], fields['operation'], fields['key'], fields['data'])
+
+
+class Subscription:
+    def __init__(self, feed, buffer_size, block, catch_up):
+        """
+        Initialize a subscription. Use ChangeFeed.subscribe to create one.
+
+        Args:
+            feed (ChangeFeed): The feed delivering the events
+            buffer_size: The number of live events buffered for this subscriber (0 for no limit)
+            block: True to make the publishers wait when the buffer is full
+            catch_up: An iterator over the logged events to deliver before the live ones
+        """
+        self._feed = feed
+        self._buffer = deque()
+        self._buffer_size = buffer_size
+        self._condition = threading.Condition()
+        self._block = block
+        self._catch_up = catch_up
+        self._lagged = False
+        self._closed = False
+        self.last_sequence = 0
+
+    def _full(self):
+        """
+        Return True if the buffer has no room for another event.
+
+        Returns:
+            bool: True when the buffer is full
+        """
+        return 0 < self._buffer_size <= len(self._buffer)
+
+    def _deliver(self, event):
+        """
+        Buffer a live event (called by the feed while publishing).
+
+        A blocking subscription waits for room until an event is taken or it is closed;
+        events delivered after close are dropped.
+
+        Args:
+            event (ChangeEvent): The published event
+        """
+        with self._condition:
+            if self._lagged or self._closed:
+                return
+            if self._full():
+                if not self._block:
+                    self._lagged = True
+                    return
+                self._condition.wait_for(lambda: not self._full() or self._closed)
+                if self._closed:
+                    return
+            self._buffer.append(event)
+            self._condition.notify_all()
+
+    def get(self, timeout=None):
+        """
+        Return the next event: first the logged ones requested at subscription, then the live ones.
+
+        Args:
+            timeout: Seconds to wait for a live event (None waits forever)
+
+        Returns:
+            ChangeEvent: The next event, or None if none arrived before the timeout or the
+            subscription is closed
+
+        Raises:
+            SubscriptionLagged: If this non-blocking subscription lost events because its buffer was full
+        """
+        event = next(self._catch_up, None) if self._catch_up is not None else None
+        if event is None:
+            self._catch_up = None
+            with self._condition:
+                if self._lagged and not self._buffer:
+                    raise SubscriptionLagged(self.last_sequence)
+                self._condition.wait_for(lambda: self._buffer or self._closed, timeout)
+                if not self._buffer:
+                    return None
+                event = self._buffer.popleft()
+                self._condition.notify_all()
+        self.last_sequence = event.sequence
+        return event
+
+    def close(self):
+        """
+        Stop receiving events.
+
+        A publisher waiting for room in this subscription's buffer is woken up and moves on.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._feed._unsubscribe(self)
+
+
+class ChangeFeed:
+    def __init__(self, log_path=None):
+        """
+        Initialize a change feed, optionally persisted to a log file.
+
+        self._lock guards the sequence number, the log and the subscription list and is
+        never held while delivering. Events are delivered in sequence order: a publisher
+        waits on self._delivery until the event before its own was delivered.
+
+        Args:
+            log_path: The JSON-lines file the events are appended to (defaults to None, not persisted)
+        """
+        self._lock = threading.Lock()
+        self._delivery = threading.Condition()
+        self._subscriptions = []
+        self._sequence = 0
+        self._log_path = log_path
+        self._log = None
+        if log_path is not None:
+            for event in self.read_log():
+                self._sequence = event.sequence
+            self._log = open(log_path, 'a', encoding='utf-8')
+        self._delivered = self._sequence
+
+    def last_sequence(self):
+        """
+        Return the sequence number of the last published event.
+
+        Returns:
+            int: The last sequence number (0 if nothing was published)
+        """
+        return self._sequence
+
+    def publish(self, entity, operation, key, data=None):
+        """
+        Publish a change to the log and to every subscriber.
+
+        Waits while a blocking subscriber's buffer is full (until the subscriber takes an
+        event or closes the subscription), so it must not be called from the thread
+        consuming that subscription.
+
+        Args:
+            entity: The kind of record changed ('book', 'client' or 'rental')
+            operation: ADD, UPDATE or DELETE
+            key: The ID of the changed record
+            data: The fields of the record after the change (None for a delete)
+
+        Returns:
+            ChangeEvent: The published event
+        """
+        with self._lock:
+            event = ChangeEvent(self._sequence + 1, entity, operation, key, data)
+            if self._log is not None:
+                self._log.write(json.dumps(event.to_dict()) + "\n")
+                self._log.flush()
+            self._sequence = event.sequence
+            subscriptions = list(self._subscriptions)
+        with self._delivery:
+            self._delivery.wait_for(lambda: self._delivered == event.sequence - 1)
+            try:
+                for subscription in subscriptions:
+                    subscription._deliver(event)
+            finally:
+                self._delivered = event.sequence
+                self._delivery.notify_all()
+        return event
+
+    def subscribe(self, buffer_size=1000, block=True, from_sequence=None):
+        """
+        Subscribe to the events published from now on, optionally catching up first.
+
+        Args:
+            buffer_size: The number of live events buffered for this subscriber
+            block: True to make the publishers wait when the buffer is full (back-pressure),
+                False to mark the subscription as lagged instead
+            from_sequence: Also deliver the logged events after this sequence number
+
+        Returns:
+            Subscription: The new subscription
+
+        Raises:
+            ValueError: If a catch-up is requested from a feed without a log
+        """
+        if from_sequence is not None and self._log is None:
+            raise ValueError("Catching up requires a change feed with a log file.")
+        with self._lock:
+            catch_up = None
+            if from_sequence is not None:
+                catch_up = self.read_log(from_sequence, self._sequence)
+            subscription = Subscription(self, buffer_size, block, catch_up)
+            self._subscriptions.append(subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription):
+        """
+        Remove a subscription.
+
+        Args:
+            subscription (Subscription): The subscription to remove
+        """
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+    def read_log(self, from_sequence=0, to_sequence=None):
+        """
+        Read the logged events after an offset.
+
+        Args:
+            from_sequence: Only events with a larger sequence number are returned
+            to_sequence: Stop after this sequence number (defaults to None, read to the end)
+
+        Yields:
+            ChangeEvent: The logged events, in order
+        """
+        if self._log_path is None or not os.path.exists(self._log_path):
+            return
+        with open(self._log_path, encoding='utf-8') as log:
+            for line in log:
+                if not line.endswith("\n"):
+                    return
+                event = event_from_dict(json.loads(line))
+                if to_sequence is not None and event.sequence > to_sequence:
+                    return
+                if event.sequence > from_sequence:
+                    yield event
+
+    def close(self):
+        """
+        Close the log file.
+        """
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+
+def _record(item):
+    """
+    Return the fields of a domain object for an event.
+
+    Args:
+        item: A Book, Client or Rental object
+
+    Returns:
+        dict: A copy of its attributes
+    """
+    return dict(vars(item))
+
+
+# Entity -> method name -> function turning the call arguments into (operation, key, data) changes
+CHANGE_METHODS = {
+    'book': {
+        'add_book': lambda book: [(ADD, book.id, _record(book))],
+        'add_books': lambda books: [(ADD, book.id, _record(book)) for book in books],
+        'update_book': lambda book: [(UPDATE, book.id, _record(book))],
+        'delete_book_by_id': lambda book_id: [(DELETE, book_id, None)],
+    },
+    'client': {
+        'add_client': lambda client: [(ADD, client.id, _record(client))],
+        'add_clients': lambda clients: [(ADD, client.id, _record(client)) for client in clients],
+        'update_client': lambda client: [(UPDATE, client.id, _record(client))],
+        'remove_client': lambda client_id: [(DELETE, client_id, None)],
+    },
+    'rental': {
+        'add_rental': lambda rental: [(ADD, rental.id, _record(rental))],
+        'add_rentals': lambda rentals: [(ADD, rental.id, _record(rental)) for rental in rentals],
+        'update_rental': lambda rental_id, returned_date: [(UPDATE, rental_id, {'returned_date': returned_date})],
+        'update_rentals': lambda returned_dates: [(UPDATE, rental_id, {'returned_date': returned_date})
+                                                  for rental_id, returned_date in returned_dates.items()],
+        'remove_rental': lambda rental_id: [(DELETE, rental_id, None)],
+    },
+}
+
+# Method name -> function telling from the repository and the call arguments whether
+# the call will change anything (for methods that silently ignore unknown IDs)
+CHANGE_GUARDS = {
+    'update_book': lambda repo, book: repo.find_book_by_id(book.id) is not None,
+}
+
+# Repository classes (and their subclasses) -> entity they hold
+ENTITIES = {RepoBook: 'book', RepoClient: 'client', RepoRental: 'rental',
+            ShardedRepoBook: 'book', ShardedRepoClient: 'client', ShardedRepoRental: 'rental'}
+
+
+def _wrap(method, feed, entity, changes, guard=None):
+    """
+    Wrap a bound repository method so that every successful call publishes its changes.
+
+    Args:
+        method: The bound method to wrap
+        feed (ChangeFeed): The feed receiving the events
+        entity: The kind of record the repository holds
+        changes: The function turning the call arguments into (operation, key, data) changes
+        guard: A function of the call arguments returning False when the call changes
+            nothing, so nothing is published (defaults to None, always publish)
+
+    Returns:
+        The wrapping function
+    """
+    @wraps(method)
+    def wrapper(*args):
+        # batches given as iterators are read once and reused for the events
+        args = [list(arg) if isinstance(arg, Iterator) else arg for arg in args]
+        if guard is not None and not guard(*args):
+            return method(*args)
+        result = method(*args)
+        for operation, key, data in changes(*args):
+            feed.publish(entity, operation, key, data)
+        return result
+    return wrapper
+
+
+def track_changes(repo, feed):
+    """
+    Publish the changes made through a repository instance on a change feed.
+
+    Only this instance is changed; other instances of the class are unaffected.
+    Deletes are published as requested, also for IDs that did not exist, so
+    consumers should apply them idempotently. Updates of books that do not exist
+    change nothing and are not published.
+
+    Args:
+        repo: A book, client or rental repository instance (plain, sharded or snapshot)
+        feed (ChangeFeed): The feed receiving the events
+
+    Returns:
+        The tracked repository
+
+    Raises:
+        TypeError: If the repository is not of a supported class
+    """
+    entity = next((ENTITIES[cls] for cls in type(repo).__mro__ if cls in ENTITIES), None)
+    if entity is None:
+        raise TypeError(f"Cannot track changes of {type(repo).__name__}.")
+    for name, changes in CHANGE_METHODS[entity].items():
+        guard = CHANGE_GUARDS.get(name)
+        if guard is not None:
+            guard = partial(guard, repo)
+        setattr(repo, name, _wrap(getattr(repo, name), feed, entity, changes, guard))
+    return repo
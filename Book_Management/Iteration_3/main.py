@@ -5,28 +5,124 @@ This module initializes all repositories, services, and the UI, then starts the
 It follows the layered architecture pattern with repositories, services, and UI layers.
 """
 
+import argparse
+import os
+
 from repo.repo_book import RepoBook
 from repo.repo_client import RepoClient
 from repo.repo_rental import RepoRental
+from repo.repo_snapshot import load_snapshot, write_snapshot
+from repo.repo_sharded import ShardedRepoBook, ShardedRepoClient, ShardedRepoRental
 from controller.service_book import ServiceBook
 from controller.service_client import ServiceClient
 from controller.service_rental import ServiceRental
+from controller.parallel_reports import ParallelRentalCounter
 
 from ui.ui import Console
+from ui.script_runner import ScriptRunner
+from server.http_api import BookManagementApi, ThreadPoolHTTPServer
+from metrics.registry import MetricsRegistry, instrument
+from metrics.profiler import SessionProfiler
+from events.change_feed import ChangeFeed, track_changes
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Book Management System")
+    parser.add_argument("--shards", type=int, default=0,
+                        help="partition the repositories across this many shards")
+    parser.add_argument("--processes", action="store_true",
+                        help="run each shard in its own worker process (requires --shards)")
+    parser.add_argument("--report-workers", type=int, default=0,
+                        help="compute the rental reports with this many worker processes")
+    parser.add_argument("--script", metavar="FILE",
+                        help="run the commands in FILE instead of starting the interactive console")
+    parser.add_argument("--serve", type=int, metavar="PORT",
+                        help="serve the HTTP JSON API on PORT instead of starting the interactive console")
+    parser.add_argument("--host", default="127.0.0.1", help="the address the HTTP API listens on")
+    parser.add_argument("--metrics", action="store_true",
+                        help="record call counts and latencies of the services and repositories")
+    parser.add_argument("--metrics-file", metavar="FILE",
+                        help="write the recorded statistics to FILE as JSON at exit (implies --metrics)")
+    parser.add_argument("--snapshot", metavar="FILE",
+                        help="load the repositories from this binary snapshot if it exists, and save them to it at exit")
+    parser.add_argument("--change-log", metavar="FILE",
+                        help="publish every change of the repositories to a change feed persisted in FILE")
+    parser.add_argument("--profile", nargs="?", const="profile_report.txt", metavar="FILE",
+                        help="profile the CPU time and peak allocation of every console command and "
+                             "write the report to FILE at exit (default: profile_report.txt)")
+    args = parser.parse_args()
+    if args.snapshot and args.shards > 0:
+        parser.error("--snapshot cannot be combined with --shards")
+
     # 1. Initialize Repositories (The storage)
-    book_repo = RepoBook()
-    client_repo = RepoClient()
-    rental_repo = RepoRental()
+    snapshot = None
+    if args.snapshot and os.path.exists(args.snapshot):
+        snapshot, book_repo, client_repo, rental_repo = load_snapshot(args.snapshot)
+    elif args.shards > 0:
+        book_repo = ShardedRepoBook(args.shards, args.processes)
+        client_repo = ShardedRepoClient(args.shards, args.processes)
+        rental_repo = ShardedRepoRental(args.shards, args.processes)
+    else:
+        book_repo = RepoBook()
+        client_repo = RepoClient()
+        rental_repo = RepoRental()
+
+    # Optional change feed (downstream consumers subscribe to it or tail its log)
+    feed = None
+    if args.change_log:
+        feed = ChangeFeed(args.change_log)
+        for repo in (book_repo, client_repo, rental_repo):
+            track_changes(repo, feed)
 
     # 2. Initialize Services (The logic, injected with repos)
     book_service = ServiceBook(book_repo)
     client_service = ServiceClient(client_repo)
-    rental_service = ServiceRental(rental_repo, book_repo, client_repo)
+    counter = ParallelRentalCounter(args.report_workers) if args.report_workers > 0 else None
+    rental_service = ServiceRental(rental_repo, book_repo, client_repo, counter)
+    client_service.add_removal_listener(rental_service.remove_client_reservations)
+
+    # Optional instrumentation (the objects are left untouched when it is disabled)
+    registry = None
+    if args.metrics or args.metrics_file:
+        registry = MetricsRegistry()
+        for target in (book_repo, client_repo, rental_repo, book_service, client_service, rental_service):
+            instrument(target, registry)
 
     # 3. Initialize UI (The menu, injected with services)
-    console = Console(book_service, client_service, rental_service)
+    profiler = SessionProfiler() if args.profile else None
+    console = Console(book_service, client_service, rental_service, metrics=registry, profiler=profiler)
 
-    # 4. Start the Application
-    console.run_console()
\ No newline at end of file
+    # 4. Start the Application (or replay a script)
+    try:
+        if args.serve is not None:
+            server = ThreadPoolHTTPServer((args.host, args.serve),
+                                          BookManagementApi(book_service, client_service, rental_service, registry))
+            print(f"Serving the Book Management API on http://{args.host}:{server.server_port}")
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                server.server_close()
+        elif args.script:
+            with open(args.script) as script:
+                ScriptRunner(book_service, client_service, rental_service).run(script)
+        else:
+            console.run_console()
+    finally:
+        if profiler is not None:
+            profiler.write_report(args.profile)
+            print(f"Profile report written to {args.profile}")
+        if args.snapshot:
+            write_snapshot(args.snapshot, book_repo, client_repo, rental_repo)
+        if snapshot is not None:
+            snapshot.close()
+        if feed is not None:
+            feed.close()
+        if args.metrics_file:
+            registry.dump_json(args.metrics_file)
+        if counter is not None:
+            counter.close()
+        if args.shards > 0:
+            book_repo.close()
+            client_repo.close()
+            rental_repo.close()
@@ -0,0 +1,117 @@
+"""
+Per-command profiling of an interactive Console session.
+
+SessionProfiler.measure() wraps one command: cProfile records the functions it
+runs, timed with the process CPU clock so that the time spent waiting for the
+user's input is not counted, and tracemalloc records the peak memory allocated
+during the command. The measurements are aggregated per command over the whole
+session, and the report lists for every command its CPU time (first, last, mean
+and max, so commands that slow down as the data grows stand out), its peak
+allocation and the functions that took the most time.
+"""
+
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+class CommandProfile:
+    def __init__(self):
+        """
+        Initialize empty measurements for one command.
+        """
+        self.cpu_seconds = []
+        self.peak_bytes = 0
+        self.stats = None
+
+
+class SessionProfiler:
+    def __init__(self, top=10):
+        """
+        Initialize a profiler with no measured commands.
+
+        Args:
+            top: The number of functions listed per command in the report
+        """
+        self._top = top
+        self._commands = {}
+
+    @contextmanager
+    def measure(self, command):
+        """
+        Profile the CPU time and the peak allocation of the block, for one command.
+
+        Args:
+            command: The name the measurements are aggregated under
+        """
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        profile = cProfile.Profile(time.process_time)
+        start = time.process_time()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            cpu_seconds = time.process_time() - start
+            _, peak = tracemalloc.get_traced_memory()
+            if started_tracing:
+                tracemalloc.stop()
+            self._record(command, cpu_seconds, peak - baseline, profile)
+
+    def _record(self, command, cpu_seconds, peak_bytes, profile):
+        """
+        Add the measurements of one command run to the session totals.
+
+        Args:
+            command: The name of the command
+            cpu_seconds: The CPU time of the run
+            peak_bytes: The peak memory allocated during the run
+            profile (cProfile.Profile): The profile of the run
+        """
+        measured = self._commands.setdefault(command, CommandProfile())
+        measured.cpu_seconds.append(cpu_seconds)
+        measured.peak_bytes = max(measured.peak_bytes, peak_bytes)
+        stats = pstats.Stats(profile, stream=io.StringIO())
+        if measured.stats is None:
+            measured.stats = stats
+        else:
+            measured.stats.add(stats)
+
+    def report(self):
+        """
+        Return the report of the session, the command with the most CPU time first.
+
+        Returns:
+            list: The lines of the report
+        """
+        lines = [f"{'command':<32} {'runs':>5} {'total ms':>10} {'first ms':>10} {'last ms':>10} "
+                 f"{'mean ms':>10} {'max ms':>10} {'peak KB':>10}"]
+        ranked = sorted(self._commands.items(), key=lambda item: sum(item[1].cpu_seconds), reverse=True)
+        for command, measured in ranked:
+            runs = measured.cpu_seconds
+            lines.append(f"{command:<32} {len(runs):>5} {sum(runs) * 1000:>10.2f} {runs[0] * 1000:>10.2f} "
+                         f"{runs[-1] * 1000:>10.2f} {sum(runs) / len(runs) * 1000:>10.2f} "
+                         f"{max(runs) * 1000:>10.2f} {measured.peak_bytes / 1024:>10.1f}")
+        for command, measured in ranked:
+            output = io.StringIO()
+            measured.stats.stream = output
+            measured.stats.sort_stats('cumulative').print_stats(self._top)
+            lines += ["", f"== {command} =="] + [line for line in output.getvalue().splitlines() if line.strip()]
+        return lines
+
+    def write_report(self, path):
+        """
+        Write the report of the session to a text file.
+
+        Args:
+            path: The file to write
+        """
+        with open(path, 'w') as file:
+            file.write("\n".join(self.report()) + "\n")
@@ -0,0 +1,188 @@
+"""
+Opt-in instrumentation for the Book Management services and repositories.
+
+instrument() replaces the public methods of one service or repository instance
+with wrappers that record call counts, a latency histogram and, for repository
+methods that walk a collection, the size of that collection when they are
+called (an upper bound of the items they scan: a lookup can stop early). Objects that
+are not instrumented keep their original methods, so there is no overhead at all
+when instrumentation is disabled.
+"""
+
+import bisect
+import json
+import time
+from functools import wraps
+
+from repo.repo_book import RepoBook
+from repo.repo_client import RepoClient
+from repo.repo_rental import RepoRental
+
+# Upper bounds (in seconds) of the latency histogram buckets; the last bucket is unbounded
+LATENCY_BUCKETS = [1e-6, 2e-6, 5e-6, 1e-5, 2e-5, 5e-5, 1e-4, 2e-4, 5e-4,
+                   1e-3, 2e-3, 5e-3, 1e-2, 2e-2, 5e-2, 0.1, 0.2, 0.5, 1.0]
+
+# Repository methods that walk a collection -> attribute holding that collection
+COLLECTION_METHODS = {
+    RepoBook: {method: '_books' for method in
+               ('delete_book_by_id', 'update_book', 'search_by_title', 'find_books_by_author',
+                'find_book_by_id')},
+    RepoClient: {'search_by_name': '_clients'},
+    RepoRental: {method: '_rentals' for method in
+                 ('remove_rental', 'update_rental', 'update_rentals', 'find_rental_by_id',
+                  'count_by_book', 'count_by_client', 'most_rented_books')},
+}
+
+
+class MethodStats:
+    def __init__(self):
+        """
+        Initialize empty statistics for one instrumented method.
+        """
+        self.calls = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.collection_size = 0
+
+    def to_dict(self):
+        """
+        Return the statistics as a JSON-serialisable dictionary.
+
+        Returns:
+            dict: Calls, errors, latency totals, histogram and summed collection sizes
+        """
+        bounds = [str(bound) for bound in LATENCY_BUCKETS] + ['inf']
+        return {'calls': self.calls, 'errors': self.errors,
+                'total_seconds': self.total_seconds, 'max_seconds': self.max_seconds,
+                'mean_seconds': self.total_seconds / self.calls if self.calls else 0.0,
+                'histogram': dict(zip(bounds, self.buckets)),
+                'collection_size': self.collection_size}
+
+
+class MetricsRegistry:
+    def __init__(self):
+        """
+        Initialize an empty metrics registry.
+        """
+        self._methods = {}
+
+    def stats(self, name):
+        """
+        Return the statistics of a method, creating them on first use.
+
+        Args:
+            name: The qualified method name (e.g. 'RepoBook.find_book_by_id')
+
+        Returns:
+            MethodStats: The statistics of the method
+        """
+        stats = self._methods.get(name)
+        if stats is None:
+            stats = self._methods[name] = MethodStats()
+        return stats
+
+    def record_call(self, name, seconds, failed=False, collection_size=0):
+        """
+        Record one call of an instrumented method.
+
+        Args:
+            name: The qualified method name
+            seconds: The time the call took
+            failed: True if the call raised an exception
+            collection_size: The size of the collection the call walks
+        """
+        stats = self.stats(name)
+        stats.calls += 1
+        stats.total_seconds += seconds
+        stats.max_seconds = max(stats.max_seconds, seconds)
+        stats.buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        stats.collection_size += collection_size
+        if failed:
+            stats.errors += 1
+
+    def snapshot(self):
+        """
+        Return the statistics of every instrumented method.
+
+        Returns:
+            dict: Method name -> statistics dictionary
+        """
+        return {name: stats.to_dict() for name, stats in sorted(self._methods.items())}
+
+    def dump_json(self, path):
+        """
+        Write the statistics of every instrumented method to a JSON file.
+
+        Args:
+            path: The file to write
+        """
+        with open(path, 'w') as file:
+            json.dump(self.snapshot(), file, indent=2)
+
+    def format_table(self):
+        """
+        Return the statistics as a table for the console, slowest total time first.
+
+        Returns:
+            list: The lines of the table
+        """
+        lines = [f"{'method':<40} {'calls':>8} {'mean ms':>10} {'max ms':>10} {'avg size':>10}"]
+        for name, stats in sorted(self._methods.items(), key=lambda item: item[1].total_seconds, reverse=True):
+            mean = stats.total_seconds / stats.calls if stats.calls else 0.0
+            size = stats.collection_size / stats.calls if stats.calls else 0.0
+            lines.append(f"{name:<40} {stats.calls:>8} {mean * 1000:>10.4f} {stats.max_seconds * 1000:>10.4f} {size:>10.1f}")
+        return lines
+
+
+def _wrap(method, registry, name, target, collection):
+    """
+    Wrap a bound method so that every call is recorded in the registry.
+
+    Args:
+        method: The bound method to wrap
+        registry (MetricsRegistry): The registry receiving the measurements
+        name: The qualified method name
+        target: The instance the method belongs to
+        collection: The name of the attribute holding the collection the method walks, or None
+
+    Returns:
+        The wrapping function
+    """
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        collection_size = len(getattr(target, collection)) if collection is not None else 0
+        start = time.perf_counter()
+        try:
+            result = method(*args, **kwargs)
+        except Exception:
+            registry.record_call(name, time.perf_counter() - start, True, collection_size)
+            raise
+        registry.record_call(name, time.perf_counter() - start, False, collection_size)
+        return result
+    return wrapper
+
+
+def instrument(target, registry, prefix=None):
+    """
+    Record every call of the public methods of a service or repository instance.
+
+    Only this instance is changed; other instances of the class are unaffected.
+
+    Args:
+        target: The service or repository instance to instrument
+        registry (MetricsRegistry): The registry receiving the measurements
+        prefix: The name used for the methods in the registry (defaults to the class name)
+
+    Returns:
+        The instrumented target
+    """
+    prefix = prefix or type(target).__name__
+    collections = next((COLLECTION_METHODS[cls] for cls in type(target).__mro__ if cls in COLLECTION_METHODS), {})
+    for attribute in dir(type(target)):
+        if attribute.startswith('_') or not callable(getattr(target, attribute)):
+            continue
+        setattr(target, attribute, _wrap(getattr(target, attribute), registry, f"{prefix}.{attribute}",
+                                         target, collections.get(attribute)))
+    return target
@@ -0,0 +1,111 @@
+"""
+BK-tree for finding words within a given edit distance.
+
+Every node stores a word and its children by their edit distance to that word.
+Because the edit distance is a metric, a search for words within distance k of
+a query only has to visit the children whose distance d to the current word
+satisfies |d - distance(query, word)| <= k, which prunes most of the tree for
+small k.
+"""
+
+
+def edit_distance(first, second, limit=None):
+    """
+    Compute the Levenshtein distance between two strings.
+
+    Args:
+        first: The first string
+        second: The second string
+        limit: Stop early and return limit + 1 once the distance is known to exceed limit
+
+    Returns:
+        int: The number of insertions, deletions and substitutions turning first into second
+    """
+    if len(first) < len(second):
+        first, second = second, first
+    if limit is not None and len(first) - len(second) > limit:
+        return limit + 1
+    previous = list(range(len(second) + 1))
+    for i, first_char in enumerate(first, 1):
+        current = [i]
+        left = i
+        for j, second_char in enumerate(second):
+            # cheapest of substituting (diagonal), inserting (left) and deleting (above)
+            cost = previous[j] if first_char == second_char else previous[j] + 1
+            if left + 1 < cost:
+                cost = left + 1
+            if previous[j + 1] + 1 < cost:
+                cost = previous[j + 1] + 1
+            current.append(cost)
+            left = cost
+        if limit is not None and min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class BKTree:
+    def __init__(self):
+        """
+        Initialize an empty BK-tree.
+        """
+        self._root = None
+        self._size = 0
+
+    def __len__(self):
+        """
+        Return the number of words in the tree.
+
+        Returns:
+            int: The number of distinct words added
+        """
+        return self._size
+
+    def add(self, word):
+        """
+        Add a word to the tree (adding a word twice has no effect).
+
+        Args:
+            word: The word to add
+        """
+        if self._root is None:
+            self._root = (word, {})
+            self._size = 1
+            return
+        node_word, children = self._root
+        while True:
+            distance = edit_distance(word, node_word)
+            if distance == 0:
+                return
+            child = children.get(distance)
+            if child is None:
+                children[distance] = (word, {})
+                self._size += 1
+                return
+            node_word, children = child
+
+    def search(self, word, max_distance):
+        """
+        Find the words within an edit distance of a word.
+
+        Args:
+            word: The word to look for
+            max_distance: The largest edit distance accepted
+
+        Returns:
+            list: (distance, word) tuples of the matching words, closest first
+        """
+        if self._root is None:
+            return []
+        matches = []
+        pending = [self._root]
+        while pending:
+            node_word, children = pending.pop()
+            distance = edit_distance(word, node_word)
+            if distance <= max_distance:
+                matches.append((distance, node_word))
+            for child_distance, child in children.items():
+                if distance - max_distance <= child_distance <= distance + max_distance:
+                    pending.append(child)
+        matches.sort()
+        return matches
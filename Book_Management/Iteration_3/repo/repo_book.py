@@ -2,8 +2,49 @@ class RepoBook:
     def __init__(self):
         """
         Initialize an empty RepoBook repository.
+        
+        Authors are dictionary-encoded: every distinct author is stored once in
+        self._authors and the books added or updated through the repository refer
+        to that single string instead of a copy of their own.
+
+        Deleting a book or changing its author may leave an author without books.
+        Such entries are dropped by rebuilding the dictionary once more books were
+        deleted or re-authored than are left, which keeps the cost per change constant.
         """
         self._books = []
+        self._authors = {}
+        self._stale = 0
+
+    def _encode(self, book):
+        """
+        Replace the author of a book with the shared string of the author dictionary.
+        
+        Args:
+            book: The Book object to encode
+            
+        Returns:
+            Book: The same Book object
+        """
+        book.author = self._authors.setdefault(book.author, book.author)
+        return book
+
+    def _encoded_books(self):
+        """
+        Return the books whose authors were encoded.
+        
+        Returns:
+            iterable: The Book objects of the repository
+        """
+        return self._books
+
+    def _forget_author(self):
+        """
+        Count a book deleted or re-authored, dropping the authors left without books when enough were.
+        """
+        self._stale += 1
+        if self._stale > len(self._books):
+            self._authors = {book.author: book.author for book in self._encoded_books()}
+            self._stale = 0
     
     def add_book(self, book):
         """
@@ -12,7 +53,16 @@ class RepoBook:
         Args:
             book: The Book object to add
         """
-        self._books.append(book)
+        self._books.append(self._encode(book))
+
+    def add_books(self, books):
+        """
+        Add several books to the repository in one operation.
+        
+        Args:
+            books: A list of Book objects to add
+        """
+        self._books.extend(self._encode(book) for book in books)
 
     def get_all_books(self):
         """
@@ -33,6 +83,7 @@ class RepoBook:
         for book in self._books:
             if book.id == book_id:
                 self._books.remove(book)
+                self._forget_author()
                 return
             
     def update_book(self, updated_book):
@@ -46,7 +97,10 @@ class RepoBook:
             if book.id == updated_book.id:
                 book.title = updated_book.title
                 book.description = updated_book.description
-                book.author = updated_book.author
+                if book.author != updated_book.author:
+                    book.author = updated_book.author
+                    self._encode(book)
+                    self._forget_author()
                 return
         
     def search_by_title(self, title_query):
@@ -60,6 +114,22 @@ class RepoBook:
             list: A list of Book objects matching the query
         """
         return [book for book in self._books if title_query.lower() in book.title.lower()]
+
+    def find_books_by_author(self, author):
+        """
+        Find the books of an author (exact match).
+        
+        The authors are compared by equality, so a book whose author was changed
+        on the object itself is found too. For the books sharing the author's
+        string the comparison stops at the identity check.
+        
+        Args:
+            author: The author to look for
+            
+        Returns:
+            list: A list of Book objects written by the author
+        """
+        return [book for book in self._books if book.author == author]
     
     def find_book_by_id(self, book_id):
         """
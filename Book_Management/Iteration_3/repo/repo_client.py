@@ -1,9 +1,72 @@
+import sys
+
+from repo.bk_tree import BKTree
+
+
 class RepoClient:
     def __init__(self):
         """
         Initialize an empty RepoClient repository using a dictionary.
+        
+        Client names are interned (sys.intern), so clients with the same name
+        share one string. The fuzzy name index is built on the first fuzzy search
+        and kept up to date afterwards.
         """
         self._clients = {}
+        self._name_index = None
+        self._name_tree = None
+
+    def _intern(self, client):
+        """
+        Replace the name of a client with the shared interned string.
+        
+        Args:
+            client: The Client object whose name is interned
+        """
+        if type(client.name) is str:
+            client.name = sys.intern(client.name)
+
+    def _name_items(self):
+        """
+        Iterate over the ID and name of every client.
+        
+        Yields:
+            tuple: (client ID, client name)
+        """
+        for client in self._clients.values():
+            yield client.id, client.name
+
+    def _index_name(self, client_id, name):
+        """
+        Add the words of a client name to the fuzzy name index, if it is built.
+        
+        Args:
+            client_id: The ID of the client
+            name: The name of the client
+        """
+        if self._name_index is None:
+            return
+        for word in set(str(name).lower().split()):
+            ids = self._name_index.get(word)
+            if ids is None:
+                ids = self._name_index[word] = set()
+                self._name_tree.add(word)
+            ids.add(client_id)
+
+    def _unindex_name(self, client_id, name):
+        """
+        Remove the words of a client name from the fuzzy name index, if it is built.
+        
+        Words without clients stay in the BK-tree and are skipped by searches.
+        
+        Args:
+            client_id: The ID of the client
+            name: The name of the client
+        """
+        if self._name_index is None:
+            return
+        for word in set(str(name).lower().split()):
+            self._name_index.get(word, set()).discard(client_id)
 
     def add_client(self, client):
         """
@@ -17,7 +80,32 @@ class RepoClient:
         """
         if client.id in self._clients:
             raise ValueError(f"Client with ID {client.id} already exists.")
+        self._intern(client)
         self._clients[client.id] = client
+        if self._name_index is not None:
+            self._index_name(client.id, client.name)
+
+    def add_clients(self, clients):
+        """
+        Add several clients to the repository in one operation.
+        
+        No client is added if any of them is a duplicate.
+        
+        Args:
+            clients: A list of Client objects to add
+            
+        Raises:
+            ValueError: If a client ID already exists or appears twice in the list
+        """
+        new_clients = {}
+        for client in clients:
+            if client.id in self._clients or client.id in new_clients:
+                raise ValueError(f"Client with ID {client.id} already exists.")
+            new_clients[client.id] = client
+        for client in new_clients.values():
+            self._intern(client)
+            self._index_name(client.id, client.name)
+        self._clients.update(new_clients)
 
     def get_all_clients(self):
         """
@@ -40,6 +128,8 @@ class RepoClient:
         """
         if client_id not in self._clients:
             raise ValueError(f"Client with ID {client_id} does not exist.")
+        if self._name_index is not None:
+            self._unindex_name(client_id, self._clients[client_id].name)
         del self._clients[client_id]
 
     def update_client(self, client):
@@ -54,6 +144,10 @@ class RepoClient:
         """
         if client.id not in self._clients:
             raise ValueError(f"Client with ID {client.id} does not exist.")
+        self._intern(client)
+        if self._name_index is not None:
+            self._unindex_name(client.id, self._clients[client.id].name)
+            self._index_name(client.id, client.name)
         self._clients[client.id] = client
 
     def search_by_name(self, name_query):
@@ -68,6 +162,43 @@ class RepoClient:
         """
         return [client for client in self._clients.values() if name_query.lower() in client.name.lower()]
     
+    def fuzzy_search_by_name(self, name_query, max_distance=1):
+        """
+        Search for clients whose name is close to the query, allowing typos.
+        
+        Every word of the query must be within max_distance edits (case-insensitive)
+        of a word of the client's name. The words are looked up in a BK-tree, so
+        only a small part of the distinct name words is compared with the query.
+        
+        Args:
+            name_query: The name or part of the name to search for
+            max_distance: The largest edit distance accepted for each word
+            
+        Returns:
+            list: A list of Client objects, closest matches first
+        """
+        if self._name_index is None:
+            self._name_index = {}
+            self._name_tree = BKTree()
+            for client_id, name in self._name_items():
+                self._index_name(client_id, name)
+        scores = None
+        for word in name_query.lower().split():
+            word_scores = {}
+            for distance, match in self._name_tree.search(word, max_distance):
+                for client_id in self._name_index[match]:
+                    if client_id not in word_scores:
+                        word_scores[client_id] = distance
+            if scores is None:
+                scores = word_scores
+            else:
+                scores = {client_id: score + word_scores[client_id]
+                          for client_id, score in scores.items() if client_id in word_scores}
+        if not scores:
+            return []
+        ranked = sorted(scores, key=lambda client_id: (scores[client_id], client_id))
+        return [self._clients[client_id] for client_id in ranked]
+
     def find_client_by_id(self, client_id):
         """
         Find a client by their ID.
@@ -1,9 +1,31 @@
+import heapq
+
+
 class RepoRental:
+    # Fields find_rentals_by can answer from a hash index
+    INDEXED_FIELDS = ('book_id', 'client_id')
+
     def __init__(self):
         """
         Initialize an empty RepoRental repository.
+        
+        The index of a field is built on the first find_rentals_by call for it and
+        kept up to date afterwards. The generation is incremented whenever a rental
+        is removed, so copies of the rental list can tell that it was not only appended to.
         """
         self._rentals = []
+        self._indexes = {}
+        self.generation = 0
+
+    def _index_rental(self, rental):
+        """
+        Add a rental to the indexes that are built.
+        
+        Args:
+            rental: The Rental object to index
+        """
+        for field, index in self._indexes.items():
+            index.setdefault(getattr(rental, field), []).append(rental)
 
     def add_rental(self, rental):
         """
@@ -13,6 +35,20 @@ class RepoRental:
             rental: The Rental object to add
         """
         self._rentals.append(rental)
+        self._index_rental(rental)
+
+    def add_rentals(self, rentals):
+        """
+        Add several rentals to the repository in one operation.
+        
+        Args:
+            rentals: A list of Rental objects to add
+        """
+        start = len(self._rentals)
+        self._rentals.extend(rentals)
+        if self._indexes:
+            for rental in self._rentals[start:]:
+                self._index_rental(rental)
 
     def remove_rental(self, id):
         """
@@ -27,6 +63,9 @@ class RepoRental:
         for rental in self._rentals:
             if rental.id == id:
                 self._rentals.remove(rental)
+                self.generation += 1
+                for field, index in self._indexes.items():
+                    index[getattr(rental, field)].remove(rental)
                 return
         raise ValueError(f"Rental with ID {id} not found.")
 
@@ -55,6 +94,24 @@ class RepoRental:
                 rental.returned_date = returned_date
                 return
         raise ValueError(f"Rental with ID {rental_id} not found.")
+
+    def update_rentals(self, returned_dates):
+        """
+        Update the return date of several rentals in a single pass over the repository.
+        
+        Args:
+            returned_dates: A dictionary mapping rental IDs to their new return date
+            
+        Raises:
+            ValueError: If one of the rentals is not found (no rental is updated)
+        """
+        found = [rental for rental in self._rentals if rental.id in returned_dates]
+        if len(found) < len(returned_dates):
+            found_ids = {rental.id for rental in found}
+            missing = next(rental_id for rental_id in returned_dates if rental_id not in found_ids)
+            raise ValueError(f"Rental with ID {missing} not found.")
+        for rental in found:
+            rental.returned_date = returned_dates[rental.id]
     
     def find_rental_by_id(self, rental_id):
         """
@@ -69,4 +126,63 @@ class RepoRental:
         for rental in self._rentals:
             if rental.id == rental_id:
                 return rental
-        return None
\ No newline at end of file
+        return None
+
+    def find_rentals_by(self, field, value):
+        """
+        Find the rentals of a book or a client using a hash index.
+        
+        Args:
+            field: One of INDEXED_FIELDS ('book_id' or 'client_id')
+            value: The ID to look for
+            
+        Returns:
+            list: A list of Rental objects, in the order they were added
+            
+        Raises:
+            ValueError: If the field is not indexed
+        """
+        if field not in self.INDEXED_FIELDS:
+            raise ValueError(f"Rentals cannot be looked up by {field}.")
+        index = self._indexes.get(field)
+        if index is None:
+            index = self._indexes[field] = {}
+            for rental in self._rentals:
+                index.setdefault(getattr(rental, field), []).append(rental)
+        return list(index.get(value, ()))
+
+    def count_by_book(self):
+        """
+        Count how many times each book has been rented.
+        
+        Returns:
+            dict: A dictionary mapping book IDs to their rental count
+        """
+        counts = {}
+        for rental in self._rentals:
+            counts[rental.book_id] = counts.get(rental.book_id, 0) + 1
+        return counts
+
+    def count_by_client(self):
+        """
+        Count how many rentals each client has made.
+        
+        Returns:
+            dict: A dictionary mapping client IDs to their rental count
+        """
+        counts = {}
+        for rental in self._rentals:
+            counts[rental.client_id] = counts.get(rental.client_id, 0) + 1
+        return counts
+
+    def most_rented_books(self, k):
+        """
+        Get the k most rented book IDs.
+        
+        Args:
+            k: The number of books to return
+            
+        Returns:
+            list: A list of (book_id, rental_count) tuples sorted by rental count in descending order
+        """
+        return heapq.nlargest(k, self.count_by_book().items(), key=lambda item: item[1])
@@ -0,0 +1,151 @@
+from collections import OrderedDict
+
+
+class RepoReservation:
+    def __init__(self):
+        """
+        Initialize an empty RepoReservation repository.
+
+        Every book has a FIFO queue of reservations (an OrderedDict keyed by client ID,
+        so adding, taking the first and cancelling any reservation are all O(1)), and
+        every client has an index of the books they reserved. Books handed off to the
+        first client in their queue are held for that client until they rent it.
+        """
+        self._queues = {}
+        self._by_client = {}
+        self._held = {}
+
+    def add_reservation(self, reservation):
+        """
+        Add a reservation at the end of the queue of its book.
+
+        Args:
+            reservation: The Reservation object to add
+
+        Raises:
+            ValueError: If the client already has a reservation for the book
+        """
+        queue = self._queues.setdefault(reservation.book_id, OrderedDict())
+        if reservation.client_id in queue:
+            raise ValueError(f"Client with ID {reservation.client_id} already reserved book with ID {reservation.book_id}.")
+        queue[reservation.client_id] = reservation
+        self._by_client.setdefault(reservation.client_id, {})[reservation.book_id] = reservation
+
+    def _discard(self, book_id, client_id):
+        """
+        Remove a reservation from its queue and from the client index.
+
+        Args:
+            book_id: The ID of the reserved book
+            client_id: The ID of the client
+
+        Returns:
+            Reservation: The removed Reservation object
+        """
+        queue = self._queues[book_id]
+        reservation = queue.pop(client_id)
+        if not queue:
+            del self._queues[book_id]
+        books = self._by_client[client_id]
+        del books[book_id]
+        if not books:
+            del self._by_client[client_id]
+        return reservation
+
+    def pop_next(self, book_id):
+        """
+        Remove and return the oldest reservation of a book.
+
+        Args:
+            book_id: The ID of the book
+
+        Returns:
+            Reservation: The oldest Reservation object, or None if nobody is waiting
+        """
+        queue = self._queues.get(book_id)
+        if not queue:
+            return None
+        client_id = next(iter(queue))
+        return self._discard(book_id, client_id)
+
+    def cancel_reservation(self, book_id, client_id):
+        """
+        Cancel the reservation of a client for a book.
+
+        Args:
+            book_id: The ID of the reserved book
+            client_id: The ID of the client
+
+        Raises:
+            ValueError: If the client has no reservation for the book
+        """
+        if client_id not in self._queues.get(book_id, ()):
+            raise ValueError(f"Client with ID {client_id} has no reservation for book with ID {book_id}.")
+        self._discard(book_id, client_id)
+
+    def get_queue(self, book_id):
+        """
+        Retrieve the reservations of a book, oldest first.
+
+        Args:
+            book_id: The ID of the book
+
+        Returns:
+            list: A list of Reservation objects
+        """
+        return list(self._queues.get(book_id, {}).values())
+
+    def get_client_reservations(self, client_id):
+        """
+        Retrieve the active reservations of a client.
+
+        Args:
+            client_id: The ID of the client
+
+        Returns:
+            list: A list of Reservation objects, in the order they were made
+        """
+        return list(self._by_client.get(client_id, {}).values())
+
+    def hold(self, book_id, client_id):
+        """
+        Hold a book for the client it was handed off to.
+
+        Args:
+            book_id: The ID of the book
+            client_id: The ID of the client the book is held for
+        """
+        self._held[book_id] = client_id
+
+    def release(self, book_id):
+        """
+        Stop holding a book.
+
+        Args:
+            book_id: The ID of the book
+        """
+        self._held.pop(book_id, None)
+
+    def get_held_books(self, client_id):
+        """
+        Find the books held for a client.
+
+        Args:
+            client_id: The ID of the client
+
+        Returns:
+            list: The IDs of the books held for the client
+        """
+        return [book_id for book_id, holder in self._held.items() if holder == client_id]
+
+    def held_for(self, book_id):
+        """
+        Find the client a book is held for.
+
+        Args:
+            book_id: The ID of the book
+
+        Returns:
+            The ID of the client, or None if the book is not held
+        """
+        return self._held.get(book_id)
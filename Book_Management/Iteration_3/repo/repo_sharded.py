@@ -0,0 +1,581 @@
+"""
+Sharded repositories for catalogs that are too large for a single repository.
+
+Books, clients and rentals are partitioned across N shards by the hash of their ID.
+Rentals are placed on the shard of the book they refer to, so every per-book
+question (is it rented, how often was it rented) is answered by a single shard.
+Point operations are routed to one shard, while searches and reports are sent to
+every shard at once and their partial results are merged.
+
+Each shard is either a plain in-process repository or, with processes=True, a
+repository living in its own worker process.
+
+With processes=True every record crosses the process boundary by pickling: the
+objects passed in are copied into the worker, and lookups and searches return
+copies. Changing an object returned by the repository then changes nothing
+stored, whereas an in-process shard returns the stored object itself. Records
+must therefore be changed through the repository methods (update_book,
+update_client, update_rental, ...), which behave the same in both modes.
+"""
+
+import heapq
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from repo.repo_book import RepoBook
+from repo.repo_client import RepoClient
+from repo.repo_rental import RepoRental
+
+# The repository owned by the current worker process (set by _init_shard)
+_shard_repo = None
+
+
+def _init_shard(repo_class):
+    """
+    Create the repository owned by a shard worker process.
+
+    Args:
+        repo_class: The repository class to instantiate in the worker
+    """
+    global _shard_repo
+    _shard_repo = repo_class()
+
+
+def _call_shard(method, args):
+    """
+    Call a method on the repository owned by the current worker process.
+
+    Args:
+        method: The name of the repository method to call
+        args: The positional arguments for the method
+
+    Returns:
+        The value returned by the repository method
+    """
+    return getattr(_shard_repo, method)(*args)
+
+
+class _LocalShard:
+    def __init__(self, repo_class):
+        """
+        Initialize a shard that keeps its repository in the current process.
+
+        Args:
+            repo_class: The repository class used to store the shard data
+        """
+        self._repo = repo_class()
+
+    def submit(self, method, *args):
+        """
+        Run a repository method and wrap its outcome in a completed Future.
+
+        Args:
+            method: The name of the repository method to call
+            *args: The positional arguments for the method
+
+        Returns:
+            Future: A future holding the result or the raised exception
+        """
+        future = Future()
+        try:
+            future.set_result(getattr(self._repo, method)(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def close(self):
+        """
+        Release the shard (nothing to do for an in-process shard).
+        """
+        pass
+
+
+class _ProcessShard:
+    def __init__(self, repo_class):
+        """
+        Initialize a shard whose repository lives in a dedicated worker process.
+
+        Arguments and results are pickled, so the worker stores copies of the
+        objects it receives and every result is a copy of what it stores.
+
+        Args:
+            repo_class: The repository class created inside the worker process
+        """
+        self._executor = ProcessPoolExecutor(max_workers=1, initializer=_init_shard, initargs=(repo_class,))
+
+    def submit(self, method, *args):
+        """
+        Send a repository method call to the worker process.
+
+        Args:
+            method: The name of the repository method to call
+            *args: The positional arguments for the method
+
+        Returns:
+            Future: A future resolved with the result from the worker
+        """
+        return self._executor.submit(_call_shard, method, args)
+
+    def close(self):
+        """
+        Shut down the worker process owning this shard.
+        """
+        self._executor.shutdown()
+
+
+class _ShardedRepo:
+    def __init__(self, repo_class, shard_count, processes):
+        """
+        Create the shards of a sharded repository.
+
+        Args:
+            repo_class: The repository class used for every shard
+            shard_count: The number of shards to partition the data into
+            processes: If True, each shard runs in its own worker process
+
+        Raises:
+            ValueError: If shard_count is smaller than 1
+        """
+        if shard_count < 1:
+            raise ValueError("Shard count must be at least 1.")
+        shard_class = _ProcessShard if processes else _LocalShard
+        self._shards = [shard_class(repo_class) for _ in range(shard_count)]
+
+    def _shard_for(self, key):
+        """
+        Return the shard responsible for the given key.
+
+        Args:
+            key: The ID used to route the operation
+
+        Returns:
+            The shard owning the key
+        """
+        return self._shards[hash(key) % len(self._shards)]
+
+    def _submit_grouped(self, method, items, key):
+        """
+        Split items by owning shard and send each shard its group in one call.
+
+        Args:
+            method: The name of the batch repository method to call
+            items: The items to distribute across the shards
+            key: The function returning the routing ID of an item
+        """
+        groups = {}
+        for item in items:
+            groups.setdefault(hash(key(item)) % len(self._shards), []).append(item)
+        futures = [self._shards[index].submit(method, group) for index, group in groups.items()]
+        for future in futures:
+            future.result()
+
+    def _fan_out(self, method, *args):
+        """
+        Call a method on every shard in parallel and collect the partial results.
+
+        Args:
+            method: The name of the repository method to call
+            *args: The positional arguments for the method
+
+        Returns:
+            list: The result of each shard, in shard order
+        """
+        futures = [shard.submit(method, *args) for shard in self._shards]
+        return [future.result() for future in futures]
+
+    def close(self):
+        """
+        Release all shards (stops the worker processes when processes=True).
+        """
+        for shard in self._shards:
+            shard.close()
+
+
+class ShardedRepoBook(_ShardedRepo):
+    def __init__(self, shard_count=4, processes=False):
+        """
+        Initialize a book repository partitioned by the hash of the book ID.
+
+        Args:
+            shard_count: The number of shards (defaults to 4)
+            processes: If True, each shard runs in its own worker process
+        """
+        super().__init__(RepoBook, shard_count, processes)
+
+    def add_book(self, book):
+        """
+        Add a new book to the shard owning its ID.
+
+        Args:
+            book: The Book object to add
+        """
+        self._shard_for(book.id).submit("add_book", book).result()
+
+    def add_books(self, books):
+        """
+        Add several books, sending each shard its own books in one call.
+
+        Args:
+            books: A list of Book objects to add
+        """
+        self._submit_grouped("add_books", books, lambda book: book.id)
+
+    def get_all_books(self):
+        """
+        Retrieve all books from every shard.
+
+        Returns:
+            list: A list of all Book objects
+        """
+        return [book for books in self._fan_out("get_all_books") for book in books]
+
+    def delete_book_by_id(self, book_id):
+        """
+        Delete a book from the shard owning its ID.
+
+        Args:
+            book_id: The ID of the book to delete
+        """
+        self._shard_for(book_id).submit("delete_book_by_id", book_id).result()
+
+    def update_book(self, updated_book):
+        """
+        Update an existing book on the shard owning its ID.
+
+        Args:
+            updated_book: The Book object with updated information
+        """
+        self._shard_for(updated_book.id).submit("update_book", updated_book).result()
+
+    def search_by_title(self, title_query):
+        """
+        Search every shard for books by title query (case-insensitive partial match).
+
+        Args:
+            title_query: The title or partial title to search for
+
+        Returns:
+            list: A list of Book objects matching the query
+        """
+        return [book for books in self._fan_out("search_by_title", title_query) for book in books]
+
+    def find_books_by_author(self, author):
+        """
+        Find the books of an author on every shard (exact match).
+
+        Args:
+            author: The author to look for
+
+        Returns:
+            list: A list of Book objects written by the author
+        """
+        return [book for books in self._fan_out("find_books_by_author", author) for book in books]
+
+    def find_book_by_id(self, book_id):
+        """
+        Find a book by its ID on the shard owning it.
+
+        Args:
+            book_id: The ID of the book to find
+
+        Returns:
+            Book: The Book object if found, None otherwise
+        """
+        return self._shard_for(book_id).submit("find_book_by_id", book_id).result()
+
+
+class ShardedRepoClient(_ShardedRepo):
+    def __init__(self, shard_count=4, processes=False):
+        """
+        Initialize a client repository partitioned by the hash of the client ID.
+
+        Args:
+            shard_count: The number of shards (defaults to 4)
+            processes: If True, each shard runs in its own worker process
+        """
+        super().__init__(RepoClient, shard_count, processes)
+
+    def add_client(self, client):
+        """
+        Add a new client to the shard owning its ID.
+
+        Args:
+            client: The Client object to add
+
+        Raises:
+            ValueError: If a client with the same ID already exists
+        """
+        self._shard_for(client.id).submit("add_client", client).result()
+
+    def add_clients(self, clients):
+        """
+        Add several clients, sending each shard its own clients in one call.
+
+        Each shard rejects its whole group if one of its clients is a duplicate,
+        but groups sent to other shards may already have been added.
+
+        Args:
+            clients: A list of Client objects to add
+
+        Raises:
+            ValueError: If a client ID already exists or appears twice in the list
+        """
+        self._submit_grouped("add_clients", clients, lambda client: client.id)
+
+    def get_all_clients(self):
+        """
+        Retrieve all clients from every shard.
+
+        Returns:
+            list: A list of all Client objects
+        """
+        return [client for clients in self._fan_out("get_all_clients") for client in clients]
+
+    def remove_client(self, client_id):
+        """
+        Remove a client from the shard owning its ID.
+
+        Args:
+            client_id: The ID of the client to remove
+
+        Raises:
+            ValueError: If the client does not exist
+        """
+        self._shard_for(client_id).submit("remove_client", client_id).result()
+
+    def update_client(self, client):
+        """
+        Update an existing client on the shard owning its ID.
+
+        Args:
+            client: The Client object with updated information
+
+        Raises:
+            ValueError: If the client does not exist
+        """
+        self._shard_for(client.id).submit("update_client", client).result()
+
+    def search_by_name(self, name_query):
+        """
+        Search every shard for clients by name (case-insensitive partial match).
+
+        Args:
+            name_query: The name or partial name to search for
+
+        Returns:
+            list: A list of Client objects matching the query
+        """
+        return [client for clients in self._fan_out("search_by_name", name_query) for client in clients]
+
+    def fuzzy_search_by_name(self, name_query, max_distance=1):
+        """
+        Search every shard for clients whose name is close to the query, allowing typos.
+
+        Args:
+            name_query: The name or part of the name to search for
+            max_distance: The largest edit distance accepted for each word
+
+        Returns:
+            list: A list of Client objects, the closest matches of each shard first
+        """
+        return [client for clients in self._fan_out("fuzzy_search_by_name", name_query, max_distance)
+                for client in clients]
+
+    def find_client_by_id(self, client_id):
+        """
+        Find a client by their ID on the shard owning it.
+
+        Args:
+            client_id: The ID of the client to find
+
+        Returns:
+            Client: The Client object if found, None otherwise
+        """
+        return self._shard_for(client_id).submit("find_client_by_id", client_id).result()
+
+
+class ShardedRepoRental(_ShardedRepo):
+    INDEXED_FIELDS = RepoRental.INDEXED_FIELDS
+
+    def __init__(self, shard_count=4, processes=False):
+        """
+        Initialize a rental repository where each rental lives on the shard of its book.
+
+        Use the same shard_count as the ShardedRepoBook so that a book and its rentals
+        end up on shards with the same index.
+
+        Args:
+            shard_count: The number of shards (defaults to 4)
+            processes: If True, each shard runs in its own worker process
+        """
+        super().__init__(RepoRental, shard_count, processes)
+        self._rental_book = {}
+
+    def _shard_for_rental(self, rental_id):
+        """
+        Return the shard holding a rental, using the book the rental refers to.
+
+        Args:
+            rental_id: The ID of the rental
+
+        Returns:
+            The shard holding the rental, or None if the rental is unknown
+        """
+        if rental_id not in self._rental_book:
+            return None
+        return self._shard_for(self._rental_book[rental_id])
+
+    def add_rental(self, rental):
+        """
+        Add a new rental to the shard owning its book.
+
+        Args:
+            rental: The Rental object to add
+        """
+        self._shard_for(rental.book_id).submit("add_rental", rental).result()
+        self._rental_book[rental.id] = rental.book_id
+
+    def add_rentals(self, rentals):
+        """
+        Add several rentals, sending each shard the rentals of its books in one call.
+
+        Args:
+            rentals: A list of Rental objects to add
+        """
+        self._submit_grouped("add_rentals", rentals, lambda rental: rental.book_id)
+        for rental in rentals:
+            self._rental_book[rental.id] = rental.book_id
+
+    def remove_rental(self, id):
+        """
+        Remove a rental by ID from the shard holding it.
+
+        Args:
+            id: The ID of the rental to remove
+
+        Raises:
+            ValueError: If the rental with the given ID is not found
+        """
+        shard = self._shard_for_rental(id)
+        if shard is None:
+            raise ValueError(f"Rental with ID {id} not found.")
+        shard.submit("remove_rental", id).result()
+        del self._rental_book[id]
+
+    def get_all_rentals(self):
+        """
+        Retrieve all rentals from every shard.
+
+        Returns:
+            list: A list of all Rental objects
+        """
+        return [rental for rentals in self._fan_out("get_all_rentals") for rental in rentals]
+
+    def update_rental(self, rental_id, returned_date):
+        """
+        Update a rental's return date on the shard holding it.
+
+        Args:
+            rental_id: The ID of the rental to update
+            returned_date: The new return date
+
+        Raises:
+            ValueError: If the rental with the given ID is not found
+        """
+        shard = self._shard_for_rental(rental_id)
+        if shard is None:
+            raise ValueError(f"Rental with ID {rental_id} not found.")
+        shard.submit("update_rental", rental_id, returned_date).result()
+
+    def update_rentals(self, returned_dates):
+        """
+        Update the return date of several rentals, sending each shard its own updates in one call.
+
+        Args:
+            returned_dates: A dictionary mapping rental IDs to their new return date
+
+        Raises:
+            ValueError: If one of the rentals is not found (no rental is updated)
+        """
+        groups = {}
+        for rental_id, returned_date in returned_dates.items():
+            if rental_id not in self._rental_book:
+                raise ValueError(f"Rental with ID {rental_id} not found.")
+            index = hash(self._rental_book[rental_id]) % len(self._shards)
+            groups.setdefault(index, {})[rental_id] = returned_date
+        futures = [self._shards[index].submit("update_rentals", group) for index, group in groups.items()]
+        for future in futures:
+            future.result()
+
+    def find_rental_by_id(self, rental_id):
+        """
+        Find a rental by its ID on the shard holding it.
+
+        Args:
+            rental_id: The ID of the rental to find
+
+        Returns:
+            Rental: The Rental object if found, None otherwise
+        """
+        shard = self._shard_for_rental(rental_id)
+        if shard is None:
+            return None
+        return shard.submit("find_rental_by_id", rental_id).result()
+
+    def find_rentals_by(self, field, value):
+        """
+        Find the rentals of a book on the shard owning it, or the rentals of a client on every shard.
+
+        Args:
+            field: One of INDEXED_FIELDS ('book_id' or 'client_id')
+            value: The ID to look for
+
+        Returns:
+            list: A list of Rental objects
+
+        Raises:
+            ValueError: If the field is not indexed
+        """
+        if field not in self.INDEXED_FIELDS:
+            raise ValueError(f"Rentals cannot be looked up by {field}.")
+        if field == 'book_id':
+            return self._shard_for(value).submit("find_rentals_by", field, value).result()
+        return [rental for rentals in self._fan_out("find_rentals_by", field, value) for rental in rentals]
+
+    def count_by_book(self):
+        """
+        Count how many times each book has been rented, merging the counts of all shards.
+
+        Returns:
+            dict: A dictionary mapping book IDs to their rental count
+        """
+        counts = {}
+        for partial in self._fan_out("count_by_book"):
+            # A book's rentals all live on one shard, so the partial counts are disjoint
+            counts.update(partial)
+        return counts
+
+    def count_by_client(self):
+        """
+        Count how many rentals each client has made, summing the counts of all shards.
+
+        Returns:
+            dict: A dictionary mapping client IDs to their rental count
+        """
+        counts = {}
+        for partial in self._fan_out("count_by_client"):
+            for client_id, count in partial.items():
+                counts[client_id] = counts.get(client_id, 0) + count
+        return counts
+
+    def most_rented_books(self, k):
+        """
+        Get the k most rented book IDs by merging the top k of every shard.
+
+        Args:
+            k: The number of books to return
+
+        Returns:
+            list: A list of (book_id, rental_count) tuples sorted by rental count in descending order
+        """
+        candidates = [item for partial in self._fan_out("most_rented_books", k) for item in partial]
+        return heapq.nlargest(k, candidates, key=lambda item: item[1])
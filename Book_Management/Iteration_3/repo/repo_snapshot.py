@@ -0,0 +1,763 @@
+"""
+Binary snapshots of the Book Management repositories.
+
+A snapshot stores every table as fixed-width 64-bit columns: the integer fields
+(IDs) directly, and every string field as a start offset and a length into a
+shared UTF-8 string heap at the end of the file (a length of -1 stands for None).
+Repeated strings, such as authors and dates, are stored in the heap only once.
+
+    header:  magic, book count, client count, rental count, heap size
+    books:   id | title start, length | description start, length | author start, length
+    clients: id | name start, length
+    rentals: id | book_id | client_id | rented_date start, length | returned_date start, length
+    heap:    UTF-8 bytes
+
+Snapshots are opened with mmap, so loading one does not read the file. The
+Snapshot repositories keep the row number of every record that has not been
+used yet and create its Book, Client or Rental object only when it is touched;
+searches, lookups by ID and reports read the columns directly.
+"""
+
+import mmap
+import os
+import struct
+from array import array
+from collections.abc import MutableMapping, MutableSequence
+
+from domain.domain import Book, Client, Rental
+from repo.repo_book import RepoBook
+from repo.repo_client import RepoClient
+from repo.repo_rental import RepoRental
+
+MAGIC = b'BMSNAP01'
+HEADER = struct.Struct('<8s4q')
+
+# Table name -> (record class, integer columns, string columns), in file order
+TABLES = {
+    'books': (Book, ('id',), ('title', 'description', 'author')),
+    'clients': (Client, ('id',), ('name',)),
+    'rentals': (Rental, ('id', 'book_id', 'client_id'), ('rented_date', 'returned_date')),
+}
+
+
+def write_snapshot(path, book_repo, client_repo, rental_repo):
+    """
+    Write the contents of the repositories to a snapshot file.
+
+    The file is written next to the target and then renamed over it, so a
+    snapshot that is currently open is never overwritten in place. The records
+    of Snapshot repositories that were never used are copied column by column
+    from the open snapshot, without creating their objects.
+
+    Args:
+        path: The snapshot file to write
+        book_repo: The repository of the books
+        client_repo: The repository of the clients
+        rental_repo: The repository of the rentals
+
+    Raises:
+        ValueError: If an integer column (an ID) holds a value that is not an integer
+    """
+    clients = client_repo._clients if isinstance(client_repo, SnapshotRepoClient) else client_repo.get_all_clients()
+    records = {'books': book_repo.get_all_books(), 'clients': clients, 'rentals': rental_repo.get_all_rentals()}
+    heap = bytearray()
+    heap_index = {}
+    sections = []
+    counts = []
+    for table, (_, int_columns, string_columns) in TABLES.items():
+        rows = records[table]
+        counts.append(len(rows))
+        for column in int_columns:
+            values = list(_field_values(rows, column))
+            if not all(type(value) is int for value in values):
+                raise ValueError(f"Column {table}.{column} must only hold integers.")
+            sections.append(array('q', values))
+        for column in string_columns:
+            starts = array('q')
+            lengths = array('q')
+            for value in _field_values(rows, column):
+                if value is None:
+                    starts.append(0)
+                    lengths.append(-1)
+                    continue
+                location = heap_index.get(value)
+                if location is None:
+                    data = str(value).encode('utf-8')
+                    location = heap_index[value] = (len(heap), len(data))
+                    heap += data
+                starts.append(location[0])
+                lengths.append(location[1])
+            sections.extend((starts, lengths))
+
+    temporary = f"{path}.tmp"
+    with open(temporary, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, *counts, len(heap)))
+        for section in sections:
+            file.write(section.tobytes())
+        file.write(heap)
+    os.replace(temporary, path)
+
+
+def _field_values(rows, column):
+    """
+    Iterate over one field of every record, without creating the objects of lazy records.
+
+    Args:
+        rows: A list of domain objects, a LazyRecordList or a LazyRecordMap
+        column: The column (attribute) name
+
+    Returns:
+        iterator: The value of the field of each record, in order
+    """
+    if isinstance(rows, (LazyRecordList, LazyRecordMap)):
+        return rows.field_values(column)
+    return (getattr(row, column) for row in rows)
+
+
+class Snapshot:
+    def __init__(self, path):
+        """
+        Open a snapshot file by memory-mapping it.
+
+        Args:
+            path: The snapshot file to open
+
+        Raises:
+            ValueError: If the file is not a snapshot or is truncated
+        """
+        with open(path, 'rb') as file:
+            size = os.fstat(file.fileno()).st_size
+            if size < HEADER.size:
+                raise ValueError(f"{path} is not a Book Management snapshot.")
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, *counts, heap_size = HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a Book Management snapshot.")
+
+        self._counts = dict(zip(TABLES, counts))
+        self._heap = HEADER.size + sum(8 * self._counts[table] * (len(int_columns) + 2 * len(string_columns))
+                                       for table, (_, int_columns, string_columns) in TABLES.items())
+        if self._heap + heap_size > size:
+            self._map.close()
+            raise ValueError(f"{path} is truncated.")
+
+        self._view = memoryview(self._map)
+        self._columns = {}
+        offset = HEADER.size
+        for table, (_, int_columns, string_columns) in TABLES.items():
+            count = self._counts[table]
+            names = list(int_columns)
+            for column in string_columns:
+                names += [f"{column}.start", f"{column}.length"]
+            for name in names:
+                self._columns[table, name] = self._view[offset:offset + 8 * count].cast('q')
+                offset += 8 * count
+
+    def count(self, table):
+        """
+        Return the number of records stored in a table.
+
+        Args:
+            table: The table name ('books', 'clients' or 'rentals')
+
+        Returns:
+            int: The number of records
+        """
+        return self._counts[table]
+
+    def column(self, table, column):
+        """
+        Return an integer column of a table without copying it.
+
+        Args:
+            table: The table name
+            column: The name of an integer column (e.g. 'id')
+
+        Returns:
+            memoryview: The values of the column, one per row
+        """
+        return self._columns[table, column]
+
+    def value(self, table, column, row):
+        """
+        Read one field of one record.
+
+        Args:
+            table: The table name
+            column: The column name
+            row: The row number of the record
+
+        Returns:
+            The integer or string stored in the field (None for a missing string)
+        """
+        if (table, column) in self._columns:
+            return self._columns[table, column][row]
+        length = self._columns[table, f"{column}.length"][row]
+        if length < 0:
+            return None
+        start = self._heap + self._columns[table, f"{column}.start"][row]
+        return str(self._map[start:start + length], 'utf-8')
+
+    def reader(self, table, column):
+        """
+        Return a function reading one column of a table, for scanning many rows.
+
+        Args:
+            table: The table name
+            column: The column name
+
+        Returns:
+            function: Receives a row number and returns the field value
+        """
+        if (table, column) in self._columns:
+            return self._columns[table, column].__getitem__
+        starts = self._columns[table, f"{column}.start"]
+        lengths = self._columns[table, f"{column}.length"]
+        data = self._map
+        heap = self._heap
+
+        def read(row):
+            length = lengths[row]
+            if length < 0:
+                return None
+            start = heap + starts[row]
+            return str(data[start:start + length], 'utf-8')
+        return read
+
+    def record(self, table, row):
+        """
+        Create the domain object of one record.
+
+        Args:
+            table: The table name
+            row: The row number of the record
+
+        Returns:
+            Book, Client or Rental: The record as a new object
+        """
+        record_class, int_columns, string_columns = TABLES[table]
+        return record_class(*[self.value(table, column, row) for column in int_columns + string_columns])
+
+    def close(self):
+        """
+        Release the column views and unmap the file.
+        """
+        for column in self._columns.values():
+            column.release()
+        self._columns = {}
+        self._view.release()
+        self._map.close()
+
+
+class LazyRecordList(MutableSequence):
+    def __init__(self, snapshot, table):
+        """
+        Initialize a list holding the rows of a snapshot table.
+
+        Every element is a row number until it is first read, and the domain
+        object created from that row afterwards.
+
+        Args:
+            snapshot (Snapshot): The open snapshot
+            table: The table name
+        """
+        self._snapshot = snapshot
+        self._table = table
+        self._items = list(range(snapshot.count(table)))
+
+    def __len__(self):
+        """
+        Return the number of elements.
+
+        Returns:
+            int: The number of elements
+        """
+        return len(self._items)
+
+    def __getitem__(self, index):
+        """
+        Return an element, creating its object if it is still a row number.
+
+        Args:
+            index: The position (or a slice)
+
+        Returns:
+            The domain object (or a list of them for a slice)
+        """
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._items)))]
+        item = self._items[index]
+        if type(item) is int:
+            item = self._items[index] = self._snapshot.record(self._table, item)
+        return item
+
+    def __setitem__(self, index, value):
+        """
+        Replace an element.
+
+        Args:
+            index: The position
+            value: The new domain object
+        """
+        self._items[index] = value
+
+    def __delitem__(self, index):
+        """
+        Remove an element without creating its object.
+
+        Args:
+            index: The position
+        """
+        del self._items[index]
+
+    def insert(self, index, value):
+        """
+        Insert an element.
+
+        Args:
+            index: The position
+            value: The domain object to insert
+        """
+        self._items.insert(index, value)
+
+    def extend(self, values):
+        """
+        Append several elements.
+
+        Args:
+            values: The domain objects to append
+        """
+        self._items.extend(values)
+
+    def index_of(self, column, value):
+        """
+        Find the position of the first element with a given field value.
+
+        Args:
+            column: The column (attribute) name
+            value: The value to look for
+
+        Returns:
+            int: The position of the element, or -1 if there is none
+        """
+        for position, field in enumerate(self.field_values(column)):
+            if field == value:
+                return position
+        return -1
+
+    def field_values(self, column):
+        """
+        Iterate over one field of every element without creating their objects.
+
+        Args:
+            column: The column (attribute) name
+
+        Yields:
+            The value of the field of each element, in order
+        """
+        read = self._snapshot.reader(self._table, column)
+        for item in self._items:
+            yield read(item) if type(item) is int else getattr(item, column)
+
+    def created(self):
+        """
+        Iterate over the elements whose objects were already created.
+
+        Yields:
+            The domain objects, in order
+        """
+        for item in self._items:
+            if type(item) is not int:
+                yield item
+
+    def select(self, column, predicate):
+        """
+        Return the elements whose field satisfies a condition, creating only their objects.
+
+        Args:
+            column: The column (attribute) name
+            predicate: A function receiving the field value and returning True to keep the element
+
+        Returns:
+            list: The matching domain objects
+        """
+        return [self[position] for position, value in enumerate(self.field_values(column)) if predicate(value)]
+
+
+class LazyRecordMap(MutableMapping):
+    def __init__(self, snapshot, table):
+        """
+        Initialize a dictionary of the rows of a snapshot table, keyed by ID.
+
+        Args:
+            snapshot (Snapshot): The open snapshot
+            table: The table name
+        """
+        self._snapshot = snapshot
+        self._table = table
+        self._items = dict(zip(snapshot.column(table, 'id'), range(snapshot.count(table))))
+
+    def __len__(self):
+        """
+        Return the number of elements.
+
+        Returns:
+            int: The number of elements
+        """
+        return len(self._items)
+
+    def __iter__(self):
+        """
+        Iterate over the IDs.
+
+        Returns:
+            iterator: The IDs in insertion order
+        """
+        return iter(self._items)
+
+    def __contains__(self, key):
+        """
+        Check whether an ID is present without creating its object.
+
+        Args:
+            key: The ID
+
+        Returns:
+            bool: True if the ID is present
+        """
+        return key in self._items
+
+    def __getitem__(self, key):
+        """
+        Return an element, creating its object if it is still a row number.
+
+        Args:
+            key: The ID
+
+        Returns:
+            The domain object
+
+        Raises:
+            KeyError: If the ID is not present
+        """
+        item = self._items[key]
+        if type(item) is int:
+            item = self._items[key] = self._snapshot.record(self._table, item)
+        return item
+
+    def __setitem__(self, key, value):
+        """
+        Add or replace an element.
+
+        Args:
+            key: The ID
+            value: The domain object
+        """
+        self._items[key] = value
+
+    def __delitem__(self, key):
+        """
+        Remove an element without creating its object.
+
+        Args:
+            key: The ID
+        """
+        del self._items[key]
+
+    def field_items(self, column):
+        """
+        Iterate over the ID and one field of every element without creating their objects.
+
+        Args:
+            column: The column (attribute) name
+
+        Yields:
+            tuple: (ID, value of the field)
+        """
+        read = self._snapshot.reader(self._table, column)
+        for key, item in self._items.items():
+            yield key, read(item) if type(item) is int else getattr(item, column)
+
+    def field_values(self, column):
+        """
+        Iterate over one field of every element without creating their objects.
+
+        Args:
+            column: The column (attribute) name
+
+        Yields:
+            The value of the field of each element, in insertion order
+        """
+        for _, value in self.field_items(column):
+            yield value
+
+    def select(self, column, predicate):
+        """
+        Return the elements whose field satisfies a condition, creating only their objects.
+
+        Args:
+            column: The column (attribute) name
+            predicate: A function receiving the field value and returning True to keep the element
+
+        Returns:
+            list: The matching domain objects
+        """
+        read = self._snapshot.reader(self._table, column)
+        matches = []
+        for key, item in self._items.items():
+            if predicate(read(item) if type(item) is int else getattr(item, column)):
+                matches.append(self[key])
+        return matches
+
+
+class SnapshotRepoBook(RepoBook):
+    def __init__(self, snapshot):
+        """
+        Initialize a RepoBook holding the books of a snapshot.
+
+        Args:
+            snapshot (Snapshot): The open snapshot
+        """
+        super().__init__()
+        self._books = LazyRecordList(snapshot, 'books')
+
+    def _encoded_books(self):
+        """
+        Return the books whose authors were encoded, the books whose objects were created.
+
+        Returns:
+            iterable: The Book objects created so far
+        """
+        return self._books.created()
+
+    def delete_book_by_id(self, book_id):
+        """
+        Delete a book from the repository by its ID.
+
+        Args:
+            book_id: The ID of the book to delete
+        """
+        position = self._books.index_of('id', book_id)
+        if position >= 0:
+            del self._books[position]
+            self._forget_author()
+
+    def update_book(self, updated_book):
+        """
+        Update an existing book in the repository.
+
+        Args:
+            updated_book: The Book object with updated information
+        """
+        book = self.find_book_by_id(updated_book.id)
+        if book is not None:
+            book.title = updated_book.title
+            book.description = updated_book.description
+            if book.author != updated_book.author:
+                book.author = updated_book.author
+                self._encode(book)
+                self._forget_author()
+
+    def search_by_title(self, title_query):
+        """
+        Search for books by title query (case-insensitive partial match).
+
+        Args:
+            title_query: The title or partial title to search for
+
+        Returns:
+            list: A list of Book objects matching the query
+        """
+        query = title_query.lower()
+        return self._books.select('title', lambda title: query in title.lower())
+
+    def find_books_by_author(self, author):
+        """
+        Find the books of an author (exact match).
+
+        Args:
+            author: The author to look for
+
+        Returns:
+            list: A list of Book objects written by the author
+        """
+        return self._books.select('author', lambda value: value == author)
+
+    def find_book_by_id(self, book_id):
+        """
+        Find a book by its ID.
+
+        Args:
+            book_id: The ID of the book to find
+
+        Returns:
+            Book: The Book object if found, None otherwise
+        """
+        position = self._books.index_of('id', book_id)
+        return self._books[position] if position >= 0 else None
+
+
+class SnapshotRepoClient(RepoClient):
+    def __init__(self, snapshot):
+        """
+        Initialize a RepoClient holding the clients of a snapshot.
+
+        Args:
+            snapshot (Snapshot): The open snapshot
+        """
+        super().__init__()
+        self._clients = LazyRecordMap(snapshot, 'clients')
+
+    def search_by_name(self, name_query):
+        """
+        Search for clients by name (case-insensitive partial match).
+
+        Args:
+            name_query: The name or partial name to search for
+
+        Returns:
+            list: A list of Client objects matching the query
+        """
+        query = name_query.lower()
+        return self._clients.select('name', lambda name: query in name.lower())
+
+    def _name_items(self):
+        """
+        Iterate over the ID and name of every client without creating the Client objects.
+
+        Yields:
+            tuple: (client ID, client name)
+        """
+        return self._clients.field_items('name')
+
+
+class SnapshotRepoRental(RepoRental):
+    def __init__(self, snapshot):
+        """
+        Initialize a RepoRental holding the rentals of a snapshot.
+
+        Args:
+            snapshot (Snapshot): The open snapshot
+        """
+        super().__init__()
+        self._rentals = LazyRecordList(snapshot, 'rentals')
+
+    def remove_rental(self, id):
+        """
+        Remove a rental from the repository by ID.
+
+        Args:
+            id: The ID of the rental to remove
+
+        Raises:
+            ValueError: If the rental with the given ID is not found
+        """
+        position = self._rentals.index_of('id', id)
+        if position < 0:
+            raise ValueError(f"Rental with ID {id} not found.")
+        del self._rentals[position]
+        self.generation += 1
+
+    def update_rental(self, rental_id, returned_date):
+        """
+        Update a rental's return date.
+
+        Args:
+            rental_id: The ID of the rental to update
+            returned_date: The new return date
+
+        Raises:
+            ValueError: If the rental with the given ID is not found
+        """
+        rental = self.find_rental_by_id(rental_id)
+        if rental is None:
+            raise ValueError(f"Rental with ID {rental_id} not found.")
+        rental.returned_date = returned_date
+
+    def update_rentals(self, returned_dates):
+        """
+        Update the return date of several rentals in a single pass over the repository.
+
+        Args:
+            returned_dates: A dictionary mapping rental IDs to their new return date
+
+        Raises:
+            ValueError: If one of the rentals is not found (no rental is updated)
+        """
+        found = self._rentals.select('id', lambda rental_id: rental_id in returned_dates)
+        if len(found) < len(returned_dates):
+            found_ids = {rental.id for rental in found}
+            missing = next(rental_id for rental_id in returned_dates if rental_id not in found_ids)
+            raise ValueError(f"Rental with ID {missing} not found.")
+        for rental in found:
+            rental.returned_date = returned_dates[rental.id]
+
+    def find_rental_by_id(self, rental_id):
+        """
+        Find a rental by its ID.
+
+        Args:
+            rental_id: The ID of the rental to find
+
+        Returns:
+            Rental: The Rental object if found, None otherwise
+        """
+        position = self._rentals.index_of('id', rental_id)
+        return self._rentals[position] if position >= 0 else None
+
+    def find_rentals_by(self, field, value):
+        """
+        Find the rentals of a book or a client by scanning the column, without building an index.
+
+        Args:
+            field: One of INDEXED_FIELDS ('book_id' or 'client_id')
+            value: The ID to look for
+
+        Returns:
+            list: A list of Rental objects, in the order they were added
+
+        Raises:
+            ValueError: If the field is not indexed
+        """
+        if field not in self.INDEXED_FIELDS:
+            raise ValueError(f"Rentals cannot be looked up by {field}.")
+        return self._rentals.select(field, lambda field_value: field_value == value)
+
+    def count_by_book(self):
+        """
+        Count how many times each book has been rented.
+
+        Returns:
+            dict: A dictionary mapping book IDs to their rental count
+        """
+        counts = {}
+        for book_id in self._rentals.field_values('book_id'):
+            counts[book_id] = counts.get(book_id, 0) + 1
+        return counts
+
+    def count_by_client(self):
+        """
+        Count how many rentals each client has made.
+
+        Returns:
+            dict: A dictionary mapping client IDs to their rental count
+        """
+        counts = {}
+        for client_id in self._rentals.field_values('client_id'):
+            counts[client_id] = counts.get(client_id, 0) + 1
+        return counts
+
+
+def load_snapshot(path):
+    """
+    Open a snapshot and create the repositories reading from it.
+
+    Args:
+        path: The snapshot file to open
+
+    Returns:
+        tuple: (Snapshot, SnapshotRepoBook, SnapshotRepoClient, SnapshotRepoRental)
+    """
+    snapshot = Snapshot(path)
+    return snapshot, SnapshotRepoBook(snapshot), SnapshotRepoClient(snapshot), SnapshotRepoRental(snapshot)
@@ -0,0 +1,464 @@
+"""
+HTTP JSON API for the Book Management System.
+
+The server speaks HTTP/1.1, so clients can keep a connection open and send many
+requests over it. Connections are handled by a fixed pool of worker threads; an
+idle keep-alive connection is closed after IDLE_TIMEOUT seconds so it does not
+hold a worker forever. The services are not thread-safe, so every call into them
+is serialised by a lock.
+
+Endpoints:
+    GET    /books[?title=...]              list books (or search by title)
+    POST   /books                          add a book {id, title, description, author}
+    GET    /books/<id>                     get a book
+    PUT    /books/<id>                     update a book {title, description, author}
+    DELETE /books/<id>                     remove a book
+    GET    /clients[?name=...]             list clients (or search by name)
+    GET    /clients?name=...&distance=k    fuzzy search by name, k typos per word
+    POST   /clients                        add a client {id, name}
+    GET    /clients/<id>                   get a client
+    PUT    /clients/<id>                   update a client {name}
+    DELETE /clients/<id>                   remove a client
+    GET    /rentals                        list rentals
+    POST   /rentals                        rent a book {id, book_id, client_id, rented_date}
+    POST   /rentals/<id>/return            return a book {returned_date}
+    GET    /reports/most-rented            top 3 most rented books
+    GET    /reports/most-active            top 20% most active clients
+    GET    /reports/borrowers/<book_id>    borrowers of a book
+    GET    /metrics                        request counts and latencies per route
+    GET    /metrics/services               service and repository call statistics (with a registry)
+"""
+
+import json
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+from domain.domain import Book, Client
+
+IDLE_TIMEOUT = 5
+
+# Number of latency samples kept per route for the percentiles
+LATENCY_SAMPLES = 10000
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        """
+        Initialize an error that is sent back to the client with the given status.
+
+        Args:
+            status: The HTTP status code
+            message: The error message
+        """
+        super().__init__(message)
+        self.status = status
+
+
+def book_to_dict(book):
+    """
+    Convert a Book to a JSON-serialisable dictionary.
+
+    Args:
+        book: The Book object to convert
+
+    Returns:
+        dict: The book fields
+    """
+    return {'id': book.id, 'title': book.title, 'description': book.description, 'author': book.author}
+
+
+def client_to_dict(client):
+    """
+    Convert a Client to a JSON-serialisable dictionary.
+
+    Args:
+        client: The Client object to convert
+
+    Returns:
+        dict: The client fields
+    """
+    return {'id': client.id, 'name': client.name}
+
+
+def rental_to_dict(rental):
+    """
+    Convert a Rental to a JSON-serialisable dictionary.
+
+    Args:
+        rental: The Rental object to convert
+
+    Returns:
+        dict: The rental fields
+    """
+    return {'id': rental.id, 'book_id': rental.book_id, 'client_id': rental.client_id,
+            'rented_date': rental.rented_date, 'returned_date': rental.returned_date}
+
+
+def percentile(sorted_values, fraction):
+    """
+    Return a percentile of an already sorted list (nearest rank).
+
+    Args:
+        sorted_values: The sorted list of values
+        fraction: The percentile as a fraction between 0 and 1
+
+    Returns:
+        float: The value at the percentile, or 0.0 for an empty list
+    """
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class RequestMetrics:
+    def __init__(self):
+        """
+        Initialize empty per-route request metrics.
+        """
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def record(self, route, status, seconds):
+        """
+        Record one handled request.
+
+        Args:
+            route: The route pattern that handled the request (e.g. 'GET /books/{id}')
+            status: The HTTP status code sent back
+            seconds: The time spent handling the request
+        """
+        with self._lock:
+            stats = self._routes.get(route)
+            if stats is None:
+                stats = {'count': 0, 'errors': 0, 'total': 0.0, 'latencies': deque(maxlen=LATENCY_SAMPLES)}
+                self._routes[route] = stats
+            stats['count'] += 1
+            stats['total'] += seconds
+            stats['latencies'].append(seconds)
+            if status >= 400:
+                stats['errors'] += 1
+
+    def snapshot(self):
+        """
+        Return the current metrics of every route.
+
+        Returns:
+            dict: Route -> count, errors, mean, p50 and p99 latency in milliseconds
+        """
+        with self._lock:
+            routes = {route: (stats['count'], stats['errors'], stats['total'], sorted(stats['latencies']))
+                      for route, stats in self._routes.items()}
+        return {route: {'count': count, 'errors': errors,
+                        'mean_ms': total * 1000 / count,
+                        'p50_ms': percentile(latencies, 0.50) * 1000,
+                        'p99_ms': percentile(latencies, 0.99) * 1000}
+                for route, (count, errors, total, latencies) in routes.items()}
+
+
+class BookManagementApi:
+    def __init__(self, service_book, service_client, service_rental, registry=None):
+        """
+        Initialize the API with service instances.
+
+        Args:
+            service_book (ServiceBook): The book service
+            service_client (ServiceClient): The client service
+            service_rental (ServiceRental): The rental service
+            registry (MetricsRegistry): The registry served at /metrics/services (defaults to None)
+        """
+        self._service_book = service_book
+        self._service_client = service_client
+        self._service_rental = service_rental
+        self._lock = threading.Lock()
+        self.metrics = RequestMetrics()
+        self._registry = registry
+        self._routes = [
+            ('GET', r'/books', 'GET /books', self._list_books),
+            ('POST', r'/books', 'POST /books', self._add_book),
+            ('GET', r'/books/(\d+)', 'GET /books/{id}', self._get_book),
+            ('PUT', r'/books/(\d+)', 'PUT /books/{id}', self._update_book),
+            ('DELETE', r'/books/(\d+)', 'DELETE /books/{id}', self._remove_book),
+            ('GET', r'/clients', 'GET /clients', self._list_clients),
+            ('POST', r'/clients', 'POST /clients', self._add_client),
+            ('GET', r'/clients/(\d+)', 'GET /clients/{id}', self._get_client),
+            ('PUT', r'/clients/(\d+)', 'PUT /clients/{id}', self._update_client),
+            ('DELETE', r'/clients/(\d+)', 'DELETE /clients/{id}', self._remove_client),
+            ('GET', r'/rentals', 'GET /rentals', self._list_rentals),
+            ('POST', r'/rentals', 'POST /rentals', self._add_rental),
+            ('POST', r'/rentals/(\d+)/return', 'POST /rentals/{id}/return', self._return_book),
+            ('GET', r'/reports/most-rented', 'GET /reports/most-rented', self._most_rented),
+            ('GET', r'/reports/most-active', 'GET /reports/most-active', self._most_active),
+            ('GET', r'/reports/borrowers/(\d+)', 'GET /reports/borrowers/{id}', self._borrowers),
+            ('GET', r'/metrics', 'GET /metrics', self._metrics),
+            ('GET', r'/metrics/services', 'GET /metrics/services', self._service_metrics),
+        ]
+        self._routes = [(method, re.compile(pattern + '$'), name, handler)
+                        for method, pattern, name, handler in self._routes]
+
+    def dispatch(self, method, target, body):
+        """
+        Handle one request and record its timing.
+
+        Args:
+            method: The HTTP method
+            target: The request target (path and optional query string)
+            body: The decoded JSON body, or None
+
+        Returns:
+            tuple: The HTTP status code and the JSON-serialisable response payload
+        """
+        start = time.perf_counter()
+        url = urlsplit(target)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        route = f"{method} (unmatched)"
+        try:
+            status, payload = 404, {'error': f"No route for {method} {url.path}."}
+            for route_method, pattern, name, handler in self._routes:
+                match = pattern.match(url.path)
+                if match and route_method == method:
+                    route = name
+                    args = [int(group) for group in match.groups()]
+                    if name == 'GET /metrics':
+                        status, payload = 200, handler()
+                    elif name == 'GET /metrics/services':
+                        with self._lock:
+                            status, payload = 200, handler()
+                    else:
+                        with self._lock:
+                            status, payload = handler(*args, query=query, body=body or {})
+                    break
+        except ApiError as e:
+            status, payload = e.status, {'error': str(e)}
+        except (TypeError, ValueError, KeyError) as e:
+            status, payload = 400, {'error': str(e)}
+        self.metrics.record(route, status, time.perf_counter() - start)
+        return status, payload
+
+    def _list_books(self, query, body):
+        """
+        List all books, or the books matching the title query parameter.
+        """
+        if 'title' in query:
+            books = self._service_book.search_by_title(query['title'])
+        else:
+            books = self._service_book.get_all_books()
+        return 200, [book_to_dict(book) for book in books]
+
+    def _add_book(self, query, body):
+        """
+        Add the book described by the request body.
+        """
+        book = Book(body['id'], body['title'], body.get('description', ''), body.get('author', ''))
+        self._service_book.add_book(book)
+        return 201, book_to_dict(book)
+
+    def _get_book(self, book_id, query, body):
+        """
+        Return one book by ID.
+        """
+        book = self._service_book.find_book_by_id(book_id)
+        if book is None:
+            raise ApiError(404, f"Book with ID {book_id} does not exist.")
+        return 200, book_to_dict(book)
+
+    def _update_book(self, book_id, query, body):
+        """
+        Update a book with the fields of the request body.
+        """
+        book = Book(book_id, body['title'], body.get('description', ''), body.get('author', ''))
+        self._service_book.update_book(book)
+        return 200, book_to_dict(book)
+
+    def _remove_book(self, book_id, query, body):
+        """
+        Remove a book by ID.
+        """
+        self._service_book.remove_book(book_id)
+        return 200, {'id': book_id}
+
+    def _list_clients(self, query, body):
+        """
+        List all clients, or the clients matching the name query parameter.
+        """
+        if 'name' in query and 'distance' in query:
+            clients = self._service_client.fuzzy_search_by_name(query['name'], int(query['distance']))
+        elif 'name' in query:
+            clients = self._service_client.search_by_name(query['name'])
+        else:
+            clients = self._service_client.get_all_clients()
+        return 200, [client_to_dict(client) for client in clients]
+
+    def _add_client(self, query, body):
+        """
+        Add the client described by the request body.
+        """
+        client = Client(body['id'], body['name'])
+        self._service_client.add_client(client)
+        return 201, client_to_dict(client)
+
+    def _get_client(self, client_id, query, body):
+        """
+        Return one client by ID.
+        """
+        client = self._service_client.find_client_by_id(client_id)
+        if client is None:
+            raise ApiError(404, f"Client with ID {client_id} does not exist.")
+        return 200, client_to_dict(client)
+
+    def _update_client(self, client_id, query, body):
+        """
+        Update a client with the name from the request body.
+        """
+        client = Client(client_id, body['name'])
+        self._service_client.update_client(client)
+        return 200, client_to_dict(client)
+
+    def _remove_client(self, client_id, query, body):
+        """
+        Remove a client by ID.
+        """
+        self._service_client.remove_client(client_id)
+        return 200, {'id': client_id}
+
+    def _list_rentals(self, query, body):
+        """
+        List all rentals.
+        """
+        return 200, [rental_to_dict(rental) for rental in self._service_rental.get_all_rentals()]
+
+    def _add_rental(self, query, body):
+        """
+        Rent a book as described by the request body.
+        """
+        self._service_rental.add_rental(body['id'], body['book_id'], body['client_id'], body['rented_date'])
+        return 201, {'id': body['id']}
+
+    def _return_book(self, rental_id, query, body):
+        """
+        Return the book of a rental on the date from the request body.
+        """
+        self._service_rental.return_book(rental_id, body['returned_date'])
+        return 200, {'id': rental_id}
+
+    def _most_rented(self, query, body):
+        """
+        Return the most rented books report.
+        """
+        return 200, [{'book': book_to_dict(book), 'count': count}
+                     for book, count in self._service_rental.get_most_rented_books()]
+
+    def _most_active(self, query, body):
+        """
+        Return the most active clients report.
+        """
+        return 200, [{'client': client_to_dict(client), 'count': count}
+                     for client, count in self._service_rental.get_most_active_clients()]
+
+    def _borrowers(self, book_id, query, body):
+        """
+        Return the borrowers report of a book.
+        """
+        return 200, [{'client': row['Client'], 'rented_date': row['Rented Date']}
+                     for row in self._service_rental.get_report_book_borrowers(book_id)]
+
+    def _metrics(self):
+        """
+        Return the request metrics of every route.
+        """
+        return self.metrics.snapshot()
+
+    def _service_metrics(self):
+        """
+        Return the call statistics of the instrumented services and repositories.
+        """
+        if self._registry is None:
+            raise ApiError(404, "Service metrics are disabled.")
+        return self._registry.snapshot()
+
+
+class ApiRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    timeout = IDLE_TIMEOUT
+    # Headers and body are written separately; without this, Nagle's algorithm
+    # and delayed ACKs add about 40 ms to every response on a kept-alive connection
+    disable_nagle_algorithm = True
+
+    def _handle(self):
+        """
+        Read the JSON body, dispatch the request to the API and write the JSON response.
+        """
+        length = int(self.headers.get('Content-Length') or 0)
+        raw_body = self.rfile.read(length) if length else b''
+        try:
+            body = json.loads(raw_body) if raw_body else None
+        except json.JSONDecodeError:
+            status, payload = 400, {'error': "Request body is not valid JSON."}
+        else:
+            status, payload = self.server.api.dispatch(self.command, self.path, body)
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+    def log_message(self, format, *args):
+        """
+        Skip the per-request log line (timings are available at /metrics instead).
+        """
+        pass
+
+
+class ThreadPoolHTTPServer(HTTPServer):
+    def __init__(self, address, api, workers=16):
+        """
+        Initialize an HTTP server that handles connections on a fixed pool of threads.
+
+        Args:
+            address: The (host, port) tuple to listen on
+            api (BookManagementApi): The API answering the requests
+            workers: The number of worker threads (open connections served at the same time)
+        """
+        super().__init__(address, ApiRequestHandler)
+        self.api = api
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+
+    def process_request(self, request, client_address):
+        """
+        Hand a new connection to the thread pool.
+
+        Args:
+            request: The accepted socket
+            client_address: The address of the client
+        """
+        self._pool.submit(self._serve_connection, request, client_address)
+
+    def _serve_connection(self, request, client_address):
+        """
+        Serve every request sent on one connection, then close it.
+
+        Args:
+            request: The accepted socket
+            client_address: The address of the client
+        """
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        """
+        Stop listening and wait for the worker threads to finish.
+        """
+        super().server_close()
+        self._pool.shutdown()
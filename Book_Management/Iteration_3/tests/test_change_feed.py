@@ -0,0 +1,137 @@
+"""
+Unit tests for the change feed of the repositories.
+
+This module checks the events published by tracked repositories, delivery to
+several subscribers with blocking and non-blocking buffers, and catching up
+from the persisted log.
+"""
+
+import os
+import tempfile
+import threading
+import unittest
+from domain.domain import Book, Client, Rental
+from repo.repo_book import RepoBook
+from repo.repo_client import RepoClient
+from repo.repo_rental import RepoRental
+from events.change_feed import ADD, UPDATE, DELETE, ChangeFeed, SubscriptionLagged, track_changes
+
+class TestChangeFeed(unittest.TestCase):
+    def setUp(self):
+        """
+        Initialize a feed logged to a temporary file and tracked repositories.
+        """
+        handle, self.path = tempfile.mkstemp(suffix='.jsonl')
+        os.close(handle)
+        self.feed = ChangeFeed(self.path)
+        self.book_repo = track_changes(RepoBook(), self.feed)
+        self.client_repo = track_changes(RepoClient(), self.feed)
+        self.rental_repo = track_changes(RepoRental(), self.feed)
+
+    def tearDown(self):
+        """
+        Close the feed and delete its log.
+        """
+        self.feed.close()
+        os.remove(self.path)
+
+    def drain(self, subscription):
+        """
+        Return the events currently available to a subscription.
+        """
+        events = []
+        event = subscription.get(timeout=0)
+        while event is not None:
+            events.append(event)
+            event = subscription.get(timeout=0)
+        return events
+
+    def test_events_of_every_repository(self):
+        """
+        Test that adds, updates and deletes are published in order with increasing sequence numbers.
+        """
+        subscription = self.feed.subscribe()
+        self.book_repo.add_books(book for book in [Book(1, "Dune", "SciFi", "Herbert")])
+        self.book_repo.update_book(Book(1, "Dune II", "SciFi", "Herbert"))
+        self.client_repo.add_client(Client(7, "Alice"))
+        self.rental_repo.add_rental(Rental(3, 1, 7, "2024-01-01"))
+        self.rental_repo.update_rentals({3: "2024-01-09"})
+        self.book_repo.delete_book_by_id(1)
+
+        events = self.drain(subscription)
+        self.assertEqual([(event.entity, event.operation, event.key) for event in events],
+                         [('book', ADD, 1), ('book', UPDATE, 1), ('client', ADD, 7),
+                          ('rental', ADD, 3), ('rental', UPDATE, 3), ('book', DELETE, 1)])
+        self.assertEqual([event.sequence for event in events], list(range(1, 7)))
+        self.assertEqual(events[1].data['title'], "Dune II")
+        self.assertEqual(events[4].data, {'returned_date': "2024-01-09"})
+
+    def test_failed_changes_are_not_published(self):
+        """
+        Test that a call raising an error publishes nothing.
+        """
+        self.client_repo.add_client(Client(1, "Alice"))
+        with self.assertRaises(ValueError):
+            self.client_repo.add_client(Client(1, "Alice again"))
+        self.assertEqual(self.feed.last_sequence(), 1)
+
+    def test_update_of_missing_book_is_not_published(self):
+        """
+        Test that updating a book that does not exist publishes nothing.
+        """
+        self.book_repo.update_book(Book(5, "Ghost", "None", "Nobody"))
+        self.assertEqual(self.feed.last_sequence(), 0)
+
+    def test_back_pressure_and_lag(self):
+        """
+        Test that a full blocking buffer makes the writer wait, while a full non-blocking one marks the lag.
+        """
+        blocking = self.feed.subscribe(buffer_size=2)
+        lossy = self.feed.subscribe(buffer_size=2, block=False)
+        writer = threading.Thread(target=lambda: [self.client_repo.add_client(Client(i, f"Client {i}"))
+                                                  for i in range(4)])
+        writer.start()
+        writer.join(timeout=0.2)
+        self.assertTrue(writer.is_alive())
+        self.assertEqual([blocking.get(timeout=1).key for _ in range(4)], [0, 1, 2, 3])
+        writer.join()
+
+        self.assertEqual([event.key for event in (lossy.get(), lossy.get())], [0, 1])
+        with self.assertRaises(SubscriptionLagged) as context:
+            lossy.get()
+        self.assertEqual(context.exception.last_sequence, 2)
+
+    def test_close_while_writer_blocked(self):
+        """
+        Test that closing a full blocking subscription releases the waiting writer,
+        and that subscribing is possible while a writer waits.
+        """
+        blocking = self.feed.subscribe(buffer_size=1)
+        writer = threading.Thread(target=lambda: [self.client_repo.add_client(Client(i, f"Client {i}"))
+                                                  for i in range(3)])
+        writer.start()
+        writer.join(timeout=0.2)
+        self.assertTrue(writer.is_alive())
+
+        other = self.feed.subscribe()
+        blocking.close()
+        writer.join(timeout=1)
+        self.assertFalse(writer.is_alive())
+        self.assertEqual([event.key for event in self.drain(other)], [2])
+        self.assertEqual(self.feed.last_sequence(), 3)
+
+    def test_catch_up_from_log(self):
+        """
+        Test that a new feed continues the sequence of its log and subscribers catch up from an offset.
+        """
+        for i in range(3):
+            self.client_repo.add_client(Client(i, f"Client {i}"))
+        self.feed.close()
+        self.feed = ChangeFeed(self.path)
+        self.assertEqual(self.feed.last_sequence(), 3)
+
+        subscription = self.feed.subscribe(from_sequence=1)
+        self.feed.publish('client', DELETE, 0)
+        self.assertEqual([event.sequence for event in self.drain(subscription)], [2, 3, 4])
+        with self.assertRaises(ValueError):
+            ChangeFeed().subscribe(from_sequence=0)
@@ -0,0 +1,56 @@
+"""
+Unit tests for the regression gate comparing the repository generations.
+"""
+
+import sys
+import unittest
+from benchmarks.compare_iterations import load_generation, run_workloads, time_workload, check_regressions
+
+class TestCompareIterations(unittest.TestCase):
+    def test_load_generation_keeps_current_modules(self):
+        """
+        Test that loading an older generation does not replace the modules already imported.
+        """
+        import repo.repo_book
+        current = sys.modules['repo.repo_book']
+        generation = load_generation('Iteration_1')
+        self.assertIs(sys.modules['repo.repo_book'], current)
+        self.assertIsNot(generation.RepoBook, current.RepoBook)
+        timings = run_workloads(generation, 50, 10, seed=1)
+        self.assertEqual(timings['add_book'][1], 50)
+        self.assertEqual(timings['remove_client'][1], 10)
+
+    def test_check_regressions(self):
+        """
+        Test that only workloads slower than their allowed ratio are reported.
+        """
+        results = [{'label': 'old', 'seconds': {'add_book': 1.0, 'search_title': 1.0}},
+                   {'label': 'new', 'seconds': {'add_book': 1.05, 'search_title': 1.2}}]
+        failures = check_regressions(results, {'default': 1.10})
+        self.assertEqual(len(failures), 1)
+        self.assertIn('search_title', failures[0])
+        self.assertEqual(check_regressions(results, {'default': 1.10, 'search_title': 1.25}), [])
+        self.assertEqual(check_regressions(results, {'default': 1.10, 'new': {'search_title': 1.25}}), [])
+        self.assertEqual(len(check_regressions(results, {'default': 1.10, 'old': {'search_title': 1.25}})), 1)
+
+    def test_check_regressions_needs_every_round(self):
+        """
+        Test that a workload fails only if it is slower than allowed in every round.
+        """
+        old = {'label': 'old', 'seconds': {'add_book': 1.0}, 'rounds': {'add_book': [1.0, 1.3, 1.0]}}
+        new = {'label': 'new', 'seconds': {'add_book': 1.2}, 'rounds': {'add_book': [1.2, 1.35, 1.5]}}
+        self.assertEqual(check_regressions([old, new], {'default': 1.10}), [])
+        new['rounds']['add_book'][1] = 1.5
+        failures = check_regressions([old, new], {'default': 1.10})
+        self.assertEqual(len(failures), 1)
+        self.assertIn('1.15x', failures[0])
+
+    def test_time_workload_runs_for_min_time(self):
+        """
+        Test that a workload is run again on a fresh setup until it has run for the minimum time.
+        """
+        setups = []
+        seconds, operations = time_workload(lambda: setups.append(1) or [],
+                                            lambda state: state.append(1) or 3, 0.01)
+        self.assertGreaterEqual(seconds, 0.01)
+        self.assertEqual(operations, 3 * len(setups))
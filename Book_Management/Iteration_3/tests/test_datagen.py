@@ -0,0 +1,23 @@
+"""
+Unit tests for the seeded synthetic data used by the benchmarks.
+"""
+
+import unittest
+from benchmarks.datagen import generate_books, generate_clients, generate_rentals
+
+class TestDataGenerators(unittest.TestCase):
+    def test_same_seed_same_data(self):
+        """
+        Test that the generators are reproducible for a given seed and differ for another seed.
+        """
+        self.assertEqual(list(generate_books(50, seed=3)), list(generate_books(50, seed=3)))
+        self.assertNotEqual(list(generate_clients(50, seed=3)), list(generate_clients(50, seed=4)))
+
+    def test_rentals_reference_existing_ids(self):
+        """
+        Test that rentals only refer to generated books and clients and rent a book at most once at a time.
+        """
+        rentals = list(generate_rentals(500, 20, 10, seed=1, open_fraction=0.5))
+        self.assertTrue(all(0 <= book_id < 20 and 0 <= client_id < 10 for _, book_id, client_id, _, _ in rentals))
+        open_books = [book_id for _, book_id, _, _, returned in rentals if returned is None]
+        self.assertEqual(len(open_books), len(set(open_books)))
@@ -0,0 +1,76 @@
+"""
+Unit tests for the fuzzy client-name search.
+
+This module checks the edit distance and the BK-tree against a brute-force scan,
+and that the name index of RepoClient follows added, updated and removed clients.
+"""
+
+import random
+import unittest
+from domain.domain import Client
+from repo.bk_tree import BKTree, edit_distance
+from repo.repo_client import RepoClient
+from controller.service_client import ServiceClient
+
+class TestBKTree(unittest.TestCase):
+    def test_edit_distance(self):
+        """
+        Test the edit distance on known pairs, including the early stop above a limit.
+        """
+        self.assertEqual(edit_distance("kitten", "sitting"), 3)
+        self.assertEqual(edit_distance("", "abc"), 3)
+        self.assertEqual(edit_distance("alice", "alcie"), 2)
+        self.assertEqual(edit_distance("alice", "bob", limit=1), 2)
+
+    def test_search_matches_brute_force(self):
+        """
+        Test that the tree finds exactly the words a full scan finds.
+        """
+        rng = random.Random(7)
+        words = {"".join(rng.choice("abcde") for _ in range(rng.randint(1, 6))) for _ in range(300)}
+        tree = BKTree()
+        for word in words:
+            tree.add(word)
+        self.assertEqual(len(tree), len(words))
+        for query in ("abc", "eeda", "b", "cabbed"):
+            expected = sorted((edit_distance(query, word), word) for word in words
+                              if edit_distance(query, word) <= 2)
+            self.assertEqual(tree.search(query, 2), expected)
+
+class TestRepoClientFuzzySearch(unittest.TestCase):
+    def setUp(self):
+        """
+        Initialize a RepoClient with a few clients.
+        """
+        self.repo = RepoClient()
+        for client_id, name in enumerate(["Alice Smith", "Alicia Stone", "Bob Smith", "Carol Novak"]):
+            self.repo.add_client(Client(client_id, name))
+
+    def test_typos_are_found(self):
+        """
+        Test that every word of the query must match within the distance, closest first.
+        """
+        self.assertEqual([client.id for client in self.repo.fuzzy_search_by_name("alice")], [0])
+        self.assertEqual([client.id for client in self.repo.fuzzy_search_by_name("Alcie", 2)], [0, 1])
+        self.assertEqual([client.id for client in self.repo.fuzzy_search_by_name("bob smtih", 2)], [2])
+        self.assertEqual(self.repo.fuzzy_search_by_name("Zed"), [])
+
+    def test_index_follows_changes(self):
+        """
+        Test that added, updated and removed clients are reflected once the index is built.
+        """
+        self.assertEqual(len(self.repo.fuzzy_search_by_name("smith")), 2)
+        self.repo.add_client(Client(4, "Dan Smyth"))
+        self.repo.update_client(Client(2, "Bob Jones"))
+        self.repo.remove_client(0)
+        self.assertEqual([client.id for client in self.repo.fuzzy_search_by_name("smith")], [4])
+
+    def test_service_validation(self):
+        """
+        Test that the service rejects invalid queries and distances.
+        """
+        service = ServiceClient(self.repo)
+        with self.assertRaises(TypeError):
+            service.fuzzy_search_by_name(5)
+        with self.assertRaises(ValueError):
+            service.fuzzy_search_by_name("alice", -1)
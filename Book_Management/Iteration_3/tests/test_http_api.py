@@ -0,0 +1,97 @@
+"""
+Unit tests for the HTTP JSON API.
+
+This module tests request dispatching, error statuses and metrics directly on
+BookManagementApi, and keep-alive requests against a running server.
+"""
+
+import http.client
+import json
+import threading
+import unittest
+from repo.repo_book import RepoBook
+from repo.repo_client import RepoClient
+from repo.repo_rental import RepoRental
+from controller.service_book import ServiceBook
+from controller.service_client import ServiceClient
+from controller.service_rental import ServiceRental
+from server.http_api import BookManagementApi, ThreadPoolHTTPServer
+
+def make_api():
+    """
+    Create an API over empty repositories.
+    """
+    book_repo = RepoBook()
+    client_repo = RepoClient()
+    rental_repo = RepoRental()
+    return BookManagementApi(ServiceBook(book_repo), ServiceClient(client_repo),
+                             ServiceRental(rental_repo, book_repo, client_repo))
+
+class TestBookManagementApi(unittest.TestCase):
+    def setUp(self):
+        """
+        Initialize an API with one book and one client.
+        """
+        self.api = make_api()
+        self.api.dispatch('POST', '/books', {'id': 1, 'title': 'Dune', 'description': 'SciFi', 'author': 'Herbert'})
+        self.api.dispatch('POST', '/clients', {'id': 1, 'name': 'Alice'})
+
+    def test_rent_return_and_report(self):
+        """
+        Test renting and returning a book, then reading the most rented report.
+        """
+        status, _ = self.api.dispatch('POST', '/rentals', {'id': 1, 'book_id': 1, 'client_id': 1, 'rented_date': '2024-01-01'})
+        self.assertEqual(status, 201)
+        status, _ = self.api.dispatch('POST', '/rentals/1/return', {'returned_date': '2024-01-05'})
+        self.assertEqual(status, 200)
+
+        status, report = self.api.dispatch('GET', '/reports/most-rented', None)
+        self.assertEqual(status, 200)
+        self.assertEqual(report, [{'book': {'id': 1, 'title': 'Dune', 'description': 'SciFi', 'author': 'Herbert'}, 'count': 1}])
+
+    def test_error_statuses(self):
+        """
+        Test that missing resources give 404 and invalid requests give 400.
+        """
+        self.assertEqual(self.api.dispatch('GET', '/books/99', None)[0], 404)
+        self.assertEqual(self.api.dispatch('GET', '/nowhere', None)[0], 404)
+        self.assertEqual(self.api.dispatch('POST', '/clients', {'id': 1, 'name': 'Alice'})[0], 400)
+        self.assertEqual(self.api.dispatch('POST', '/books', {'title': 'No ID'})[0], 400)
+
+    def test_search_and_metrics(self):
+        """
+        Test searching books by title and that every request is counted in the metrics.
+        """
+        status, books = self.api.dispatch('GET', '/books?title=du', None)
+        self.assertEqual([book['id'] for book in books], [1])
+        metrics = self.api.dispatch('GET', '/metrics', None)[1]
+        self.assertEqual(metrics['GET /books']['count'], 1)
+        self.assertEqual(metrics['POST /books']['count'], 1)
+
+class TestThreadPoolHTTPServer(unittest.TestCase):
+    def test_keep_alive_requests(self):
+        """
+        Test that several requests can be sent over one kept-alive connection.
+        """
+        server = ThreadPoolHTTPServer(('127.0.0.1', 0), make_api(), workers=2)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', server.server_port)
+            body = json.dumps({'id': 7, 'name': 'Bob'})
+            connection.request('POST', '/clients', body, {'Content-Type': 'application/json'})
+            response = connection.getresponse()
+            response.read()
+            self.assertEqual(response.status, 201)
+            sock = connection.sock
+
+            connection.request('GET', '/clients/7')
+            response = connection.getresponse()
+            self.assertEqual(response.status, 200)
+            self.assertEqual(json.loads(response.read()), {'id': 7, 'name': 'Bob'})
+            self.assertIs(connection.sock, sock)
+            connection.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+            thread.join()
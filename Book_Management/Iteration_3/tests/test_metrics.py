@@ -0,0 +1,47 @@
+"""
+Unit tests for the opt-in instrumentation of services and repositories.
+"""
+
+import unittest
+from domain.domain import Book
+from repo.repo_book import RepoBook
+from controller.service_book import ServiceBook
+from metrics.registry import MetricsRegistry, instrument
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        """
+        Initialize an instrumented book repository and service.
+        """
+        self.registry = MetricsRegistry()
+        self.repo = instrument(RepoBook(), self.registry)
+        self.service = instrument(ServiceBook(self.repo), self.registry)
+
+    def test_calls_and_scans_recorded(self):
+        """
+        Test that calls are counted and that repository scans record the collection size.
+        """
+        self.service.add_book(Book(1, "Dune", "SciFi", "Herbert"))
+        self.service.add_book(Book(2, "Emma", "Classic", "Austen"))
+        self.service.search_by_title("du")
+
+        snapshot = self.registry.snapshot()
+        self.assertEqual(snapshot['ServiceBook.add_book']['calls'], 2)
+        self.assertEqual(snapshot['RepoBook.search_by_title']['collection_size'], 2)
+        self.assertEqual(sum(snapshot['RepoBook.add_book']['histogram'].values()), 2)
+
+    def test_errors_recorded(self):
+        """
+        Test that a call raising an exception is counted as an error and the exception is re-raised.
+        """
+        with self.assertRaises(ValueError):
+            self.service.add_book(Book(-1, "Bad", "", ""))
+        self.assertEqual(self.registry.snapshot()['ServiceBook.add_book']['errors'], 1)
+
+    def test_other_instances_untouched(self):
+        """
+        Test that instrumenting one instance leaves other instances of the class unchanged.
+        """
+        plain = RepoBook()
+        plain.add_book(Book(1, "Dune", "SciFi", "Herbert"))
+        self.assertNotIn('RepoBook.add_book', self.registry.snapshot())
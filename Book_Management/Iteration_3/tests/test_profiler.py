@@ -0,0 +1,45 @@
+"""
+Unit tests for the per-command session profiler.
+"""
+
+import unittest
+from unittest import mock
+from metrics.profiler import SessionProfiler
+from repo.repo_book import RepoBook
+from repo.repo_client import RepoClient
+from repo.repo_rental import RepoRental
+from controller.service_book import ServiceBook
+from controller.service_client import ServiceClient
+from controller.service_rental import ServiceRental
+from ui.ui import Console
+
+class TestSessionProfiler(unittest.TestCase):
+    def test_aggregates_per_command(self):
+        """
+        Test that runs of the same command are aggregated and the report lists every command.
+        """
+        profiler = SessionProfiler(top=3)
+        for size in (1000, 100000):
+            with profiler.measure("Build"):
+                data = list(range(size))
+        with profiler.measure("Nothing"):
+            pass
+        report = profiler.report()
+        self.assertTrue(report[1].startswith("Build"))
+        self.assertEqual(report[1].split()[1], "2")
+        self.assertGreater(float(report[1].split()[-1]), len(data) * 8 / 1024)
+        self.assertIn("== Nothing ==", report)
+
+    def test_console_commands_are_profiled(self):
+        """
+        Test that the console measures the menu commands under their labels, and not the exit option.
+        """
+        book_repo, client_repo, rental_repo = RepoBook(), RepoClient(), RepoRental()
+        profiler = SessionProfiler()
+        console = Console(ServiceBook(book_repo), ServiceClient(client_repo),
+                          ServiceRental(rental_repo, book_repo, client_repo), profiler=profiler)
+        answers = iter(["6", "1", "Alice", "99", "0"])
+        with mock.patch('builtins.input', lambda prompt="": next(answers)), mock.patch('builtins.print'):
+            console.run_console()
+        self.assertEqual([line.split()[0] for line in profiler.report()[1:2]], ["Add"])
+        self.assertEqual(client_repo.find_client_by_id(1).name, "Alice")
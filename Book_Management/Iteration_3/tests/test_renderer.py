@@ -0,0 +1,38 @@
+"""
+Unit tests for the BufferedRenderer used by the Console.
+
+This module checks batched output and the page-by-page navigation.
+"""
+
+import io
+import unittest
+from ui.renderer import BufferedRenderer
+
+class TestBufferedRenderer(unittest.TestCase):
+    def test_render_in_batches(self):
+        """
+        Test that all rows are written, in order, when the rows span several batches.
+        """
+        stream = io.StringIO()
+        renderer = BufferedRenderer(stream=stream, batch_size=3)
+        renderer.render(list(range(10)))
+        self.assertEqual(stream.getvalue().splitlines(), [str(i) for i in range(10)])
+
+    def test_paged_stops_on_quit(self):
+        """
+        Test that paged output shows one page at a time and stops when 'q' is entered.
+        """
+        stream = io.StringIO()
+        answers = iter(["", "q"])
+        renderer = BufferedRenderer(stream=stream, page_size=4, read_input=lambda prompt: next(answers))
+        renderer.show(list(range(20)))
+        self.assertEqual(stream.getvalue().splitlines(), [str(i) for i in range(8)])
+
+    def test_paged_show_all(self):
+        """
+        Test that entering 'a' writes all remaining rows at once.
+        """
+        stream = io.StringIO()
+        renderer = BufferedRenderer(stream=stream, page_size=4, read_input=lambda prompt: "a")
+        renderer.show(list(range(10)), lambda item: f"#{item}")
+        self.assertEqual(stream.getvalue().splitlines(), [f"#{i}" for i in range(10)])
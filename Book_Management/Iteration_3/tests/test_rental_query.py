@@ -0,0 +1,92 @@
+"""
+Unit tests for the lazy rental query builder.
+
+This module compares query results with hand-written loops over the same
+rentals, and checks that the plan uses the repository indexes when it can.
+"""
+
+import unittest
+from domain.domain import Rental
+from repo.repo_rental import RepoRental
+from repo.repo_sharded import ShardedRepoRental
+from controller.rental_query import RentalQuery
+
+def make_rentals():
+    """
+    Create 60 rentals over 6 books and 4 clients, every third one still open.
+    """
+    return [Rental(i, i % 6, i % 4, f"2024-{i % 12 + 1:02d}-01", None if i % 3 == 0 else "2024-12-31")
+            for i in range(60)]
+
+class TestRentalQuery(unittest.TestCase):
+    def setUp(self):
+        """
+        Initialize a RepoRental holding the sample rentals.
+        """
+        self.rentals = make_rentals()
+        self.repo = RepoRental()
+        self.repo.add_rentals(self.rentals)
+
+    def test_filters(self):
+        """
+        Test that every filter keeps exactly the matching rentals, in repository order.
+        """
+        query = RentalQuery(self.repo).client(1).rented_between("2024-03-01", "2024-09-01").open(False)
+        expected = [rental for rental in self.rentals if rental.client_id == 1
+                    and "2024-03-01" <= rental.rented_date <= "2024-09-01" and rental.returned_date is not None]
+        self.assertEqual(query.all(), expected)
+        self.assertEqual(query.count(), len(expected))
+        self.assertEqual(RentalQuery(self.repo).book(3).open().first(), self.rentals[3])
+        self.assertIsNone(RentalQuery(self.repo).book(2).open().first())
+
+    def test_group_order_limit(self):
+        """
+        Test grouped counts, ordering with and without a limit, and that builders do not change their source.
+        """
+        by_client = RentalQuery(self.repo).group_by('client_id')
+        self.assertEqual(sorted(by_client), [(0, 15), (1, 15), (2, 15), (3, 15)])
+        open_by_book = by_client.open().group_by('book_id').order_by('key', descending=True)
+        self.assertEqual(open_by_book.all(), [(3, 10), (0, 10)])
+        self.assertEqual(RentalQuery(self.repo).order_by('rented_date', descending=True).limit(2).all(),
+                         [self.rentals[11], self.rentals[23]])
+        self.assertEqual([rental.id for rental in RentalQuery(self.repo).limit(3)], [0, 1, 2])
+        with self.assertRaises(ValueError):
+            by_client.order_by('rented_date').all()
+        with self.assertRaises(ValueError):
+            RentalQuery(self.repo).order_by('count').first()
+        with self.assertRaises(ValueError):
+            RentalQuery(self.repo).order_by('title')
+
+    def test_order_checked_when_run(self):
+        """
+        Test that an order given before group_by is checked and applied against the grouped query.
+        """
+        ordered = RentalQuery(self.repo).order_by('count', descending=True)
+        self.assertEqual(ordered.group_by('book_id').limit(1).all(), [(0, 10)])
+        with self.assertRaises(ValueError):
+            RentalQuery(self.repo).order_by('rented_date').group_by('book_id').all()
+
+    def test_plan_uses_indexes(self):
+        """
+        Test that equality filters on indexed fields are answered from the index, also after changes.
+        """
+        query = RentalQuery(self.repo).book(4).client(0).order_by('id')
+        self.assertEqual(RentalQuery(self.repo).book(4).client(0).explain(), "index book_id/client_id -> filter")
+        self.assertEqual(RentalQuery(self.repo).open().group_by('book_id').order_by('count', True).limit(3).explain(),
+                         "scan -> filter -> group by book_id -> top 3 by count desc")
+        self.assertEqual([rental.id for rental in query], [4, 16, 28, 40, 52])
+
+        self.repo.add_rental(Rental(60, 4, 0, "2025-01-01"))
+        self.repo.remove_rental(16)
+        self.assertEqual([rental.id for rental in RentalQuery(self.repo).book(4).client(0)], [4, 28, 40, 52, 60])
+
+    def test_sharded_repository(self):
+        """
+        Test that queries over sharded rentals give the same results.
+        """
+        repo = ShardedRepoRental(shard_count=3)
+        repo.add_rentals(make_rentals())
+        self.assertEqual(sorted(rental.id for rental in RentalQuery(repo).book(5)),
+                         [rental.id for rental in RentalQuery(self.repo).book(5)])
+        self.assertEqual(RentalQuery(repo).group_by('book_id').order_by('count', True).limit(1).all(), [(0, 10)])
+        repo.close()
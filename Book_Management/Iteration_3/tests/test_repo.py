@@ -41,6 +41,42 @@ class TestRepoBook(unittest.TestCase):
         self.assertEqual(len(results), 1)
         self.assertEqual(results[0].title, "Harry Potter")
 
+    def test_find_by_author_shares_author_strings(self):
+        """
+        Test that books of the same author share one author string and are found by author,
+        also after an update changes the author.
+        """
+        self.repo.add_book(Book(1, "A", "Desc", "".join(["Row", "ling"])))
+        self.repo.add_books([Book(2, "B", "Desc", "".join(["Row", "ling"])), Book(3, "C", "Desc", "Tolkien")])
+        books = self.repo.get_all_books()
+        self.assertIs(books[0].author, books[1].author)
+        self.assertEqual([book.id for book in self.repo.find_books_by_author("Rowling")], [1, 2])
+
+        self.repo.update_book(Book(3, "C", "Desc", "".join(["Row", "ling"])))
+        self.assertEqual([book.id for book in self.repo.find_books_by_author("Rowling")], [1, 2, 3])
+        self.assertEqual(self.repo.find_books_by_author("Tolkien"), [])
+        self.assertEqual(self.repo.find_books_by_author("Unknown"), [])
+
+    def test_find_by_author_after_direct_change(self):
+        """
+        Test that a book whose author was changed on the object itself is found by its new author.
+        """
+        self.repo.add_books([Book(1, "A", "Desc", "Rowling"), Book(2, "B", "Desc", "Tolkien")])
+        self.repo.find_book_by_id(2).author = "".join(["Row", "ling"])
+        self.assertEqual([book.id for book in self.repo.find_books_by_author("Rowling")], [1, 2])
+        self.assertEqual(self.repo.find_books_by_author("Tolkien"), [])
+
+    def test_deleted_authors_are_dropped(self):
+        """
+        Test that authors whose books were all deleted leave the author dictionary.
+        """
+        self.repo.add_books([Book(i, "T", "Desc", f"Author {i}") for i in range(10)])
+        for i in range(6):
+            self.repo.delete_book_by_id(i)
+        self.assertEqual(sorted(self.repo._authors), [f"Author {i}" for i in range(6, 10)])
+        self.assertEqual([book.id for book in self.repo.find_books_by_author("Author 7")], [7])
+        self.assertEqual(self.repo.find_books_by_author("Author 1"), [])
+
 class TestRepoClient(unittest.TestCase):
     def setUp(self):
         """
@@ -60,6 +96,14 @@ class TestRepoClient(unittest.TestCase):
         self.repo.remove_client(1)
         self.assertEqual(len(self.repo.get_all_clients()), 0)
 
+    def test_names_are_interned(self):
+        """
+        Test that clients with the same name share one name string.
+        """
+        self.repo.add_client(Client(1, "".join(["Ali", "ce"])))
+        self.repo.add_clients([Client(2, "".join(["Ali", "ce"]))])
+        self.assertIs(self.repo.find_client_by_id(1).name, self.repo.find_client_by_id(2).name)
+
 class TestRepoRental(unittest.TestCase):
     def setUp(self):
         """
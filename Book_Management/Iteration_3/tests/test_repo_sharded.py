@@ -0,0 +1,142 @@
+"""
+Unit tests for the sharded repositories.
+
+This module checks that the sharded Book, Client, and Rental repositories behave
+like the single repositories they partition, and that reports merged from all
+shards give the same answers as ServiceRental over a plain repository.
+"""
+
+import unittest
+from domain.domain import Book, Client, Rental
+from repo.repo_sharded import ShardedRepoBook, ShardedRepoClient, ShardedRepoRental
+from controller.service_rental import ServiceRental
+
+class TestShardedRepoBook(unittest.TestCase):
+    def setUp(self):
+        """
+        Initialize a ShardedRepoBook with 3 in-process shards.
+        """
+        self.repo = ShardedRepoBook(shard_count=3)
+        for i in range(10):
+            self.repo.add_book(Book(i, f"Title {i}", "Desc", "Auth"))
+
+    def test_point_operations(self):
+        """
+        Test that find, update and delete are routed to the shard owning the book.
+        """
+        self.repo.update_book(Book(4, "New Title", "Desc", "Auth"))
+        self.assertEqual(self.repo.find_book_by_id(4).title, "New Title")
+
+        self.repo.delete_book_by_id(4)
+        self.assertIsNone(self.repo.find_book_by_id(4))
+        self.assertEqual(len(self.repo.get_all_books()), 9)
+
+    def test_search_fans_out(self):
+        """
+        Test that a search collects matching books from every shard.
+        """
+        results = self.repo.search_by_title("title")
+        self.assertEqual(sorted(book.id for book in results), list(range(10)))
+
+class TestShardedRepoClient(unittest.TestCase):
+    def test_duplicate_client_rejected(self):
+        """
+        Test that adding a client with an existing ID still raises a ValueError.
+        """
+        repo = ShardedRepoClient(shard_count=3)
+        repo.add_client(Client(1, "Alice"))
+        with self.assertRaises(ValueError):
+            repo.add_client(Client(1, "Alice"))
+
+class TestShardedRepoRental(unittest.TestCase):
+    def setUp(self):
+        """
+        Initialize a ShardedRepoRental with 3 in-process shards.
+        """
+        self.repo = ShardedRepoRental(shard_count=3)
+
+    def test_update_and_remove(self):
+        """
+        Test that rentals are found, updated and removed through their book's shard.
+        """
+        self.repo.add_rental(Rental(1, 100, 1, "2024-01-01"))
+        self.repo.update_rental(1, "2024-01-05")
+        self.assertEqual(self.repo.find_rental_by_id(1).returned_date, "2024-01-05")
+
+        self.repo.remove_rental(1)
+        self.assertIsNone(self.repo.find_rental_by_id(1))
+        with self.assertRaises(ValueError):
+            self.repo.remove_rental(1)
+
+    def test_merged_counts(self):
+        """
+        Test that per-client counts are summed across shards and the top books are merged.
+        """
+        rental_id = 0
+        for book_id, times in [(1, 3), (2, 1), (3, 2), (4, 5)]:
+            for _ in range(times):
+                rental_id += 1
+                self.repo.add_rental(Rental(rental_id, book_id, rental_id % 2, "2024-01-01"))
+
+        self.assertEqual(self.repo.most_rented_books(2), [(4, 5), (1, 3)])
+        self.assertEqual(self.repo.count_by_client(), {0: 5, 1: 6})
+
+class TestShardModes(unittest.TestCase):
+    def test_changes_through_repository_in_both_modes(self):
+        """
+        Test that in-process and worker-process shards give the same results for changes made
+        through the repository methods.
+        """
+        for processes in (False, True):
+            with self.subTest(processes=processes):
+                books = ShardedRepoBook(shard_count=2, processes=processes)
+                clients = ShardedRepoClient(shard_count=2, processes=processes)
+                rentals = ShardedRepoRental(shard_count=2, processes=processes)
+                try:
+                    books.add_books([Book(i, f"Title {i}", "Desc", "Auth") for i in range(4)])
+                    clients.add_client(Client(1, "Alice"))
+                    rentals.add_rental(Rental(1, 2, 1, "2024-01-01"))
+
+                    books.update_book(Book(2, "New", "Desc", "Other"))
+                    clients.update_client(Client(1, "Alicia"))
+                    rentals.update_rental(1, "2024-01-05")
+                    books.delete_book_by_id(3)
+
+                    self.assertEqual((books.find_book_by_id(2).title, books.find_book_by_id(2).author),
+                                     ("New", "Other"))
+                    self.assertEqual([book.id for book in books.find_books_by_author("Other")], [2])
+                    self.assertIsNone(books.find_book_by_id(3))
+                    self.assertEqual(clients.find_client_by_id(1).name, "Alicia")
+                    self.assertEqual(rentals.find_rental_by_id(1).returned_date, "2024-01-05")
+                finally:
+                    books.close()
+                    clients.close()
+                    rentals.close()
+
+class TestShardedService(unittest.TestCase):
+    def test_reports_with_worker_processes(self):
+        """
+        Test the ServiceRental reports on repositories whose shards run in worker processes.
+        """
+        books = ShardedRepoBook(shard_count=2, processes=True)
+        clients = ShardedRepoClient(shard_count=2, processes=True)
+        rentals = ShardedRepoRental(shard_count=2, processes=True)
+        try:
+            service = ServiceRental(rentals, books, clients)
+            books.add_book(Book(100, "Dune", "SciFi", "Herbert"))
+            books.add_book(Book(101, "Emma", "Classic", "Austen"))
+            clients.add_client(Client(1, "Alice"))
+
+            service.add_rental(1, 100, 1, "2024-01-01")
+            service.return_book(1, "2024-01-02")
+            service.add_rental(2, 100, 1, "2024-01-03")
+            service.add_rental(3, 101, 1, "2024-01-03")
+
+            most_rented = service.get_most_rented_books()
+            self.assertEqual([(book.id, count) for book, count in most_rented], [(100, 2), (101, 1)])
+            with self.assertRaises(ValueError):
+                service.add_rental(4, 100, 1, "2024-01-04")
+        finally:
+            books.close()
+            clients.close()
+            rentals.close()
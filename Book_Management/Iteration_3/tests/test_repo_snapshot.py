@@ -0,0 +1,128 @@
+"""
+Unit tests for the binary snapshots of the repositories.
+
+This module writes small repositories to a snapshot, opens it again and checks
+that the Snapshot repositories behave like the in-memory ones while creating
+objects only for the records that are used.
+"""
+
+import os
+import tempfile
+import unittest
+from domain.domain import Book, Client, Rental
+from repo.repo_book import RepoBook
+from repo.repo_client import RepoClient
+from repo.repo_rental import RepoRental
+from repo.repo_snapshot import Snapshot, load_snapshot, write_snapshot
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        """
+        Write a snapshot of 10 books, 5 clients and 6 rentals and open it.
+        """
+        book_repo, client_repo, rental_repo = RepoBook(), RepoClient(), RepoRental()
+        for i in range(10):
+            book_repo.add_book(Book(i, f"Title {i}", "Desc", f"Author {i % 3}"))
+        for i in range(5):
+            client_repo.add_client(Client(i, f"Client {i}"))
+        for i in range(6):
+            rental_repo.add_rental(Rental(i, i % 4, i % 5, "2024-01-01", None if i == 5 else "2024-01-10"))
+        handle, self.path = tempfile.mkstemp(suffix='.snap')
+        os.close(handle)
+        write_snapshot(self.path, book_repo, client_repo, rental_repo)
+        self.snapshot, self.book_repo, self.client_repo, self.rental_repo = load_snapshot(self.path)
+
+    def tearDown(self):
+        """
+        Close and delete the snapshot.
+        """
+        self.snapshot.close()
+        os.remove(self.path)
+
+    def test_round_trip(self):
+        """
+        Test that every field, including a missing return date, is read back unchanged.
+        """
+        self.assertEqual(str(self.book_repo.get_all_books()[7]), str(Book(7, "Title 7", "Desc", "Author 1")))
+        self.assertEqual(self.client_repo.find_client_by_id(3).name, "Client 3")
+        self.assertIsNone(self.rental_repo.find_rental_by_id(5).returned_date)
+        self.assertEqual(self.rental_repo.find_rental_by_id(4).returned_date, "2024-01-10")
+        self.assertEqual(self.rental_repo.count_by_book(), {0: 2, 1: 2, 2: 1, 3: 1})
+
+    def test_objects_created_only_when_touched(self):
+        """
+        Test that lookups and searches only create the objects they return.
+        """
+        self.assertEqual([book.id for book in self.book_repo.search_by_title("title 4")], [4])
+        self.assertEqual(self.book_repo.find_book_by_id(6).id, 6)
+        created = [item for item in self.book_repo._books._items if not isinstance(item, int)]
+        self.assertEqual(sorted(book.id for book in created), [4, 6])
+
+    def test_changes(self):
+        """
+        Test that added, updated and removed records behave like in the in-memory repositories.
+        """
+        self.book_repo.update_book(Book(2, "New", "Desc", "Auth"))
+        self.book_repo.delete_book_by_id(3)
+        self.book_repo.add_book(Book(10, "Added", "Desc", "Auth"))
+        self.assertEqual(self.book_repo.find_book_by_id(2).title, "New")
+        self.assertIsNone(self.book_repo.find_book_by_id(3))
+        self.assertEqual(len(self.book_repo.get_all_books()), 10)
+
+        self.client_repo.remove_client(1)
+        with self.assertRaises(ValueError):
+            self.client_repo.add_client(Client(2, "Duplicate"))
+        self.assertEqual(len(self.client_repo.search_by_name("client")), 4)
+
+        self.rental_repo.update_rentals({5: "2024-02-01"})
+        self.assertEqual(self.rental_repo.find_rental_by_id(5).returned_date, "2024-02-01")
+        with self.assertRaises(ValueError):
+            self.rental_repo.remove_rental(99)
+
+    def test_rewrite_open_snapshot(self):
+        """
+        Test that an open snapshot can be saved over, including its changes.
+        """
+        self.client_repo.add_client(Client(5, "Zoë"))
+        write_snapshot(self.path, self.book_repo, self.client_repo, self.rental_repo)
+        snapshot, _, client_repo, _ = load_snapshot(self.path)
+        self.assertEqual(client_repo.find_client_by_id(5).name, "Zoë")
+        self.assertEqual(len(client_repo.get_all_clients()), 6)
+        snapshot.close()
+
+    def test_rewrite_creates_no_objects(self):
+        """
+        Test that saving a Snapshot repository does not create the objects of the untouched records.
+        """
+        self.book_repo.find_book_by_id(2)
+        self.client_repo.find_client_by_id(1)
+        write_snapshot(self.path, self.book_repo, self.client_repo, self.rental_repo)
+        self.assertEqual([item.id for item in self.book_repo._books.created()], [2])
+        self.assertEqual([client.id for client in self.client_repo._clients._items.values()
+                          if not isinstance(client, int)], [1])
+        self.assertFalse(list(self.rental_repo._rentals.created()))
+        snapshot, book_repo, client_repo, _ = load_snapshot(self.path)
+        self.assertEqual(str(book_repo.find_book_by_id(7)), str(Book(7, "Title 7", "Desc", "Author 1")))
+        self.assertEqual(client_repo.find_client_by_id(4).name, "Client 4")
+        snapshot.close()
+
+    def test_deleted_authors_are_dropped(self):
+        """
+        Test that deleting books forgets the authors left without books, without creating other objects.
+        """
+        for i in range(4):
+            self.book_repo.update_book(Book(i, f"Title {i}", "Desc", f"New {i}"))
+        for i in range(4):
+            self.book_repo.delete_book_by_id(i)
+        self.assertEqual(self.book_repo._authors, {})
+        self.assertEqual(len(self.book_repo._books), 6)
+        self.assertFalse(list(self.book_repo._books.created()))
+
+    def test_rejects_other_files(self):
+        """
+        Test that a file that is not a snapshot is refused.
+        """
+        with open(self.path, 'wb') as file:
+            file.write(b"id,title\n" * 10)
+        with self.assertRaises(ValueError):
+            Snapshot(self.path)
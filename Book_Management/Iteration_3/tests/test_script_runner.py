@@ -0,0 +1,66 @@
+"""
+Unit tests for the script mode of the Book Management System.
+
+This module checks script parsing, grouping of consecutive writes into batches,
+and that a failing command is reported without stopping the script.
+"""
+
+import io
+import unittest
+from repo.repo_book import RepoBook
+from repo.repo_client import RepoClient
+from repo.repo_rental import RepoRental
+from controller.service_book import ServiceBook
+from controller.service_client import ServiceClient
+from controller.service_rental import ServiceRental
+from ui.script_runner import ScriptRunner, parse_script, group_commands
+
+class TestScriptParsing(unittest.TestCase):
+    def test_parse_and_group(self):
+        """
+        Test that comments are skipped, arguments are converted and consecutive writes are grouped.
+        """
+        commands = parse_script([
+            "# setup",
+            'add_book 1 "Dune" "SciFi" "Herbert"',
+            'add_book 2 "Emma" "Classic" "Austen"',
+            "add_client 1 Alice",
+            "report borrowers 1",
+        ])
+        self.assertEqual(commands[0].args, [1, "Dune", "SciFi", "Herbert"])
+        self.assertEqual(commands[0].line_number, 2)
+        self.assertEqual([len(group) for group in group_commands(commands)], [2, 1, 1])
+
+    def test_parse_error_reports_line(self):
+        """
+        Test that an invalid line raises a ValueError naming the line.
+        """
+        with self.assertRaises(ValueError) as context:
+            parse_script(["add_client 1 Alice", "rent x 1 1 2024-01-01"])
+        self.assertIn("Line 2", str(context.exception))
+
+class TestScriptRunner(unittest.TestCase):
+    def test_run_reports_failed_command(self):
+        """
+        Test that a failing command inside a batch is reported and the other commands still run.
+        """
+        book_repo = RepoBook()
+        client_repo = RepoClient()
+        rental_repo = RepoRental()
+        rental_service = ServiceRental(rental_repo, book_repo, client_repo)
+        stream = io.StringIO()
+        runner = ScriptRunner(ServiceBook(book_repo), ServiceClient(client_repo), rental_service, stream)
+
+        count, failed, _ = runner.run([
+            'add_book 1 "Dune" "SciFi" "Herbert"',
+            "add_client 1 Alice",
+            "rent 1 1 1 2024-01-01",
+            "rent 2 1 1 2024-01-02",
+            "return 1 2024-01-05",
+            "report most_rented",
+        ])
+
+        self.assertEqual((count, failed), (6, 1))
+        self.assertIn("[line 4] Error", stream.getvalue())
+        self.assertIn("Rented 1 times", stream.getvalue())
+        self.assertEqual(rental_repo.find_rental_by_id(1).returned_date, "2024-01-05")
@@ -4,9 +4,11 @@ from domain.domain import Book, Client, Rental
 from repo.repo_book import RepoBook
 from repo.repo_client import RepoClient
 from repo.repo_rental import RepoRental
+from repo.repo_reservation import RepoReservation
 from controller.service_book import ServiceBook
 from controller.service_client import ServiceClient
 from controller.service_rental import ServiceRental
+from controller.parallel_reports import ParallelRentalCounter
 
 """
 Unit tests for the service classes.
@@ -154,4 +156,200 @@ class TestServiceRental(unittest.TestCase):
 
         # Should only return Alice (Top 1 out of 7)
         self.assertEqual(len(result), 1)
-        self.assertEqual(result[0][0].name, "Alice")
\ No newline at end of file
+        self.assertEqual(result[0][0].name, "Alice")
+
+class TestServiceRentalParallelReports(unittest.TestCase):
+    def setUp(self):
+        """
+        Initialize a ServiceRental that computes its reports with 2 worker processes.
+        """
+        self.book_repo = RepoBook()
+        self.client_repo = RepoClient()
+        self.rental_repo = RepoRental()
+        self.counter = ParallelRentalCounter(2)
+        self.service = ServiceRental(self.rental_repo, self.book_repo, self.client_repo, self.counter)
+
+        for i in range(1, 6):
+            self.book_repo.add_book(Book(i, f"Book{i}", "Desc", "Auth"))
+            self.client_repo.add_client(Client(i, f"User{i}"))
+
+    def tearDown(self):
+        """
+        Shut down the worker processes used by the counter.
+        """
+        self.counter.close()
+
+    def test_parallel_reports_match_serial(self):
+        """
+        Test that the parallel reports return the same results as the serial ones.
+        """
+        rental_id = 0
+        for book_id, client_id, times in [(1, 2, 3), (2, 1, 1), (3, 2, 2), (4, 3, 5)]:
+            for _ in range(times):
+                rental_id += 1
+                self.service.add_rental(rental_id, book_id, client_id, "2024-01-01")
+                self.service.return_book(rental_id, "2024-01-02")
+
+        serial = ServiceRental(self.rental_repo, self.book_repo, self.client_repo)
+        self.assertEqual(
+            [(book.id, count) for book, count in self.service.get_most_rented_books()],
+            [(book.id, count) for book, count in serial.get_most_rented_books()])
+        self.assertEqual(
+            [(client.id, count) for client, count in self.service.get_most_active_clients()],
+            [(client.id, count) for client, count in serial.get_most_active_clients()])
+
+    def test_parallel_reports_follow_changes(self):
+        """
+        Test that the shared columns kept between reports follow added and removed rentals.
+        """
+        for rental_id in range(1, 9):
+            self.service.add_rental(rental_id, rental_id % 3 + 1, 1, "2024-01-01")
+            self.service.return_book(rental_id, "2024-01-02")
+        self.assertEqual(self.counter.count(self.rental_repo.get_all_rentals(), 'book_id', self.rental_repo.generation),
+                         {1: 2, 2: 3, 3: 3})
+        self.service.add_rental(9, 1, 2, "2024-01-03")
+        self.assertEqual(self.counter.count(self.rental_repo.get_all_rentals(), 'book_id', self.rental_repo.generation),
+                         {1: 3, 2: 3, 3: 3})
+        self.rental_repo.remove_rental(2)
+        self.rental_repo.add_rental(Rental(10, 5, 2, "2024-01-04"))
+        self.assertEqual(self.counter.count(self.rental_repo.get_all_rentals(), 'book_id', self.rental_repo.generation),
+                         {1: 3, 2: 3, 3: 2, 5: 1})
+
+    def test_parallel_reports_no_rentals(self):
+        """
+        Test that the parallel reports are empty when there are no rentals.
+        """
+        self.assertEqual(self.service.get_most_rented_books(), [])
+        self.assertEqual(self.service.get_most_active_clients(), [])
+
+
+class TestServiceBatchOperations(unittest.TestCase):
+    def setUp(self):
+        """
+        Initialize all services over empty repositories for the batch tests.
+        """
+        self.book_repo = RepoBook()
+        self.client_repo = RepoClient()
+        self.rental_repo = RepoRental()
+        self.book_service = ServiceBook(self.book_repo)
+        self.client_service = ServiceClient(self.client_repo)
+        self.rental_service = ServiceRental(self.rental_repo, self.book_repo, self.client_repo)
+
+        self.book_service.add_books([Book(100, "Dune", "SciFi", "Herbert"), Book(101, "Emma", "Classic", "Austen")])
+        self.client_service.add_clients([Client(1, "Alice"), Client(2, "Bob")])
+
+    def test_add_clients_rejects_whole_batch(self):
+        """
+        Test that no client is added when one client of the batch is a duplicate.
+        """
+        with self.assertRaises(ValueError):
+            self.client_service.add_clients([Client(3, "Carol"), Client(1, "Alice")])
+        self.assertEqual(len(self.client_service.get_all_clients()), 2)
+
+    def test_add_rentals_and_return_books(self):
+        """
+        Test renting and returning several books in one call each.
+        """
+        self.rental_service.add_rentals([(1, 100, 1, "2024-01-01"), (2, 101, 2, "2024-01-01")])
+        self.rental_service.return_books([(1, "2024-01-05"), (2, "2024-01-06")])
+        returned = {rental.id: rental.returned_date for rental in self.rental_service.get_all_rentals()}
+        self.assertEqual(returned, {1: "2024-01-05", 2: "2024-01-06"})
+
+    def test_add_rentals_same_book_twice(self):
+        """
+        Test that a batch renting the same book twice is rejected without adding any rental.
+        """
+        with self.assertRaises(ValueError) as context:
+            self.rental_service.add_rentals([(1, 100, 1, "2024-01-01"), (2, 100, 2, "2024-01-02")])
+        self.assertIn("already rented", str(context.exception))
+        self.assertEqual(len(self.rental_service.get_all_rentals()), 0)
+
+    def test_return_books_twice(self):
+        """
+        Test that returning the same rental twice in one batch is rejected.
+        """
+        self.rental_service.add_rental(1, 100, 1, "2024-01-01")
+        with self.assertRaises(ValueError):
+            self.rental_service.return_books([(1, "2024-01-05"), (1, "2024-01-06")])
+        self.assertIsNone(self.rental_repo.find_rental_by_id(1).returned_date)
+
+
+class TestServiceReservations(unittest.TestCase):
+    def setUp(self):
+        """
+        Initialize ServiceRental with one rented book and three clients.
+        """
+        self.book_repo = RepoBook()
+        self.client_repo = RepoClient()
+        self.rental_repo = RepoRental()
+        self.reservation_repo = RepoReservation()
+        self.service = ServiceRental(self.rental_repo, self.book_repo, self.client_repo,
+                                     repo_reservation=self.reservation_repo)
+        self.handed_off = []
+        self.service.add_hand_off_listener(self.handed_off.append)
+
+        self.book_repo.add_books([Book(100, "Dune", "SciFi", "Herbert"), Book(101, "Emma", "Classic", "Austen")])
+        self.client_repo.add_clients([Client(1, "Alice"), Client(2, "Bob"), Client(3, "Carol")])
+        self.service.add_rental(1, 100, 1, "2024-01-01")
+
+    def test_fifo_hand_off_on_return(self):
+        """
+        Test that a returned book is held for the first waiting client only, and released when they rent it.
+        """
+        self.service.reserve_book(100, 3, "2024-01-02")
+        self.service.reserve_book(100, 2, "2024-01-03")
+        reservation = self.service.return_book(1, "2024-01-05")
+        self.assertEqual((reservation.client_id, self.handed_off), (3, [reservation]))
+        self.assertEqual([item.client_id for item in self.service.get_reservation_queue(100)], [2])
+
+        with self.assertRaises(ValueError):
+            self.service.add_rental(2, 100, 2, "2024-01-06")
+        self.service.add_rental(2, 100, 3, "2024-01-06")
+        self.assertIsNone(self.reservation_repo.held_for(100))
+
+    def test_reservation_rules(self):
+        """
+        Test that available books, the renter's own book and duplicate reservations cannot be reserved.
+        """
+        with self.assertRaises(ValueError):
+            self.service.reserve_book(101, 2, "2024-01-02")
+        with self.assertRaises(ValueError):
+            self.service.reserve_book(100, 1, "2024-01-02")
+        self.service.reserve_book(100, 2, "2024-01-02")
+        with self.assertRaises(ValueError):
+            self.service.reserve_book(100, 2, "2024-01-03")
+
+    def test_client_index_and_cancel(self):
+        """
+        Test that a client's reservations are listed and that cancelling a held book passes it on.
+        """
+        self.service.add_rental(2, 101, 1, "2024-01-01")
+        self.service.reserve_book(100, 2, "2024-01-02")
+        self.service.reserve_book(101, 2, "2024-01-02")
+        self.service.reserve_book(100, 3, "2024-01-03")
+        self.assertEqual([item.book_id for item in self.service.get_client_reservations(2)], [100, 101])
+
+        self.service.cancel_reservation(101, 2)
+        self.assertEqual([item.book_id for item in self.service.get_client_reservations(2)], [100])
+        self.service.return_book(1, "2024-01-05")
+        self.service.cancel_reservation(100, 2)
+        self.assertEqual(self.reservation_repo.held_for(100), 3)
+        self.assertEqual(self.service.get_client_reservations(2), [])
+
+    def test_removed_client_releases_reservations(self):
+        """
+        Test that removing a client drops their reservations and passes a book held for them on.
+        """
+        client_service = ServiceClient(self.client_repo)
+        client_service.add_removal_listener(self.service.remove_client_reservations)
+        self.service.add_rental(2, 101, 1, "2024-01-01")
+        self.service.reserve_book(100, 2, "2024-01-02")
+        self.service.reserve_book(101, 2, "2024-01-02")
+        self.service.reserve_book(100, 3, "2024-01-03")
+        self.service.return_book(1, "2024-01-05")
+        self.assertEqual(self.reservation_repo.held_for(100), 2)
+
+        client_service.remove_client(2)
+        self.assertEqual(self.reservation_repo.held_for(100), 3)
+        self.assertEqual(self.service.get_reservation_queue(101), [])
+        self.service.add_rental(3, 100, 3, "2024-01-06")
@@ -0,0 +1,82 @@
+import sys
+
+
+class BufferedRenderer:
+    def __init__(self, stream=None, batch_size=1000, page_size=20, read_input=input):
+        """
+        Initialize the renderer used by the Console to print listings.
+
+        Args:
+            stream: The text stream to write to (defaults to sys.stdout at write time)
+            batch_size: The number of rows formatted and written in one chunk
+            page_size: The number of rows shown per page in paged output
+            read_input: The function used to ask for the next page (defaults to input)
+        """
+        self._stream = stream
+        self._batch_size = batch_size
+        self._page_size = page_size
+        self._read_input = read_input
+
+    def _write_rows(self, items, start, stop, format_item):
+        """
+        Format the rows between start and stop in batches and write each batch as one chunk.
+
+        Args:
+            items: The list of items to render
+            start: The index of the first item to write
+            stop: The index after the last item to write
+            format_item: The function turning an item into a line of text
+        """
+        stream = self._stream or sys.stdout
+        for batch_start in range(start, stop, self._batch_size):
+            batch = items[batch_start:min(batch_start + self._batch_size, stop)]
+            stream.write("\n".join(map(format_item, batch)) + "\n")
+        stream.flush()
+
+    def render(self, items, format_item=str):
+        """
+        Write all items, formatting them in batches.
+
+        Args:
+            items: The list of items to render
+            format_item: The function turning an item into a line of text (defaults to str)
+        """
+        self._write_rows(items, 0, len(items), format_item)
+
+    def render_paged(self, items, format_item=str):
+        """
+        Write items one page at a time, asking before each following page.
+
+        Entering 'q' stops the listing and 'a' writes all remaining items at once.
+
+        Args:
+            items: The list of items to render
+            format_item: The function turning an item into a line of text (defaults to str)
+        """
+        total = len(items)
+        pages = -(-total // self._page_size)
+        for page, start in enumerate(range(0, total, self._page_size), start=1):
+            stop = min(start + self._page_size, total)
+            self._write_rows(items, start, stop, format_item)
+            if stop == total:
+                return
+            answer = self._read_input(f"Page {page}/{pages} - Enter for next page, 'a' for all, 'q' to stop: ")
+            answer = answer.strip().lower()
+            if answer == 'q':
+                return
+            if answer == 'a':
+                self._write_rows(items, stop, total, format_item)
+                return
+
+    def show(self, items, format_item=str):
+        """
+        Write items directly if they fit on one page, otherwise page through them.
+
+        Args:
+            items: The list of items to render
+            format_item: The function turning an item into a line of text (defaults to str)
+        """
+        if len(items) > self._page_size:
+            self.render_paged(items, format_item)
+        else:
+            self.render(items, format_item)
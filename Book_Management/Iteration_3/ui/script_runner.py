@@ -0,0 +1,244 @@
+"""
+Non-interactive script mode for the Book Management System.
+
+A script holds one command per line, with arguments split like a shell command
+line (quote arguments that contain spaces). Empty lines and lines starting with
+'#' are ignored:
+
+    add_book 1 "Dune" "Desert planet" "Frank Herbert"
+    add_client 1 "Alice"
+    rent 1 1 1 2024-01-01
+    return 1 2024-01-05
+    report most_rented
+
+The whole file is parsed before anything runs, so a typo never leaves a script
+half executed. Consecutive commands of the same kind (add_book, add_client, rent,
+return) are sent to the services as one batch operation.
+"""
+
+import shlex
+import sys
+import time
+
+from domain.domain import Book, Client
+
+# Command name -> argument converters
+COMMANDS = {
+    'add_book': (int, str, str, str),
+    'remove_book': (int,),
+    'add_client': (int, str),
+    'remove_client': (int,),
+    'rent': (int, int, int, str),
+    'return': (int, str),
+    'report': None,
+}
+
+REPORTS = ('most_rented', 'most_active', 'borrowers')
+
+BATCHED_COMMANDS = ('add_book', 'add_client', 'rent', 'return')
+
+
+class ScriptCommand:
+    def __init__(self, line_number, name, args):
+        """
+        Initialize a parsed script command.
+
+        Args:
+            line_number: The line of the script the command was read from
+            name: The command name
+            args: The converted command arguments
+        """
+        self.line_number = line_number
+        self.name = name
+        self.args = args
+
+
+def parse_script(lines):
+    """
+    Parse all lines of a script into commands.
+
+    Args:
+        lines: An iterable of script lines
+
+    Returns:
+        list: A list of ScriptCommand objects
+
+    Raises:
+        ValueError: If a line has an unknown command or invalid arguments
+    """
+    commands = []
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        try:
+            name, *args = shlex.split(line)
+        except ValueError as e:
+            raise ValueError(f"Line {line_number}: {e}")
+        if name not in COMMANDS:
+            raise ValueError(f"Line {line_number}: unknown command '{name}'.")
+        if name == 'report':
+            if not args or args[0] not in REPORTS:
+                raise ValueError(f"Line {line_number}: report must be one of {', '.join(REPORTS)}.")
+            converters = (str, int) if args[0] == 'borrowers' else (str,)
+        else:
+            converters = COMMANDS[name]
+        if len(args) != len(converters):
+            raise ValueError(f"Line {line_number}: '{name}' expects {len(converters)} arguments, got {len(args)}.")
+        try:
+            args = [convert(arg) for convert, arg in zip(converters, args)]
+        except ValueError:
+            raise ValueError(f"Line {line_number}: invalid number in '{line}'.")
+        commands.append(ScriptCommand(line_number, name, args))
+    return commands
+
+
+def group_commands(commands):
+    """
+    Group consecutive commands that can run as one batch operation.
+
+    Args:
+        commands: A list of ScriptCommand objects
+
+    Returns:
+        list: A list of command lists, each holding commands with the same name
+    """
+    groups = []
+    for command in commands:
+        if groups and command.name in BATCHED_COMMANDS and groups[-1][0].name == command.name:
+            groups[-1].append(command)
+        else:
+            groups.append([command])
+    return groups
+
+
+class ScriptRunner:
+    def __init__(self, service_book, service_client, service_rental, stream=None):
+        """
+        Initialize the script runner with service instances.
+
+        Args:
+            service_book (ServiceBook): The book service
+            service_client (ServiceClient): The client service
+            service_rental (ServiceRental): The rental service
+            stream: The text stream for results and timings (defaults to sys.stdout)
+        """
+        self._service_book = service_book
+        self._service_client = service_client
+        self._service_rental = service_rental
+        self._stream = stream
+
+    def _write(self, text):
+        """
+        Write one line of output.
+
+        Args:
+            text: The line to write
+        """
+        (self._stream or sys.stdout).write(text + "\n")
+
+    def _run_batch(self, name, commands):
+        """
+        Run a group of identical commands as one batch service call.
+
+        Args:
+            name: The command name shared by the group
+            commands: The ScriptCommand objects of the group
+        """
+        args = [command.args for command in commands]
+        match name:
+            case 'add_book':
+                self._service_book.add_books([Book(*arg) for arg in args])
+            case 'add_client':
+                self._service_client.add_clients([Client(*arg) for arg in args])
+            case 'rent':
+                self._service_rental.add_rentals([tuple(arg) for arg in args])
+            case 'return':
+                self._service_rental.return_books([tuple(arg) for arg in args])
+
+    def _run_single(self, command):
+        """
+        Run a single command.
+
+        Args:
+            command: The ScriptCommand to run
+        """
+        args = command.args
+        match command.name:
+            case 'add_book':
+                self._service_book.add_book(Book(*args))
+            case 'remove_book':
+                self._service_book.remove_book(*args)
+            case 'add_client':
+                self._service_client.add_client(Client(*args))
+            case 'remove_client':
+                self._service_client.remove_client(*args)
+            case 'rent':
+                self._service_rental.add_rental(*args)
+            case 'return':
+                self._service_rental.return_book(*args)
+            case 'report':
+                self._run_report(*args)
+
+    def _run_report(self, report, book_id=None):
+        """
+        Run a report and write its rows.
+
+        Args:
+            report: The report name (most_rented, most_active or borrowers)
+            book_id: The book ID for the borrowers report
+        """
+        if report == 'most_rented':
+            rows = [f"{book} - Rented {count} times" for book, count in self._service_rental.get_most_rented_books()]
+        elif report == 'most_active':
+            rows = [f"{client} - Rented {count} times" for client, count in self._service_rental.get_most_active_clients()]
+        else:
+            rows = [f"Client: {row['Client']} rented the book: {row['Rented Date']}"
+                    for row in self._service_rental.get_report_book_borrowers(book_id)]
+        for row in rows:
+            self._write(row)
+
+    def run(self, lines):
+        """
+        Parse and run a script, writing the timing of every command group.
+
+        A batch that fails is re-run command by command so the failing line can be reported;
+        the remaining commands still run.
+
+        Args:
+            lines: An iterable of script lines
+
+        Returns:
+            tuple: The number of commands run, the number of failed commands and the total seconds
+
+        Raises:
+            ValueError: If the script cannot be parsed (nothing is run)
+        """
+        commands = parse_script(lines)
+        failed = 0
+        start = time.perf_counter()
+        for group in group_commands(commands):
+            first = group[0]
+            group_start = time.perf_counter()
+            try:
+                if len(group) > 1:
+                    self._run_batch(first.name, group)
+                else:
+                    self._run_single(first)
+            except (TypeError, ValueError) as batch_error:
+                if len(group) == 1:
+                    failed += 1
+                    self._write(f"[line {first.line_number}] Error: {batch_error}")
+                else:
+                    for command in group:
+                        try:
+                            self._run_single(command)
+                        except (TypeError, ValueError) as e:
+                            failed += 1
+                            self._write(f"[line {command.line_number}] Error: {e}")
+            elapsed = time.perf_counter() - group_start
+            self._write(f"[line {first.line_number}] {first.name} x{len(group)}: "
+                        f"{elapsed * 1000:.3f} ms ({elapsed * 1000 / len(group):.3f} ms/command)")
+        total = time.perf_counter() - start
+        self._write(f"Ran {len(commands)} commands ({failed} failed) in {total * 1000:.3f} ms")
+        return len(commands), failed, total
@@ -2,9 +2,35 @@ from domain.domain import Book, Client
 from controller.service_book import ServiceBook
 from controller.service_client import ServiceClient
 from controller.service_rental import ServiceRental
+from ui.renderer import BufferedRenderer
+
+# Menu options of the console (number, label); option 0 exits
+MENU = [
+    ('1', "Add Book"),
+    ('2', "List All Books"),
+    ('3', "Remove Book by ID"),
+    ('4', "Update Book"),
+    ('5', "Search Books by Title"),
+    ('6', "Add Client"),
+    ('7', "List All Clients"),
+    ('8', "Remove Client by ID"),
+    ('9', "Update Client"),
+    ('10', "Search Clients by Name"),
+    ('11', "Rent a Book"),
+    ('12', "Return Book"),
+    ('13', "Get Most Rented Books"),
+    ('14', "Get Most Active Clients"),
+    ('15', "Get Book Borrowers Report"),
+    ('16', "Show Statistics"),
+    ('17', "Reserve a Book"),
+    ('18', "Cancel a Reservation"),
+    ('19', "List Reservations of a Client"),
+]
+
+MENU_LABELS = dict(MENU)
 
 class Console:
-    def __init__(self, service, service_client, service_rental):
+    def __init__(self, service, service_client, service_rental, renderer=None, metrics=None, profiler=None):
         """
         Initialize the Console UI with service instances.
         
@@ -12,10 +38,27 @@ class Console:
             service (ServiceBook): The book service for managing books
             service_client (ServiceClient): The client service for managing clients
             service_rental (ServiceRental): The rental service for managing rentals
+            renderer (BufferedRenderer): The renderer used for listings (defaults to a paged BufferedRenderer)
+            metrics (MetricsRegistry): The registry shown by the statistics option (defaults to None, disabled)
+            profiler (SessionProfiler): The profiler measuring every menu command (defaults to None, disabled)
         """
         self._service = service
         self._service_client = service_client
         self._service_rental = service_rental
+        self._renderer = renderer if renderer is not None else BufferedRenderer()
+        self._metrics = metrics
+        self._profiler = profiler
+        self._service_rental.add_hand_off_listener(self.notify_hand_off)
+
+    def notify_hand_off(self, reservation):
+        """
+        Tell the user that a returned book is now held for a client who reserved it.
+        
+        Args:
+            reservation: The Reservation the book was handed off to
+        """
+        print(f"Book with ID {reservation.book_id} is now held for client with ID {reservation.client_id} "
+              f"(reserved on {reservation.reserved_date}).")
 
     def run_console(self):
         """
@@ -25,164 +68,194 @@ class Console:
         Continues running until the user chooses to exit (option 0).
         """
         while True:
-            print("1. Add Book")
-            print("2. List All Books")
-            print("3. Remove Book by ID")
-            print("4. Update Book")
-            print("5. Search Books by Title")
-            print("6. Add Client")
-            print("7. List All Clients")
-            print("8. Remove Client by ID")
-            print("9. Update Client")
-            print("10. Search Clients by Name")
-            print("11. Rent a Book")
-            print("12. Return Book")
-            print("13. Get Most Rented Books")
-            print("14. Get Most Active Clients")
-            print("15. Get Book Borrowers Report")
+            for number, label in MENU:
+                print(f"{number}. {label}")
             print("0. Exit")
             choice = input("Choose an option: ")
-            match choice:
-                case '1':
-                    try:
-                        id = int(input("Enter Book ID: "))
-                        title = input("Enter Book Title: ")
-                        description = input("Enter Book Description: ")
-                        author = input("Enter Book Author: ")
-                        book = Book(id, title, description, author)
-                        self._service.add_book(book)
-                        print("Book added successfully.")
-                    except Exception as e:
-                        print(f"Error: {e}")
-                case '2':
-                    books = self._service.get_all_books()
-                    if not books:
-                        print("No books available.")
+            if choice == '0':
+                break
+            if self._profiler is not None and choice in MENU_LABELS:
+                with self._profiler.measure(MENU_LABELS[choice]):
+                    self.execute_command(choice)
+            else:
+                self.execute_command(choice)
+
+    def execute_command(self, choice):
+        """
+        Run one menu option, asking the user for its input.
+        
+        Args:
+            choice: The number of the menu option, as typed by the user
+        """
+        match choice:
+            case '1':
+                try:
+                    id = int(input("Enter Book ID: "))
+                    title = input("Enter Book Title: ")
+                    description = input("Enter Book Description: ")
+                    author = input("Enter Book Author: ")
+                    book = Book(id, title, description, author)
+                    self._service.add_book(book)
+                    print("Book added successfully.")
+                except Exception as e:
+                    print(f"Error: {e}")
+            case '2':
+                books = self._service.get_all_books()
+                if not books:
+                    print("No books available.")
+                else:
+                    self._renderer.show(books)
+            case '3':
+                try:
+                    id = int(input("Enter Book ID to remove: "))
+                    self._service.remove_book(id)
+                    print("Book removed successfully.")
+                except Exception as e:
+                    print(f"Error: {e}")
+            case '4':
+                try:
+                    id = int(input("Enter Book ID to update: "))
+                    title = input("Enter new Book Title: ")
+                    description = input("Enter new Book Description: ")
+                    author = input("Enter new Book Author: ")
+                    updated_book = Book(id, title, description, author)
+                    self._service.update_book(updated_book)
+                    print("Book updated successfully.")
+                except Exception as e:
+                    print(f"Error: {e}")
+            case '5':
+                try:
+                    title_query = input("Enter title to search: ")
+                    results = self._service.search_by_title(title_query)
+                    if not results:
+                        print("No books found with that title.")
+                    else:
+                        self._renderer.show(results)
+                except Exception as e:
+                    print(f"Error: {e}")
+            case '6':
+                try:
+                    id = int(input("Enter Client ID: "))
+                    name = input("Enter Client Name: ")
+                    client = Client(id, name)
+                    self._service_client.add_client(client)
+                    print("Client added successfully.")
+                except Exception as e:
+                    print(f"Error: {e}")
+            case '7':
+                clients = self._service_client.get_all_clients()
+                if not clients:
+                    print("No clients available.")
+                else:
+                    self._renderer.show(clients)
+            case '8':
+                try:    
+                    client_id = int(input("Enter Client ID to remove: "))
+                    self._service_client.remove_client(client_id)
+                    print("Client removed successfully.")
+                except Exception as e:
+                    print(f"Error: {e}")
+            case '9':
+                try:
+                    id = int(input("Enter Client ID to update: "))
+                    name = input("Enter new Client Name: ")
+                    updated_client = Client(id, name)
+                    self._service_client.update_client(updated_client)
+                    print("Client updated successfully.")
+                except Exception as e:
+                    print(f"Error: {e}")
+            case '10':
+                try:
+                    name_query = input("Enter name to search: ")
+                    results = self._service_client.search_by_name(name_query)
+                    if not results:
+                        results = self._service_client.fuzzy_search_by_name(name_query)
+                        if results:
+                            print("No exact matches. Did you mean:")
+                    if not results:
+                        print("No clients found with that name.")
+                    else:
+                        self._renderer.show(results)
+                except Exception as e:
+                    print(f"Error: {e}")
+            case '11':
+                try:
+                    rental_id = int(input("Enter Rental ID: "))
+                    book_id = int(input("Enter Book ID to rent: "))
+                    client_id = int(input("Enter Client ID: "))
+                    rented_date = input("Enter Rented Date (YYYY-MM-DD): ")
+                    self._service_rental.add_rental(rental_id, book_id, client_id, rented_date)
+                    print("Book rented successfully.")
+                except Exception as e:
+                    print(f"Error: {e}")
+            case '12':
+                try:
+                    rental_id = int(input("Enter Rental ID to return: "))
+                    returned_date = input("Enter Returned Date (YYYY-MM-DD): ")
+                    self._service_rental.return_book(rental_id, returned_date)
+                    print("Book returned successfully.")
+                except Exception as e:
+                    print(f"Error: {e}")
+            case '13':
+                try:
+                    most_rented = self._service_rental.get_most_rented_books()
+                    if not most_rented:
+                        print("No rentals found.")
+                    else:
+                        self._renderer.show(most_rented, lambda item: f"{item[0]} - Rented {item[1]} times")
+                except Exception as e:
+                    print(f"Error: {e}")
+            case '14':
+                try:
+                    most_active = self._service_rental.get_most_active_clients()
+                    if not most_active:
+                        print("No rentals found.")
+                    else:
+                        self._renderer.show(most_active, lambda item: f"{item[0]} - Rented {item[1]} times")
+                except Exception as e:
+                    print(f"Error: {e}")
+            case '15':
+                try:
+                    book_id = int(input("Enter Book ID for borrowers report: "))
+                    borrowers = self._service_rental.get_report_book_borrowers(book_id)
+                    if not borrowers:
+                        print("No borrowers found for this book.")
                     else:
-                        for book in books:
-                            print(book)
-                case '3':
-                    try:
-                        id = int(input("Enter Book ID to remove: "))
-                        self._service.remove_book(id)
-                        print("Book removed successfully.")
-                    except Exception as e:
-                        print(f"Error: {e}")
-                case '4':
-                    try:
-                        id = int(input("Enter Book ID to update: "))
-                        title = input("Enter new Book Title: ")
-                        description = input("Enter new Book Description: ")
-                        author = input("Enter new Book Author: ")
-                        updated_book = Book(id, title, description, author)
-                        self._service.update_book(updated_book)
-                        print("Book updated successfully.")
-                    except Exception as e:
-                        print(f"Error: {e}")
-                case '5':
-                    try:
-                        title_query = input("Enter title to search: ")
-                        results = self._service.search_by_title(title_query)
-                        if not results:
-                            print("No books found with that title.")
-                        else:
-                            for book in results:
-                                print(book)
-                    except Exception as e:
-                        print(f"Error: {e}")
-                case '6':
-                    try:
-                        id = int(input("Enter Client ID: "))
-                        name = input("Enter Client Name: ")
-                        client = Client(id, name)
-                        self._service_client.add_client(client)
-                        print("Client added successfully.")
-                    except Exception as e:
-                        print(f"Error: {e}")
-                case '7':
-                    clients = self._service_client.get_all_clients()
-                    if not clients:
-                        print("No clients available.")
+                        self._renderer.show(borrowers, lambda client: f"Client: {client['Client']} rented the book: {client['Rented Date']}")
+                except Exception as e:
+                    print(f"Error: {e}")
+            case '16':
+                if self._metrics is None:
+                    print("Statistics are disabled. Start the application with --metrics to enable them.")
+                else:
+                    self._renderer.render(self._metrics.format_table())
+            case '17':
+                try:
+                    book_id = int(input("Enter Book ID to reserve: "))
+                    client_id = int(input("Enter Client ID: "))
+                    reserved_date = input("Enter Reservation Date (YYYY-MM-DD): ")
+                    self._service_rental.reserve_book(book_id, client_id, reserved_date)
+                    position = len(self._service_rental.get_reservation_queue(book_id))
+                    print(f"Book reserved successfully. Position in queue: {position}.")
+                except Exception as e:
+                    print(f"Error: {e}")
+            case '18':
+                try:
+                    book_id = int(input("Enter Book ID: "))
+                    client_id = int(input("Enter Client ID: "))
+                    self._service_rental.cancel_reservation(book_id, client_id)
+                    print("Reservation cancelled successfully.")
+                except Exception as e:
+                    print(f"Error: {e}")
+            case '19':
+                try:
+                    client_id = int(input("Enter Client ID: "))
+                    reservations = self._service_rental.get_client_reservations(client_id)
+                    if not reservations:
+                        print("No reservations found for this client.")
                     else:
-                        for client in clients:
-                            print(client)
-                case '8':
-                    try:    
-                        client_id = int(input("Enter Client ID to remove: "))
-                        self._service_client.remove_client(client_id)
-                        print("Client removed successfully.")
-                    except Exception as e:
-                        print(f"Error: {e}")
-                case '9':
-                    try:
-                        id = int(input("Enter Client ID to update: "))
-                        name = input("Enter new Client Name: ")
-                        updated_client = Client(id, name)
-                        self._service_client.update_client(updated_client)
-                        print("Client updated successfully.")
-                    except Exception as e:
-                        print(f"Error: {e}")
-                case '10':
-                    try:
-                        name_query = input("Enter name to search: ")
-                        results = self._service_client.search_by_name(name_query)
-                        if not results:
-                            print("No clients found with that name.")
-                        else:
-                            for client in results:
-                                print(client)
-                    except Exception as e:
-                        print(f"Error: {e}")
-                case '11':
-                    try:
-                        rental_id = int(input("Enter Rental ID: "))
-                        book_id = int(input("Enter Book ID to rent: "))
-                        client_id = int(input("Enter Client ID: "))
-                        rented_date = input("Enter Rented Date (YYYY-MM-DD): ")
-                        self._service_rental.add_rental(rental_id, book_id, client_id, rented_date)
-                        print("Book rented successfully.")
-                    except Exception as e:
-                        print(f"Error: {e}")
-                case '12':
-                    try:
-                        rental_id = int(input("Enter Rental ID to return: "))
-                        returned_date = input("Enter Returned Date (YYYY-MM-DD): ")
-                        self._service_rental.return_book(rental_id, returned_date)
-                        print("Book returned successfully.")
-                    except Exception as e:
-                        print(f"Error: {e}")
-                case '13':
-                    try:
-                        most_rented = self._service_rental.get_most_rented_books()
-                        if not most_rented:
-                            print("No rentals found.")
-                        else:
-                            for book, count in most_rented:
-                                print(f"{book} - Rented {count} times")
-                    except Exception as e:
-                        print(f"Error: {e}")
-                case '14':
-                    try:
-                        most_active = self._service_rental.get_most_active_clients()
-                        if not most_active:
-                            print("No rentals found.")
-                        else:
-                            for client, count in most_active:
-                                print(f"{client} - Rented {count} times")
-                    except Exception as e:
-                        print(f"Error: {e}")
-                case '15':
-                    try:
-                        book_id = int(input("Enter Book ID for borrowers report: "))
-                        borrowers = self._service_rental.get_report_book_borrowers(book_id)
-                        if not borrowers:
-                            print("No borrowers found for this book.")
-                        else:
-                            for client in borrowers:
-                                print(f"Client: {client['Client']} rented the book: {client['Rented Date']}")
-                    except Exception as e:
-                        print(f"Error: {e}")
-                case '0':
-                    break
-                case _ :
-                    print("Invalid option. Please try again.")
\ No newline at end of file
+                        self._renderer.show(reservations)
+                except Exception as e:
+                    print(f"Error: {e}")
+            case _ :
+                print("Invalid option. Please try again.")
\ No newline at end of file
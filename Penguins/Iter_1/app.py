@@ -1,48 +1,25 @@
 import csv
+import math
 import matplotlib.pyplot as plt
 import os
+import sys
 from datetime import datetime
 import random
 import time
-
-headers = {
-    "species": 0,
-    "flipper_length_mm": 1,
-    "culmen_length_mm": 2,
-    "culmen_depth_mm": 3,
-    "body_mass_g": 4,
-    "island": 5,
-    "sex": 6
-}
-numeric_indices = [1, 2, 3, 4]
-# Custom exceptions
-class PenguinError(Exception):
-    """Base class for penguin app errors."""
-    pass
-
-class ColumnNotFoundError(PenguinError):
-    pass
-
-class MissingArgumentError(PenguinError):
-    pass
-
-class InvalidNumberError(PenguinError):
-    pass
-
-class NotNumericColumnError(PenguinError):
-    pass
-
-class InvalidOrderError(PenguinError):
-    pass
-
-class InvalidOptionError(PenguinError):
-    pass
-
-class FileMissingError(PenguinError):
-    pass
-
-class PlotError(PenguinError):
-    pass
+from collections import Counter
+from functools import lru_cache
+from itertools import islice
+
+# The column schema, errors, filter expression parser and statistics are shared with Iter_2
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import penguin_filter
+from penguin_filter import (
+    headers, numeric_indices, PenguinError, ColumnNotFoundError, MissingArgumentError,
+    InvalidNumberError, NotNumericColumnError, InvalidOrderError, InvalidOptionError,
+    FileMissingError, PlotError, FilterSyntaxError, FILTER_OPERATORS, FILTER_KEYWORDS,
+    tokenize_filter, FilterAll, FilterAny, FilterNot,
+)
+from penguin_stats import DESCRIBE_QUANTILES, TDigest, NumericStats, MultivariateStats, sample_gaussian
 
 def merge(left,right,attribute_index, reverse=False):
     """Merge two sorted lists into one sorted list by the given attribute index.
@@ -85,6 +62,75 @@ def merge_sort(data, attribute_index, reverse=False):
 
     return merge(left, right, attribute_index, reverse)
 
+class FilterTable:
+    """The columns of some rows, by column index, for evaluating a filter (see filter_table)."""
+
+    def __init__(self, columns, size):
+        self.columns = columns
+        self.size = size
+
+    def __getitem__(self, index):
+        return self.columns[index]
+
+    def __len__(self):
+        return self.size
+
+def filter_table(rows, columns):
+    """Return a FilterTable of the values of `rows` in each of the `columns`.
+
+    Numeric columns are converted to floats once, values that are not numbers
+    becoming NaN so they never match.
+    """
+    table = {}
+    for index in columns:
+        if index in numeric_indices:
+            values = []
+            for row in rows:
+                try:
+                    values.append(float(row[index]))
+                except ValueError:
+                    values.append(float('nan'))
+            table[index] = values
+        else:
+            table[index] = [row[index] for row in rows]
+    return FilterTable(table, len(rows))
+
+class FilterClause(penguin_filter.FilterClause):
+    """A comparison of one column of a FilterTable with constant values.
+
+    Text columns are compared once per distinct value instead of every row.
+    """
+
+    def estimate(self, table):
+        """Estimate the fraction of rows matching, to evaluate the most selective clauses first."""
+        if self.col_index not in numeric_indices:
+            values = set(table[self.col_index])
+            return sum(1 for value in values if self._test(value)) / len(values) if values else 0.0
+        return {'==': 0.05, 'in': 0.05 * len(self.values), 'between': 0.25, '!=': 0.95}.get(self.operator, 0.5)
+
+    def evaluate(self, table, positions=None):
+        """Return the positions, among `positions` (all rows by default), of the rows matching."""
+        column = table[self.col_index]
+        test = self._test
+        if self.col_index not in numeric_indices:
+            # Compare each distinct text once
+            matching = {value for value in set(column) if test(value)}
+            test = matching.__contains__
+        if positions is None:
+            return [position for position, value in enumerate(column) if test(value)]
+        return [position for position in positions if test(column[position])]
+
+@lru_cache(maxsize=64)
+def compile_filter(expression):
+    """Parse a filter expression once into a tree of FilterAll/FilterAny/FilterNot/FilterClause.
+
+    See penguin_filter.parse_filter for the grammar. The result has
+    evaluate(table) returning the positions of the matching rows, given a
+    FilterTable (see filter_table), and columns() giving the columns it reads.
+    Raises PenguinError subclasses for invalid expressions.
+    """
+    return penguin_filter.parse_filter(expression, FilterClause)
+
 def print_data(command_list, data):
     """Return a list of CSV filenames in the current directory.
 
@@ -106,47 +152,51 @@ def load_data(command_list, data):
     # File reading is handled in the UI loop; keep this as a no-op placeholder to avoid breaking references.
     return data
 
+def parse_filter_command(command_list):
+    """Return the compiled filter of a filter command.
+
+    The simple form ['filter', '<column>', '<value>'] keeps numeric values greater
+    than the number and text containing the value. Anything else is a filter
+    expression (see compile_filter), e.g. 'filter body_mass_g between 3500 4500'
+    or 'filter island in (Dream, Biscoe) and not sex == MALE'.
+    """
+    tokens = list(command_list[1:])
+    if not tokens:
+        raise MissingArgumentError("Please provide a column and value to filter by (e.g., 'filter species Adelie')")
+    first_word = tokens[1].split()[0].lower() if len(tokens) == 2 and tokens[1].split() else ''
+    if len(tokens) == 2 and tokens[0] in headers and first_word not in FILTER_KEYWORDS \
+            and not first_word.startswith(FILTER_OPERATORS):
+        operator = '>' if headers[tokens[0]] in numeric_indices else 'contains'
+        return FilterClause(tokens[0], operator, [tokens[1]])
+    if len(tokens) == 1 and tokens[0] in headers:
+        raise MissingArgumentError("Please provide a column and value to filter by (e.g., 'filter species Adelie')")
+    return compile_filter(' '.join(tokens))
+
 def filter_data(command_list, data):
     """Return rows from `data` matching the filter specified in `command_list`.
 
-    Expects `command_list` like: ['filter', '<column>', '<value>'] and returns a list
-    of matching rows. Raises custom PenguinError subclasses for invalid input.
+    Expects `command_list` like: ['filter', '<column>', '<value>'] or a filter
+    expression (see parse_filter_command) and returns a list of matching rows.
+    The simple form keeps numeric values greater than the given number. Raises
+    custom PenguinError subclasses for invalid input.
 
-    Time complexity: O(n) where n is the number of rows (substring checks may
-    add additional cost proportional to field lengths).
-    Space complexity: O(k) where k is the number of matching rows (worst-case O(n)).
+    Time complexity: O(n) for the first clause evaluated, then O(k) per clause for
+    the k rows still matching; text comparisons are made once per distinct value.
+    Space complexity: O(n) for the columns the filter reads.
     """
-    # Validate arguments
-    if len(command_list) < 3:
-        raise MissingArgumentError("Please provide a column and value to filter by (e.g., 'filter species Adelie')")
-    if command_list[1] not in headers:
-        raise ColumnNotFoundError("That column does not exist. Try again.")
-    col_index = headers[command_list[1]]
-    target_value = command_list[2]
-    filtered_data = []
+    tree = parse_filter_command(command_list)
+    positions = tree.evaluate(filter_table(data, tree.columns()))
+    return [data[position] for position in positions]
 
-    for row in data:
-        if col_index in numeric_indices:
-            try:
-                if float(row[col_index]) > float(target_value):
-                    filtered_data.append(row)
-            except ValueError:
-                # signal invalid numeric filter to UI
-                raise InvalidNumberError("Please provide a valid number for filtering.")
-        else:
-            if target_value in row[col_index]:
-                filtered_data.append(row)
-    return filtered_data
-
-def describe_data(command_list, data):
-    """Return (min, max, average) for a numeric column specified in `command_list`.
+def describe_stats(command_list, data):
+    """Return the NumericStats of a numeric column specified in `command_list`.
 
-    Returns None if no valid numeric values are present. Raises custom exceptions
-    for missing or non-numeric columns.
+    Everything is computed in a single pass over the rows, without keeping the
+    values; cells that are not numbers count as missing values. Raises custom
+    exceptions for missing or non-numeric columns.
 
     Time complexity: O(n) where n is the number of rows scanned.
-    Space complexity: O(m) where m is the number of numeric values collected
-    (worst-case O(n)).
+    Space complexity: O(1), plus the O(compression) quantile digest.
     """
     if len(command_list) < 2:
         raise MissingArgumentError("Please provide a column to describe (e.g., 'describe body_mass_g')")
@@ -155,18 +205,30 @@ def describe_data(command_list, data):
     col_index = headers[command_list[1]]
     if col_index not in numeric_indices:
         raise NotNumericColumnError("Description is only available for numeric columns.")
-    values = []
-    for row in data:
-        try:
-            values.append(float(row[col_index]))
-        except ValueError:
-            continue
-    if not values:
+    stats = NumericStats()
+    stats.update(_to_float(row[col_index]) for row in data)
+    return stats
+
+def _to_float(text):
+    """Return a cell as a float, NaN if it is not a number."""
+    try:
+        return float(text)
+    except ValueError:
+        return math.nan
+
+def describe_data(command_list, data):
+    """Return (min, max, average) for a numeric column specified in `command_list`.
+
+    Returns None if no valid numeric values are present. Raises custom exceptions
+    for missing or non-numeric columns. See describe_stats for the other statistics.
+
+    Time complexity: O(n) where n is the number of rows scanned.
+    Space complexity: O(1).
+    """
+    stats = describe_stats(command_list, data)
+    if not stats.count:
         return None
-    minimum = min(values)
-    maximum = max(values)
-    average = sum(values) / len(values)
-    return minimum, maximum, average
+    return stats.minimum, stats.maximum, stats.mean
 
 def unique_data(command_list, data):
     """Return a dict of value -> count for the specified column.
@@ -187,6 +249,111 @@ def unique_data(command_list, data):
         unique_values[value] = unique_values.get(value, 0) + 1
     return unique_values
 
+GROUPBY_AGGREGATES = ('count', 'mean', 'min', 'max', 'std')  # besides quantiles p0 to p100, e.g. p50
+GROUPBY_BLOCK = 65536  # rows bucketed per group at a time
+
+
+def _quantile_level(name):
+    """Return the quantile (0 to 1) named by an aggregate such as 'p95', or None."""
+    if name[:1] == 'p' and name[1:].isdigit() and int(name[1:]) <= 100:
+        return int(name[1:]) / 100
+    return None
+
+def parse_groupby_command(command_list):
+    """Return (key_indices, aggregates) for a groupby command.
+
+    Every word after 'groupby' (words may also be separated by commas) is either a
+    column to group by or an aggregate: 'count' (rows per group) or
+    'name(column)' on a numeric column, name being one of GROUPBY_AGGREGATES or a
+    quantile such as p50. Aggregates are (label, name, col_index) tuples, col_index
+    None for 'count'; without any aggregate the rows are counted.
+    """
+    keys, aggregates = [], []
+    for token in ' '.join(command_list[1:]).replace(',', ' ').split():
+        if token in headers:
+            keys.append(headers[token])
+            continue
+        if token == 'count':
+            aggregates.append((token, token, None))
+            continue
+        name, parenthesis, column = token.partition('(')
+        if not parenthesis or not column.endswith(')'):
+            raise InvalidOptionError(f"'{token}' is neither a column nor an aggregate like mean(body_mass_g).")
+        column = column[:-1]
+        if column not in headers:
+            raise ColumnNotFoundError("That column does not exist. Try again.")
+        if headers[column] not in numeric_indices:
+            raise NotNumericColumnError(f"'{name}' can only aggregate numeric columns.")
+        if name not in GROUPBY_AGGREGATES and _quantile_level(name) is None:
+            raise InvalidOptionError(f"Unknown aggregate '{name}'. Use {', '.join(GROUPBY_AGGREGATES)} or a quantile like p50.")
+        aggregates.append((token, name, headers[column]))
+    if not keys:
+        raise MissingArgumentError("Please provide the columns to group by (e.g., 'groupby species,island mean(body_mass_g)')")
+    return keys, aggregates or [('count', 'count', None)]
+
+def _group_order(keys):
+    """Return a sort key ordering group keys by their values, numbers numerically and missing values last."""
+    def order(texts):
+        cells = []
+        for index, text in zip(keys, texts):
+            value = _to_float(text) if index in numeric_indices else 0.0
+            missing = value != value or text in ('', 'NA')
+            cells.append((missing, 0.0 if missing else value, text))
+        return tuple(cells)
+    return order
+
+def groupby_data(command_list, data):
+    """Aggregate numeric columns per group of rows sharing the same key columns.
+
+    e.g. 'groupby species,island count mean(body_mass_g) p50(flipper_length_mm)'
+    (see parse_groupby_command). Returns (columns, rows): the output column names,
+    then one row per group, sorted by key, of the key texts followed by the
+    aggregates (None where a group has no value). Rows are hashed into their
+    group a block at a time, and each block's values feed one NumericStats per
+    group and column, so the values are read in a single pass and not kept.
+
+    Time complexity: O(n * a) for n rows and a aggregated columns.
+    Space complexity: O(GROUPBY_BLOCK) values, plus O(g * a) summaries for g groups.
+    """
+    keys, aggregates = parse_groupby_command(command_list)
+    value_columns = sorted({index for _, _, index in aggregates if index is not None})
+    needs_digest = any(_quantile_level(name) is not None for _, name, _ in aggregates)
+    compression = 100 if needs_digest else None
+    groups = {}
+    rows = iter(data)
+    while True:
+        buckets = {}
+        for row in islice(rows, GROUPBY_BLOCK):
+            key = tuple(row[index] for index in keys)
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = buckets[key] = [0] + [[] for _ in value_columns]
+            bucket[0] += 1
+            for values, index in zip(bucket[1:], value_columns):
+                values.append(_to_float(row[index]))
+        if not buckets:
+            break
+        for key, (count, *values) in buckets.items():
+            if key not in groups:
+                groups[key] = [0, {index: NumericStats(compression) for index in value_columns}]
+            groups[key][0] += count
+            for index, column_values in zip(value_columns, values):
+                groups[key][1][index].update(column_values)
+    columns = [list(headers)[index] for index in keys] + [label for label, _, _ in aggregates]
+    result = []
+    for key in sorted(groups, key=_group_order(keys)):
+        count, stats = groups[key]
+        row = list(key)
+        for _, name, index in aggregates:
+            if index is None:
+                row.append(count)
+            elif _quantile_level(name) is not None:
+                row.append(stats[index].quantile(_quantile_level(name)))
+            else:
+                row.append(stats[index].summary()[name])
+        result.append(row)
+    return columns, result
+
 def sort_data(command_list, data):
     """Return (sorted_data, elapsed_seconds) after sorting by the specified column.
 
@@ -206,13 +373,104 @@ def sort_data(command_list, data):
     elapsed = end_time - start_time
     return sorted_data, elapsed
 
+AUGMENT_OPTIONS = ('duplicate', 'create', 'gaussian')
+
+
+def _uniform_columns(data, count):
+    """Draw `count` rows column by column for the 'create' augment option.
+
+    Numeric values are uniform between the column's minimum and maximum, and
+    the other cells uniform among the values present; a numeric column with
+    no value present stays 'NA'. Returns one list per column.
+    """
+    draw = random.random
+    columns = []
+    for index in range(len(headers)):
+        if index in numeric_indices:
+            present = [value for value in (_to_float(row[index]) for row in data) if value == value]
+            if not present:
+                columns.append(['NA'] * count)
+                continue
+            low, high = min(present), max(present)
+            columns.append([low + (high - low) * draw() for _ in range(count)])
+        else:
+            columns.append(random.choices(sorted({row[index] for row in data}), k=count))
+    return columns
+
+def fit_species_model(data):
+    """Fit the model of the 'gaussian' augment option, in one pass over the rows.
+
+    Returns {species: (rows, MultivariateStats, frequencies)}: per species, its
+    number of rows, the mean and covariance of the numeric columns (over the
+    rows with no missing numeric value) and, for every other column, a Counter
+    of its values. Rows are bucketed per species a block at a time.
+    """
+    species_index = headers['species']
+    others = [index for index in headers.values() if index not in numeric_indices and index != species_index]
+    model = {}
+    rows = iter(data)
+    while True:
+        buckets = {}
+        for row in islice(rows, GROUPBY_BLOCK):
+            bucket = buckets.get(row[species_index])
+            if bucket is None:
+                bucket = buckets[row[species_index]] = [[] for _ in headers]
+            for index, values in enumerate(bucket):
+                values.append(row[index])
+        if not buckets:
+            break
+        for species, bucket in buckets.items():
+            if species not in model:
+                model[species] = [0, MultivariateStats(len(numeric_indices)), {index: Counter() for index in others}]
+            model[species][0] += len(bucket[species_index])
+            for index in others:
+                model[species][2][index].update(bucket[index])
+            vectors = [vector for vector in zip(*(map(_to_float, bucket[index]) for index in numeric_indices))
+                       if sum(vector) == sum(vector)]  # NaN when a value is missing
+            if vectors:
+                model[species][1].update(list(zip(*vectors)))
+    return {species: tuple(fit) for species, fit in model.items()}
+
+def _gaussian_columns(data, count):
+    """Draw `count` rows for the 'gaussian' augment option (see fit_species_model).
+
+    Species are drawn with their frequencies in the data; each row then gets
+    numeric values from its species' multivariate Gaussian, which keeps the
+    correlations between measurements, and the other cells with their
+    frequencies within the species. The numeric cells of a species with no
+    complete measurements are 'NA', as in the CSV. Returns one list per column.
+    """
+    model = fit_species_model(data)
+    species_index = headers['species']
+    species = list(model)
+    drawn = random.choices(species, [model[name][0] for name in species], k=count)
+    positions = {}
+    for position, name in enumerate(drawn):
+        positions.setdefault(name, []).append(position)
+    columns = [['NA'] * count if index in numeric_indices else [''] * count for index in range(len(headers))]
+    columns[species_index] = drawn
+    for name, where in positions.items():
+        _, fit, frequencies = model[name]
+        if fit.count:
+            for index, values in zip(numeric_indices, sample_gaussian(fit, len(where))):
+                for position, value in zip(where, values):
+                    columns[index][position] = value
+        for index, counts in frequencies.items():
+            values, weights = zip(*counts.items())
+            for position, value in zip(where, random.choices(values, weights, k=len(where))):
+                columns[index][position] = value
+    return columns
+
 def augment_data(command_list, data):
     """Augment dataset either by duplicating existing rows or creating synthetic ones.
 
-    Returns (data, num_added, action). Raises PenguinError subclasses for invalid input.
+    'create' draws every column independently and uniformly; 'gaussian' draws
+    realistic rows from per-species Gaussians (see fit_species_model). Both
+    draw whole columns at once. Returns (data, num_added, action). Raises
+    PenguinError subclasses for invalid input.
     """
     if len(command_list) < 3:
-        raise MissingArgumentError("Please enter one of the following options: duplicate or create")
+        raise MissingArgumentError("Please enter one of the following options: duplicate, create or gaussian")
     action = command_list[2]
     try:
         percent = int(command_list[1])
@@ -224,34 +482,14 @@ def augment_data(command_list, data):
         for _ in range(num_to_add):
             data.append(random.choice(data))
         return data, num_to_add, 'duplicate'
-    elif action == 'create':
-        blueprint = {}
-        for header in range(len(headers)):
-            if header in numeric_indices:
-                blueprint[header] = [float('inf'), float('-inf')]
-            else:
-                blueprint[header] = set()
-        for row in data:
-            for header in range(len(headers)):
-                if header in numeric_indices:
-                    blueprint[header][0] = min(blueprint[header][0], float(row[header]))
-                    blueprint[header][1] = max(blueprint[header][1], float(row[header]))
-                else:
-                    blueprint[header].add(row[header])
-        for _ in range(num_to_add):
-            new_row = []
-            for header in range(len(headers)):
-                if header in numeric_indices:
-                    min_val, max_val = blueprint[header]
-                    new_value = random.uniform(min_val, max_val)
-                    new_row.append(new_value)
-                else:
-                    new_value = random.choice(list(blueprint[header]))
-                    new_row.append(new_value)
-            data.append(new_row)
-        return data, num_to_add, 'create'
+    elif action in ('create', 'gaussian'):
+        if not num_to_add:
+            return data, 0, action
+        sample = _uniform_columns if action == 'create' else _gaussian_columns
+        data.extend(list(row) for row in zip(*sample(data, num_to_add)))
+        return data, num_to_add, action
     else:
-        raise InvalidOptionError("Unknown augment option. Please use 'duplicate' or 'create'.")
+        raise InvalidOptionError(f"Unknown augment option. Please use {', '.join(AUGMENT_OPTIONS)}.")
 
 def scatter_data(command_list, data):
     """Return two lists (x_values, y_values) prepared for plotting.
@@ -382,13 +620,17 @@ if __name__ == "__main__":
                 # UI: compute and print descriptive stats (I/O in UI)
                 case 'describe':
                     try:
-                        res = describe_data(command_list, data)
-                        if res is not None:
-                            minimum, maximum, average = res
+                        stats = describe_stats(command_list, data)
+                        if stats.count:
                             print(f"Description for {command_list[1]}:")
-                            print(f"  Min: {minimum}")
-                            print(f"  Max: {maximum}")
-                            print(f"  Average: {average:.2f}")
+                            print(f"  Count: {stats.count} ({stats.null_count} missing)")
+                            print(f"  Min: {stats.minimum}")
+                            print(f"  Max: {stats.maximum}")
+                            print(f"  Average: {stats.mean:.2f}")
+                            if stats.std is not None:
+                                print(f"  Std: {stats.std:.2f}")
+                            for q in DESCRIBE_QUANTILES:
+                                print(f"  p{round(q * 100)} (approx.): {stats.quantile(q):.2f}")
                     except PenguinError as e:
                         print(str(e))
 
@@ -402,6 +644,17 @@ if __name__ == "__main__":
                     except PenguinError as e:
                         print(str(e))
 
+                # UI: print one line per group (I/O in UI)
+                case 'groupby':
+                    try:
+                        columns, rows = groupby_data(command_list, data)
+                        print(" | ".join(columns))
+                        for row in rows:
+                            print(" | ".join("NA" if cell is None else f"{cell:.2f}" if isinstance(cell, float)
+                                             else str(cell) for cell in row))
+                    except PenguinError as e:
+                        print(str(e))
+
                 # UI: sort dataset and log timing (I/O performed in UI)
                 case 'sort':
                     try:
@@ -474,10 +727,12 @@ if __name__ == "__main__":
                     print("  print                           - List all CSV files in the current directory")
                     print("  load <filename>                 - Load a CSV file")
                     print("  filter <column> <value>        - Filter data by column and value")
-                    print("  describe <column>               - Show min, max, and average for a numeric column")
+                    print("  filter <expression>             - e.g. filter species contains Adelie and body_mass_g between 3500 4500 or island in (Dream, Biscoe)")
+                    print("  describe <column>               - Show count, min, max, average, std and quartiles of a numeric column")
                     print("  unique <column>                 - Show unique values and their counts for a column")
                     print("  sort <column> <asc|desc>       - Sort data by column in ascending or descending order")
-                    print("  augment <percentage> <option>   - Augment data by duplicating or creating new entries")
+                    print("  groupby <columns> <aggregates>  - e.g. groupby species,island count mean(body_mass_g) p50(body_mass_g)")
+                    print("  augment <percentage> <option>   - Augment data by duplicating, creating (uniform) or gaussian (per-species) entries")
                     print("  scatter <x_column> <y_column> - Create a scatter plot of two numeric columns")
                     print("  hist <column> <bin_count>         - Create a histogram of a numeric column")
                     print("  boxplot <category_column> <numeric_column> - Create a boxplot of a numeric column grouped by a categorical column")
@@ -1,13 +1,20 @@
+import random
+import statistics
 import unittest
 
 from app import (
     filter_data,
     describe_data,
+    describe_stats,
     unique_data,
+    groupby_data,
+    augment_data,
     ColumnNotFoundError,
     MissingArgumentError,
+    InvalidOptionError,
     InvalidNumberError,
     NotNumericColumnError,
+    FilterSyntaxError,
 )
 
 
@@ -42,6 +49,30 @@ class TestFilterData(unittest.TestCase):
         with self.assertRaises(ColumnNotFoundError):
             filter_data(["filter", "unknown_col", "x"], self.data)
 
+    def test_filter_expression(self):
+        # 'and' binds tighter than 'or': reading either expression left to right gives [0] and [0, 1]
+        res = filter_data('filter species == Adelie and body_mass_g between 3700 3900 or island == Biscoe'.split(),
+                          self.data)
+        self.assertEqual([row for row in res], [self.data[0], self.data[1], self.data[3]])
+        res = filter_data(["filter", 'island == Biscoe or species == Adelie and body_mass_g between 3700 3900'],
+                          self.data)
+        self.assertEqual([row for row in res], [self.data[0], self.data[1], self.data[3]])
+        res = filter_data(["filter", '(island == Biscoe or species == Adelie) and body_mass_g between 3700 3900'],
+                          self.data)
+        self.assertEqual([row for row in res], [self.data[0], self.data[1]])
+        res = filter_data(["filter", 'not (island == Biscoe) and flipper_length_mm >= 185'], self.data)
+        self.assertEqual([row for row in res], [self.data[2]])
+        res = filter_data(["filter", 'species contains "Chin" or body_mass_g > 4500'], self.data)
+        self.assertEqual([row[0] for row in res], ["Chinstrap", "Gentoo"])
+
+    def test_filter_expression_errors(self):
+        with self.assertRaises(FilterSyntaxError):
+            filter_data(["filter", "island in (Dream"], self.data)
+        with self.assertRaises(NotNumericColumnError):
+            filter_data(["filter", "species > 3"], self.data)
+        with self.assertRaises(ColumnNotFoundError):
+            filter_data(["filter", "mass == 3"], self.data)
+
 
 class TestDescribeData(unittest.TestCase):
     def setUp(self):
@@ -77,6 +108,76 @@ class TestDescribeData(unittest.TestCase):
         res = describe_data(["describe", "body_mass_g"], data)
         self.assertIsNone(res)
 
+    def test_describe_stats(self):
+        stats = describe_stats(["describe", "body_mass_g"], self.data + [["D", "13", "0", "0", "NA", "I", "F"]])
+        self.assertEqual((stats.count, stats.null_count, stats.minimum, stats.maximum), (3, 1, 100.0, 300.0))
+        self.assertAlmostEqual(stats.mean, 200.0)
+        self.assertAlmostEqual(stats.std, 100.0)
+        self.assertEqual(stats.quantile(0.5), 200.0)
+
+
+class TestGroupByData(unittest.TestCase):
+    def setUp(self):
+        self.data = [
+            ["Adelie", "181", "39.1", "18.1", "3750", "Torgersen", "F"],
+            ["Gentoo", "217", "50.3", "19.0", "5000", "Biscoe", "M"],
+            ["Adelie", "190", "40.5", "17.5", "3250", "Dream", "F"],
+            ["Adelie", "186", "38.0", "18.0", "NA", "Torgersen", "M"],
+            ["Adelie", "195", "39.5", "18.5", "4250", "Torgersen", "M"],
+            ["Gentoo", "210", "46.1", "13.2", "4900", "Biscoe", "F"],
+        ]
+
+    def test_aggregates_per_group(self):
+        columns, rows = groupby_data(["groupby", "species,island", "count", "mean(body_mass_g)",
+                                      "std(body_mass_g)", "p50(flipper_length_mm)"], self.data)
+        self.assertEqual(columns, ["species", "island", "count", "mean(body_mass_g)", "std(body_mass_g)",
+                                   "p50(flipper_length_mm)"])
+        self.assertEqual([row[:4] for row in rows], [["Adelie", "Dream", 1, 3250.0],
+                                                     ["Adelie", "Torgersen", 3, 4000.0],
+                                                     ["Gentoo", "Biscoe", 2, 4950.0]])
+        self.assertIsNone(rows[0][4])
+        self.assertAlmostEqual(rows[1][4], 353.5533905932738)
+        self.assertEqual(rows[1][5], 186.0)
+
+    def test_groupby_invalid_args(self):
+        with self.assertRaises(MissingArgumentError):
+            groupby_data(["groupby", "count"], self.data)
+        with self.assertRaises(NotNumericColumnError):
+            groupby_data(["groupby", "species", "mean(island)"], self.data)
+        with self.assertRaises(InvalidOptionError):
+            groupby_data(["groupby", "species", "median(body_mass_g)"], self.data)
+
+
+class TestAugmentData(unittest.TestCase):
+    def setUp(self):
+        random.seed(11)
+        self.rows = [["Adelie", str(180 + i), "39.0", "18.0", str(3000 + 20 * i + (i % 3) * 5), "Dream", "F"]
+                     for i in range(10)]
+        self.rows += [["Gentoo", str(210 + i), "47.0", "15.0", str(5000 - 30 * i), "Biscoe", "M"] for i in range(10)]
+        self.rows.append(["Gentoo", "215", "47.0", "15.0", "NA", "Biscoe", "M"])
+
+    def test_create_draws_within_observed_values(self):
+        data, count, _ = augment_data(["augment", "200", "create"], list(self.rows))
+        self.assertEqual((len(data), count), (63, 42))
+        for row in data[21:]:
+            self.assertTrue(3000 <= row[4] <= 5000)
+            self.assertIn(row[5], ("Dream", "Biscoe"))
+
+    def test_gaussian_keeps_species_correlations(self):
+        data, count, _ = augment_data(["augment", "2000", "gaussian"], list(self.rows))
+        self.assertEqual(count, 420)
+        for species, sign in (("Adelie", 1), ("Gentoo", -1)):
+            rows = [row for row in data[21:] if row[0] == species]
+            self.assertTrue(all(row[5] == self.rows[-1 if species == "Gentoo" else 0][5] for row in rows))
+            self.assertGreater(sign * statistics.correlation([row[1] for row in rows], [row[4] for row in rows]), 0.9)
+
+    def test_gaussian_species_without_measurements_gets_na(self):
+        rows = self.rows + [["Chinstrap", "NA", "NA", "NA", "NA", "Dream", "F"]] * 10
+        data, _, _ = augment_data(["augment", "500", "gaussian"], rows)
+        chinstrap = [row for row in data[31:] if row[0] == "Chinstrap"]
+        self.assertTrue(chinstrap)
+        self.assertTrue(all(row[1:5] == ["NA"] * 4 for row in chinstrap))
+
 
 class TestUniqueData(unittest.TestCase):
     def setUp(self):
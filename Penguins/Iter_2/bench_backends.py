@@ -0,0 +1,56 @@
+"""
+Benchmark of the pure Python and NumPy backends of the penguin commands.
+
+A dataset of --rows rows is made by sampling penguins_data.csv, then filter,
+describe, unique and hist run on it with every available backend; the results
+of the backends are checked to be the same. Run from this folder:
+
+    python bench_backends.py --rows 10000000
+"""
+
+import argparse
+import random
+import time
+from penguin_logic import (
+    BACKENDS, np, load_file_content, set_backend, filter_data, describe_data, unique_data, hist_data
+)
+
+COMMANDS = [
+    (filter_data, ['filter', 'body_mass_g', '4500']),
+    (filter_data, ['filter', 'species', 'Gentoo']),
+    (describe_data, ['describe', 'body_mass_g']),
+    (unique_data, ['unique', 'island']),
+    (hist_data, ['hist', 'flipper_length_mm', '30']),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10_000_000, help="rows of the sampled dataset")
+    args = parser.parse_args()
+
+    backends = [name for name in BACKENDS if name != 'numpy' or np is not None]
+    sample = load_file_content('penguins_data.csv')
+    rng = random.Random(7)
+    dataset = sample.take([rng.randrange(len(sample)) for _ in range(args.rows)])
+
+    print(f"{args.rows:,} rows" + ("" if np is not None else " (NumPy is not installed)"))
+    print(f"{'command':<36}" + "".join(f"{name + ' s':>12}" for name in backends))
+    for command, command_list in COMMANDS:
+        timings = []
+        results = []
+        for name in backends:
+            previous = set_backend(name)
+            start = time.perf_counter()
+            result = command(command_list, dataset)
+            timings.append(time.perf_counter() - start)
+            set_backend(previous)
+            results.append(len(result) if command is filter_data else result)
+        if command is describe_data:
+            results = [tuple(round(value, 6) for value in result) for result in results]
+        assert all(result == results[0] for result in results), command_list
+        print(f"{' '.join(command_list):<36}" + "".join(f"{seconds:>12.3f}" for seconds in timings))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark of the commands on a list of CSV rows against a PenguinDataset.
+
+A synthetic penguin file of --rows rows is written by sampling penguins_data.csv
+and jittering its numbers. Each command then runs on the rows as read by
+csv.reader, where every call parses the columns it needs, and on the dataset
+loaded once by load_file_content. Run from this folder:
+
+    python bench_dataset.py --rows 2000000
+"""
+
+import argparse
+import csv
+import os
+import random
+import tempfile
+import time
+from penguin_logic import (
+    headers, numeric_indices, load_file_content, filter_data, describe_data, unique_data,
+    sort_data, scatter_data, hist_data, boxplot_data
+)
+
+COMMANDS = [
+    ['describe', 'body_mass_g'],
+    ['filter', 'body_mass_g', '4500'],
+    ['filter', 'species', 'Gentoo'],
+    ['unique', 'island'],
+    ['hist', 'flipper_length_mm', '20'],
+    ['scatter', 'flipper_length_mm', 'body_mass_g'],
+    ['boxplot', 'species', 'body_mass_g'],
+    ['sort', 'species', 'asc', 'body_mass_g', 'desc', 'timsort'],
+]
+RUNNERS = {
+    'describe': describe_data, 'filter': filter_data, 'unique': unique_data, 'hist': hist_data,
+    'scatter': scatter_data, 'boxplot': boxplot_data, 'sort': sort_data,
+}
+
+
+def write_synthetic_file(path, rows, seed=7):
+    """
+    Write a penguin CSV file of synthetic rows sampled from penguins_data.csv.
+
+    Args:
+        path: The file to write
+        rows: The number of rows
+        seed: The seed of the random generator
+    """
+    rng = random.Random(seed)
+    with open('penguins_data.csv', newline='') as file:
+        samples = list(csv.reader(file))[1:]
+    with open(path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(list(headers))
+        for _ in range(rows):
+            row = list(rng.choice(samples))
+            for index in numeric_indices:
+                row[index] = f"{float(row[index]) * rng.uniform(0.95, 1.05):.1f}"
+            writer.writerow(row)
+
+
+def timed(function, *args):
+    """
+    Return the result of a call and its wall-clock time in seconds.
+    """
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=2_000_000, help="rows of the synthetic file")
+    args = parser.parse_args()
+
+    handle, path = tempfile.mkstemp(suffix='.csv')
+    os.close(handle)
+    try:
+        write_synthetic_file(path, args.rows)
+        with open(path, newline='') as file:
+            reader = csv.reader(file)
+            next(reader)
+            rows, list_load = timed(list, reader)
+        dataset, dataset_load = timed(load_file_content, path)
+    finally:
+        os.remove(path)
+
+    print(f"{args.rows:,} rows")
+    print(f"{'command':<52} {'rows s':>8} {'dataset s':>10} {'speed-up':>9}")
+    print(f"{'load':<52} {list_load:>8.3f} {dataset_load:>10.3f} {list_load / dataset_load:>8.2f}x")
+    total_rows, total_dataset = list_load, dataset_load
+    for command in COMMANDS:
+        _, on_rows = timed(RUNNERS[command[0]], command, rows)
+        _, on_dataset = timed(RUNNERS[command[0]], command, dataset)
+        total_rows += on_rows
+        total_dataset += on_dataset
+        print(f"{' '.join(command):<52} {on_rows:>8.3f} {on_dataset:>10.3f} {on_rows / on_dataset:>8.2f}x")
+    print(f"{'load + every command':<52} {total_rows:>8.3f} {total_dataset:>10.3f} "
+          f"{total_rows / total_dataset:>8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
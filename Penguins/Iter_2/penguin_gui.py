@@ -10,9 +10,10 @@ print("Files here:", os.listdir('.'))
 # (Make sure penguin_logic.py is in the same folder!)
 from penguin_logic import (
     headers, numeric_indices, 
-    filter_data, describe_data, unique_data, sort_data, 
-    augment_data, scatter_data, hist_data, boxplot_data, 
-    load_file_content, PenguinError, generate_penguin_ascii, get_random_fact
+    filter_data, describe_stats, unique_data, sort_data, 
+    augment_data, scatter_data, hist_data, boxplot_data, groupby_data,
+    load_file_content, PenguinError, generate_penguin_ascii, get_random_fact,
+    PenguinStream, DESCRIBE_QUANTILES
 )
 
 # --- 1. Setup Main Window ---
@@ -31,6 +32,11 @@ def log(message):
     log_area.see(tk.END)
     log_area.config(state='disabled')
 
+def show_progress(read, size):
+    """Moves the progress bar while a streamed file is read."""
+    progress_bar.config(value=100 * read / size if size else 100)
+    root.update_idletasks()
+
 def update_inputs(event=None):
     """Updates the labels and input boxes based on the selected command."""
     cmd = cmd_var.get()
@@ -56,18 +62,26 @@ def update_inputs(event=None):
         arg1_label.config(text="Filename:")
         arg2_entry.grid_remove()  # Hide 2nd box
         arg2_label.grid_remove()  # Hide 2nd label
+
+    elif cmd == 'stream':
+        arg1_label.config(text="Filename:")
+        arg2_label.config(text="Rows per chunk (optional):")
         
     elif cmd == 'filter':
-        arg1_label.config(text="Column:")
-        arg2_label.config(text="Value:")
+        arg1_label.config(text="Column or expression:")
+        arg2_label.config(text="Value (simple filter):")
         
     elif cmd == 'sort':
-        arg1_label.config(text="Column:")
-        arg2_label.config(text="Order (asc/desc):")
+        arg1_label.config(text="Columns (e.g. species asc body_mass_g desc):")
+        arg2_label.config(text="Algorithm (merge/timsort/radix):")
+        
+    elif cmd == 'groupby':
+        arg1_label.config(text="Group by (e.g. species,island):")
+        arg2_label.config(text="Aggregates (e.g. count mean(body_mass_g) p50(body_mass_g)):")
         
     elif cmd == 'augment':
         arg1_label.config(text="Percentage:")
-        arg2_label.config(text="Option (duplicate/create):")
+        arg2_label.config(text="Option (duplicate/create/gaussian):")
         
     elif cmd == 'scatter':
         arg1_label.config(text="X Column:")
@@ -100,6 +114,20 @@ def execute_command():
             data = load_file_content(arg1)
             log(f"✅ Loaded {len(data)} penguins from {arg1}")
 
+        elif cmd == 'stream':
+            # The file is only read by each command, chunk by chunk
+            if not arg1:
+                messagebox.showerror("Error", "Please enter a filename!")
+                return
+            chunk_size = int(arg2) if arg2.isdigit() else 100_000
+            data = PenguinStream(arg1, chunk_size, progress=show_progress)
+            log(f"🌊 Streaming {arg1} in chunks of {chunk_size} rows (describe, unique, filter, groupby, hist)")
+
+        elif cmd == 'filter' and isinstance(data, PenguinStream):
+            count = filter_data(command_list + ['into', 'filtered_data.csv'], data)
+            log(f"🔍 Found {count} matches.")
+            log("   Saved to filtered_data.csv")
+
         elif cmd == 'filter':
             result = filter_data(command_list, data)
             log(f"🔍 Found {len(result)} matches.")
@@ -107,9 +135,12 @@ def execute_command():
                 log(str(row))
 
         elif cmd == 'describe':
-            res = describe_data(command_list, data)
-            if res:
-                log(f"📊 Stats for {arg1}: Min={res[0]}, Max={res[1]}, Avg={res[2]:.2f}")
+            stats = describe_stats(command_list, data)
+            if stats.count:
+                log(f"📊 Stats for {arg1}: Min={stats.minimum}, Max={stats.maximum}, Avg={stats.mean:.2f}")
+                std = f"{stats.std:.2f}" if stats.std is not None else "n/a"
+                log(f"   Count={stats.count}, Missing={stats.null_count}, Std={std}")
+                log("   " + ", ".join(f"p{round(q * 100)}≈{stats.quantile(q):.2f}" for q in DESCRIBE_QUANTILES))
 
         elif cmd == 'unique':
             res = unique_data(command_list, data)
@@ -118,14 +149,25 @@ def execute_command():
                 log(f"   {k}: {v}")
 
         elif cmd == 'sort':
+            # Several "<column> <order>" pairs can be typed, primary key first
+            command_list = [cmd] + arg1.split() + arg2.split()
             sorted_data, elapsed = sort_data(command_list, data)
             data = sorted_data
-            log(f"⚡ Sorted by {arg1} in {elapsed:.4f}s")
+            log(f"⚡ Sorted by {arg1} ({arg2 or 'merge'}) in {elapsed:.4f}s")
+
+        elif cmd == 'groupby':
+            columns, rows = groupby_data(command_list, data)
+            log(f"🧮 {len(rows)} groups:")
+            log("   " + " | ".join(columns))
+            for row in rows:
+                cells = ("NA" if cell is None else f"{cell:.2f}" if isinstance(cell, float) else str(cell) for cell in row)
+                log("   " + " | ".join(cells))
 
         elif cmd == 'augment':
             new_data, count, action = augment_data(command_list, data)
             data = new_data
-            log(f"🧬 {action.title()}d {count} new penguins.")
+            verb = "Duplicated" if action == 'duplicate' else "Created"
+            log(f"🧬 {verb} {count} new penguins ({action}).")
             # Save the augmented file
             with open('augmented_data.csv', 'w', newline='') as f:
                 writer = csv.writer(f)
@@ -145,9 +187,9 @@ def execute_command():
             log(f"📈 Scatter plot created.")
 
         elif cmd == 'hist':
-            vals, bins = hist_data(command_list, data)
+            counts, edges = hist_data(command_list, data)
             plt.figure(figsize=(6, 4))
-            plt.hist(vals, bins=bins, color='teal', edgecolor='black')
+            plt.hist(edges[:-1], bins=edges, weights=counts, color='teal', edgecolor='black')
             plt.title(f"Histogram of {arg1}")
             plt.show()
             log(f"📊 Histogram created.")
@@ -186,7 +228,7 @@ ttk.Label(control_frame, text="Operation:").grid(row=0, column=0, padx=5, pady=5
 cmd_var = tk.StringVar()
 cmd_combo = ttk.Combobox(control_frame, textvariable=cmd_var, state="readonly")
 cmd_combo['values'] = [
-    "load", "filter", "describe", "unique", "sort", 
+    "load", "stream", "filter", "describe", "unique", "sort", "groupby",
     "augment", "scatter", "hist", "boxplot",
     "fact", "art"
 ]
@@ -211,6 +253,10 @@ arg2_entry.grid(row=2, column=1, padx=5, pady=5)
 run_btn = ttk.Button(control_frame, text="Execute Command", command=execute_command)
 run_btn.grid(row=3, column=0, columnspan=2, pady=10, sticky="ew")
 
+# Progress of streamed files
+progress_bar = ttk.Progressbar(control_frame, maximum=100)
+progress_bar.grid(row=4, column=0, columnspan=2, pady=5, sticky="ew")
+
 # Output Log
 output_frame = ttk.LabelFrame(root, text="Output Log", padding="10")
 output_frame.pack(fill="both", expand=True, padx=10, pady=5)
@@ -1,90 +1,736 @@
 import csv
-import matplotlib.pyplot as plt
+import heapq
+import json
+import math
+import mmap
 import os
+import sys
 from datetime import datetime
 import random
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from functools import lru_cache
+from itertools import compress, islice, repeat
 import time
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the commands fall back to pure Python
+    np = None
 
-headers = {
-    "species": 0,
-    "flipper_length_mm": 1,
-    "culmen_length_mm": 2,
-    "culmen_depth_mm": 3,
-    "body_mass_g": 4,
-    "island": 5,
-    "sex": 6
-}
-numeric_indices = [1, 2, 3, 4]
-# Custom exceptions
-class PenguinError(Exception):
-    """Base class for penguin app errors."""
-    pass
 
-class ColumnNotFoundError(PenguinError):
-    pass
+# The column schema, errors, filter expression parser and statistics are shared with Iter_1
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import penguin_filter
+from penguin_filter import (
+    headers, numeric_indices, PenguinError, ColumnNotFoundError, MissingArgumentError,
+    InvalidNumberError, NotNumericColumnError, InvalidOrderError, InvalidOptionError,
+    FileMissingError, PlotError, FilterSyntaxError, FILTER_OPERATORS, FILTER_KEYWORDS,
+    tokenize_filter, FilterAll, FilterAny, FilterNot,
+)
+from penguin_stats import DESCRIBE_QUANTILES, TDigest, NumericStats, MultivariateStats, sample_gaussian
 
-class MissingArgumentError(PenguinError):
-    pass
+NULL_VALUES = ('', 'NA')  # cells read as missing values
+CACHE_SUFFIX = '.pcache'  # sidecar cache file written next to a loaded CSV
+CACHE_MAGIC = b'PENGCOL1'
+CACHE_HEADER = struct.Struct('<8sqqq')  # magic, CSV size, CSV mtime (ns), rows
+CACHE_COLUMN = struct.Struct('<qqqq')  # data, null bitmap and dictionary offsets, dictionary length
+STREAM_UNSUPPORTED = "This command needs the whole file in memory; please load it instead of streaming it."
 
-class InvalidNumberError(PenguinError):
-    pass
+BACKENDS = ('python', 'numpy')
+backend = 'numpy' if np is not None else 'python'
 
-class NotNumericColumnError(PenguinError):
-    pass
 
-class InvalidOrderError(PenguinError):
-    pass
+def set_backend(name):
+    """Choose how filter, describe, unique, hist and take compute and return the previous choice.
 
-class InvalidOptionError(PenguinError):
-    pass
+    'numpy' runs them as array operations (NumPy must be installed), 'python' as
+    plain loops; both give the same results. Raises InvalidOptionError otherwise.
+    """
+    global backend
+    if name not in BACKENDS:
+        raise InvalidOptionError("Unknown backend. Please use 'python' or 'numpy'.")
+    if name == 'numpy' and np is None:
+        raise InvalidOptionError("NumPy is not installed; only the 'python' backend is available.")
+    previous, backend = backend, name
+    return previous
+
+
+def _format_number(value):
+    """Return the CSV text of a parsed numeric cell ('NA' for a missing value)."""
+    if value != value:
+        return 'NA'
+    if value.is_integer() and abs(value) < 1e16:
+        return str(int(value))
+    return repr(value)
 
-class FileMissingError(PenguinError):
-    pass
+class PenguinDataset:
+    """Penguin rows stored column by column, each column parsed once.
 
-class PlotError(PenguinError):
-    pass
+    Numeric columns (`numeric_indices`) are float arrays, missing values being
+    NaN; the other columns are dictionary-encoded: an array of integer codes
+    into a list of categories kept in order of first appearance. Every column
+    has a null bitmap (bit set = missing value, see NULL_VALUES).
 
-def merge(left,right,attribute_index, reverse=False):
-    """Merge two sorted lists into one sorted list by the given attribute index.
+    The dataset also behaves like the list of rows the commands used to take:
+    len(), indexing and iteration give rows of CSV text, slicing gives a
+    dataset, and append()/extend() parse new rows. Datasets made by take() or
+    slicing share their categories with their source.
 
-    Handles numeric and non-numeric attributes and respects the `reverse` flag.
-    Returns a new merged list without modifying the contract of the callers.
+    A dataset can hold only some of the columns (`columns`); it then only serves
+    the commands on those columns, which is how a list of rows is read by a
+    single command (see as_dataset).
+
+    Numeric columns get a sorted index (see sorted_index) the first time a range
+    filter reads them, unless the dataset is `indexable=False`: a dataset made
+    for a single command would not live long enough to repay building it.
     """
-    if len(left) == 0:
-        return right
-    if len(right) == 0:
-        return left
 
-    merged = []
-    while left and right:
-        if attribute_index in numeric_indices:
-            val_left = float(left[0][attribute_index])
-            val_right = float(right[0][attribute_index])
-            if (not reverse and float(val_left) <= float(val_right)) or (reverse and float(val_left) >= float(val_right)):
-                merged.append(left.pop(0))
+    def __init__(self, rows=(), columns=None, indexable=True):
+        if columns is None:
+            columns = headers.values()
+        self._size = 0
+        self._numeric = {index: array('d') for index in columns if index in numeric_indices}
+        self._codes = {index: array('I') for index in columns if index not in numeric_indices}
+        self._categories = {index: [] for index in self._codes}
+        self._category_codes = {index: {} for index in self._codes}
+        self._nulls = {index: bytearray() for index in columns}
+        self._mapped = False
+        self._indexes = {}
+        self.indexable = indexable
+        self.extend(rows)
+
+    @classmethod
+    def from_csv(cls, filename):
+        """Read a penguin CSV file (with a header row) into a dataset."""
+        dataset = cls()
+        with open(filename, 'r', newline='') as file:
+            reader = csv.reader(file)
+            next(reader, None)  # Skip header
+            dataset.extend(reader)
+        return dataset
+
+    def __len__(self):
+        return self._size
+
+    def append(self, row):
+        """Parse one row (CSV text or numbers) and add it to every column; NaN is a missing value."""
+        if self._mapped:
+            self._detach()
+        position = self._size
+        if position % 8 == 0:
+            for nulls in self._nulls.values():
+                nulls.append(0)
+        bit = 1 << (position % 8)
+        byte = position // 8
+        for index, column in self._numeric.items():
+            cell = row[index]
+            try:
+                value = float(cell)
+            except (TypeError, ValueError):
+                value = float('nan')
+            column.append(value)
+            if value != value:  # a NaN number is a missing value too
+                self._nulls[index][byte] |= bit
+        for index, codes in self._codes.items():
+            cell = row[index]
+            known = self._category_codes[index]
+            code = known.get(cell)
+            if code is None:
+                code = known[cell] = len(self._categories[index])
+                self._categories[index].append(cell)
+            codes.append(code)
+            if cell in NULL_VALUES:
+                self._nulls[index][byte] |= bit
+        self._size = position + 1
+
+    def extend(self, rows):
+        """Append every row of an iterable."""
+        for row in rows:
+            self.append(row)
+
+    def extend_columns(self, numeric, codes):
+        """Append rows given column by column, without parsing any text.
+
+        `numeric` maps every numeric column to its new floats (NaN for missing
+        values) and `codes` every other column to codes of its existing
+        categories, as lists or NumPy arrays of the same length. Only the missing
+        values are visited one by one, to set their null bits.
+        """
+        if self._mapped:
+            self._detach()
+        start = self._size
+        count = len(next(iter(numeric.values() if numeric else codes.values())))
+        for nulls in self._nulls.values():
+            nulls.extend(bytes((start + count + 7) // 8 - len(nulls)))
+        for index, column in self._numeric.items():
+            values = numeric[index]
+            if np is not None and isinstance(values, np.ndarray):
+                column.frombytes(values.astype(np.float64).tobytes())
+                missing = np.flatnonzero(np.isnan(values)).tolist()
+            else:
+                column.extend(values)
+                missing = [position for position, value in enumerate(values) if value != value]
+            self._set_nulls(index, start, missing)
+        for index, column in self._codes.items():
+            values = codes[index]
+            null_codes = {code for code, category in enumerate(self._categories[index]) if category in NULL_VALUES}
+            if np is not None and isinstance(values, np.ndarray):
+                column.frombytes(values.astype(np.uintc).tobytes())
+                missing = np.flatnonzero(np.isin(values, list(null_codes))).tolist()
+            else:
+                column.extend(values)
+                missing = [position for position, code in enumerate(values) if code in null_codes]
+            self._set_nulls(index, start, missing)
+        self._size = start + count
+
+    def _set_nulls(self, col_index, start, positions):
+        """Set the null bits of the rows at `start` + each of `positions`."""
+        nulls = self._nulls[col_index]
+        for position in positions:
+            position += start
+            nulls[position // 8] |= 1 << (position % 8)
+
+    def _detach(self):
+        """Copy the columns of a dataset read from a cache file into memory, so they can grow."""
+        self._numeric = {index: array('d', column) for index, column in self._numeric.items()}
+        self._codes = {index: array('I', codes) for index, codes in self._codes.items()}
+        self._nulls = {index: bytearray(nulls) for index, nulls in self._nulls.items()}
+        self._mapped = False
+
+    def take(self, positions):
+        """Return a new dataset holding the rows at `positions`, in that order."""
+        subset = PenguinDataset(columns=self._nulls.keys())
+        subset._size = len(positions)
+        subset._categories = self._categories
+        subset._category_codes = self._category_codes
+        if backend == 'numpy' and len(positions):
+            index = np.asarray(positions, dtype=np.intp)
+            for column in self._numeric:
+                subset._numeric[column] = array('d', self.numeric_array(column)[index].tobytes())
+            for column in self._codes:
+                subset._codes[column] = array('I', self.code_array(column)[index].tobytes())
+            for column, nulls in self._nulls.items():
+                bits = np.unpackbits(np.frombuffer(nulls, dtype=np.uint8), bitorder='little')[index]
+                subset._nulls[column] = bytearray(np.packbits(bits, bitorder='little').tobytes())
+            return subset
+        for index, column in self._numeric.items():
+            subset._numeric[index] = array('d', [column[position] for position in positions])
+        for index, codes in self._codes.items():
+            subset._codes[index] = array('I', [codes[position] for position in positions])
+        for index, nulls in self._nulls.items():
+            taken = bytearray((len(positions) + 7) // 8)
+            if any(nulls):
+                for new, position in enumerate(positions):
+                    if nulls[position >> 3] >> (position & 7) & 1:
+                        taken[new >> 3] |= 1 << (new & 7)
+            subset._nulls[index] = taken
+        return subset
+
+    def is_null(self, col_index, position):
+        """Return True if the cell of a row in a column is a missing value."""
+        return bool(self._nulls[col_index][position >> 3] >> (position & 7) & 1)
+
+    def null_count(self, col_index):
+        """Return the number of missing values of a column."""
+        return int.from_bytes(self._nulls[col_index], 'little').bit_count()
+
+    def numeric(self, col_index):
+        """Return the float array of a numeric column (NaN for missing values)."""
+        return self._numeric[col_index]
+
+    def codes(self, col_index):
+        """Return the integer code array of a categorical column."""
+        return self._codes[col_index]
+
+    def sorted_index(self, col_index):
+        """Return (values, positions): the non-missing values of a numeric column in ascending order and their rows.
+
+        The index is built on first use. Rows appended since the last call are
+        sorted on their own and merged into it, instead of sorting every row again.
+
+        Time complexity: O(n log n) to build, O(n + m log m) to merge m new rows.
+        """
+        values, positions, indexed = self._indexes.get(col_index, (array('d'), array('q'), 0))
+        if indexed < self._size:
+            column = self._numeric[col_index]
+            if backend == 'numpy':
+                column_values = self.numeric_array(col_index)
+                new = np.arange(indexed, self._size, dtype=np.int64)
+                new = new[~np.isnan(column_values[indexed:])]
+                new = new[np.argsort(column_values[new], kind='stable')]
+                old_values = np.array(values, dtype=np.float64)
+                at = np.searchsorted(old_values, column_values[new], side='right')
+                values = array('d', np.insert(old_values, at, column_values[new]).tobytes())
+                positions = array('q', np.insert(np.array(positions, dtype=np.int64), at, new).tobytes())
             else:
-                merged.append(right.pop(0))
+                new = sorted((position for position in range(indexed, self._size) if column[position] == column[position]),
+                             key=column.__getitem__)
+                merged = heapq.merge(zip(values, positions), ((column[position], position) for position in new))
+                values, positions = array('d'), array('q')
+                for value, position in merged:
+                    values.append(value)
+                    positions.append(position)
+            self._indexes[col_index] = (values, positions, self._size)
+        return values, positions
+
+    def has_index(self, col_index):
+        """Return True if the sorted index of a numeric column has been built."""
+        return col_index in self._indexes
+
+    def index_range(self, col_index, low=None, high=None, include_low=True, include_high=True):
+        """Return (start, stop) such that sorted_index(col_index) values[start:stop] lie between low and high.
+
+        A bound of None is open. Time complexity: O(log n) by binary search.
+        """
+        values, _ = self.sorted_index(col_index)
+        if low is None:
+            start = 0
+        else:
+            start = bisect_left(values, low) if include_low else bisect_right(values, low)
+        if high is None:
+            stop = len(values)
         else:
-            if (not reverse and left[0][attribute_index] <= right[0][attribute_index]) or (reverse and left[0][attribute_index] >= right[0][attribute_index]):
-                merged.append(left.pop(0))
+            stop = bisect_right(values, high) if include_high else bisect_left(values, high)
+        return start, max(start, stop)
+
+    def numeric_array(self, col_index):
+        """Return a NumPy float64 view of a numeric column, without copying it.
+
+        The view must not outlive the call using it: the column cannot grow
+        while a view of it exists.
+        """
+        return np.frombuffer(self._numeric[col_index], dtype=np.float64)
+
+    def code_array(self, col_index):
+        """Return a NumPy view of the codes of a categorical column, without copying them."""
+        return np.frombuffer(self._codes[col_index], dtype=np.uintc)
+
+    def categories(self, col_index):
+        """Return the categories of a categorical column, indexed by code."""
+        return self._categories[col_index]
+
+    def column(self, col_index):
+        """Return the CSV text of every cell of a column."""
+        if col_index in self._numeric:
+            return [_format_number(value) for value in self._numeric[col_index]]
+        categories = self._categories[col_index]
+        return [categories[code] for code in self._codes[col_index]]
+
+    def row(self, position):
+        """Return one row as a list of CSV text."""
+        cells = []
+        for index in range(len(headers)):
+            if index in self._numeric:
+                cells.append(_format_number(self._numeric[index][position]))
             else:
-                merged.append(right.pop(0))
-    return merged + left + right
-            
-def merge_sort(data, attribute_index, reverse=False):
-    """Sort `data` using merge sort by the field at `attribute_index`.
+                cells.append(self._categories[index][self._codes[index][position]])
+        return cells
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return self.take(range(*item.indices(self._size)))
+        if item < 0:
+            item += self._size
+        if not 0 <= item < self._size:
+            raise IndexError("dataset index out of range")
+        return self.row(item)
+
+    def __repr__(self):
+        return f"PenguinDataset({self._size} rows)"
+
+    def __iter__(self):
+        columns = [self.column(index) for index in range(len(headers))]
+        return (list(cells) for cells in zip(*columns))
 
-    `reverse` controls ascending/descending order. Returns a new sorted list.
+class PenguinStream:
+    """A penguin CSV file read in chunks of `chunk_size` rows, never held in memory whole.
+
+    Every iteration re-reads the file from the start. `progress`, if given, is
+    called as progress(bytes_read, file_size) after each chunk is read. describe,
+    unique, hist and filter (to an output file) run in one pass over a stream.
     """
-    if len(data) <= 1:
+
+    def __init__(self, filename, chunk_size=100_000, progress=None):
+        if not os.path.isfile(filename):
+            raise FileMissingError(f"File '{filename}' does not exist.")
+        if chunk_size < 1:
+            raise InvalidNumberError("Chunk size must be a positive integer.")
+        self.filename = filename
+        self.chunk_size = chunk_size
+        self.progress = progress
+
+    def chunks(self):
+        """Yield the rows of the file (without the header) as lists of at most chunk_size rows of CSV text."""
+        size = os.path.getsize(self.filename)
+        read = 0
+        with open(self.filename, 'rb') as file:
+            def lines():
+                nonlocal read
+                for line in file:
+                    read += len(line)
+                    yield line.decode('utf-8')
+            reader = csv.reader(lines())
+            next(reader, None)  # Skip header
+            chunk = list(islice(reader, self.chunk_size))
+            while chunk:
+                if self.progress is not None:
+                    self.progress(read, size)
+                yield chunk
+                chunk = list(islice(reader, self.chunk_size))
+
+    def batches(self, columns=None):
+        """Yield every chunk of the file as a PenguinDataset of its `columns` (all by default)."""
+        for chunk in self.chunks():
+            yield PenguinDataset(chunk, columns, indexable=False)
+
+def cache_path(filename):
+    """Return the path of the cache file of a CSV file."""
+    return filename + CACHE_SUFFIX
+
+def write_cache(filename, dataset, csv_stat=None):
+    """Write the columns of `dataset`, loaded from the CSV `filename`, to its cache file.
+
+    The file holds a header with the CSV's size and modification time, then a
+    directory of the columns and, 8-byte aligned, every column's values, its
+    null bitmap and, for categorical columns, its categories as JSON. It is
+    written to a temporary file first, so a reader never sees a partial cache.
+    `csv_stat` is the os.stat() of the CSV taken before it was read.
+    """
+    if sys.byteorder != 'little':
+        return
+    csv_stat = csv_stat or os.stat(filename)
+    sections = []
+    directory = []
+    offset = CACHE_HEADER.size + CACHE_COLUMN.size * len(headers)
+
+    def place(data):
+        nonlocal offset
+        start = offset
+        sections.append(data + bytes(-len(data) % 8))
+        offset += len(sections[-1])
+        return start
+
+    for index in range(len(headers)):
+        if index in numeric_indices:
+            values = dataset.numeric(index).tobytes()
+            dictionary = b''
+        else:
+            values = dataset.codes(index).tobytes()
+            dictionary = json.dumps(dataset.categories(index)).encode('utf-8')
+        data_offset = place(values)
+        nulls_offset = place(bytes(dataset._nulls[index]))
+        dictionary_offset = place(dictionary)
+        directory.append(CACHE_COLUMN.pack(data_offset, nulls_offset, dictionary_offset, len(dictionary)))
+
+    path = cache_path(filename)
+    with open(path + '.tmp', 'wb') as file:
+        file.write(CACHE_HEADER.pack(CACHE_MAGIC, csv_stat.st_size, csv_stat.st_mtime_ns, len(dataset)))
+        file.writelines(directory)
+        file.writelines(sections)
+    os.replace(path + '.tmp', path)
+
+def read_cache(filename):
+    """Return the dataset of a CSV file from its cache file, or None if there is no valid cache.
+
+    The cache file is memory-mapped and the columns are views of it, so only the
+    columns a command reads are paged in. A cache is valid only while the CSV
+    keeps the size and modification time recorded in it.
+    """
+    path = cache_path(filename)
+    if sys.byteorder != 'little' or not os.path.isfile(path) or not os.path.isfile(filename):
+        return None
+    csv_stat = os.stat(filename)
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size < CACHE_HEADER.size:
+            return None
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, csv_size, csv_mtime_ns, rows = CACHE_HEADER.unpack_from(buffer)
+    if magic != CACHE_MAGIC or (csv_size, csv_mtime_ns) != (csv_stat.st_size, csv_stat.st_mtime_ns):
+        buffer.close()
+        return None
+    view = memoryview(buffer)
+    dataset = PenguinDataset()
+    null_bytes = (rows + 7) // 8
+    try:
+        for index in range(len(headers)):
+            data_offset, nulls_offset, dictionary_offset, dictionary_length = CACHE_COLUMN.unpack_from(
+                buffer, CACHE_HEADER.size + CACHE_COLUMN.size * index)
+            if index in numeric_indices:
+                dataset._numeric[index] = view[data_offset:data_offset + 8 * rows].cast('d')
+            else:
+                dataset._codes[index] = view[data_offset:data_offset + 4 * rows].cast('I')
+                categories = json.loads(bytes(view[dictionary_offset:dictionary_offset + dictionary_length]))
+                dataset._categories[index] = categories
+                dataset._category_codes[index] = {category: code for code, category in enumerate(categories)}
+            dataset._nulls[index] = view[nulls_offset:nulls_offset + null_bytes]
+            if len(dataset._nulls[index]) != null_bytes:
+                raise ValueError("truncated cache file")
+    except (ValueError, TypeError, struct.error):
+        return None
+    dataset._size = rows
+    dataset._mapped = True
+    return dataset
+
+def as_dataset(data, columns=None):
+    """Return `data` as a PenguinDataset, parsing it if it is a list of rows.
+
+    Only the `columns` (all by default) of a list of rows are parsed. Raises
+    InvalidOptionError for a PenguinStream, which the command cannot read in one pass.
+    """
+    if isinstance(data, PenguinDataset):
         return data
+    if isinstance(data, PenguinStream):
+        raise InvalidOptionError(STREAM_UNSUPPORTED)
+    return PenguinDataset(data, columns, indexable=False)
+
+def _select(data, positions):
+    """Return the rows of `data` at `positions`, as a dataset or as a list like `data`."""
+    if isinstance(data, PenguinDataset):
+        return data.take(positions)
+    return [data[position] for position in positions]
+
+SORT_ALGORITHMS = ('merge', 'timsort', 'radix')
+RADIX_BITS = 11  # bits per LSD radix digit, 2048 buckets per pass
+
+
+def sort_keys(dataset, attribute_index):
+    """Return the sort key of every row of a PenguinDataset, aligned with its rows.
+
+    Numeric columns give their floats, missing values sorting as the largest.
+    Other columns give the rank of each row's category, so the keys compare as
+    integers and the categories are compared only once.
+    """
+    if attribute_index in numeric_indices:
+        largest = float('inf')
+        return [largest if value != value else value for value in dataset.numeric(attribute_index)]
+    categories = dataset.categories(attribute_index)
+    rank = [0] * len(categories)
+    for position, code in enumerate(sorted(range(len(categories)), key=categories.__getitem__)):
+        rank[code] = position
+    return [rank[code] for code in dataset.codes(attribute_index)]
+
+def merge(order, keys, lo, mid, hi, out, reverse=False):
+    """Merge the sorted runs order[lo:mid] and order[mid:hi] into out[lo:hi].
+
+    `order` holds row positions and `keys` their extracted keys. A row of the
+    right run only goes first when its key is strictly smaller (larger when
+    `reverse`), so equal keys keep their order and the merge is stable.
+
+    Time complexity: O(hi - lo), as the runs are walked by index.
+    """
+    i, j, k = lo, mid, lo
+    while i < mid and j < hi:
+        left, right = order[i], order[j]
+        if (keys[left] < keys[right]) if reverse else (keys[right] < keys[left]):
+            out[k] = right
+            j += 1
+        else:
+            out[k] = left
+            i += 1
+        k += 1
+    out[k:k + mid - i] = order[i:mid]
+    out[k + mid - i:hi] = order[j:hi]
+
+def merge_sort(order, keys, reverse=False):
+    """Stable bottom-up merge sort of the row positions in `order` by `keys`.
+
+    Returns a new list of positions; `order` is not modified.
+
+    Time complexity: O(n log n). Space complexity: O(n) for one buffer.
+    """
+    source = list(order)
+    target = [0] * len(source)
+    width = 1
+    while width < len(source):
+        for lo in range(0, len(source), 2 * width):
+            mid = min(lo + width, len(source))
+            hi = min(lo + 2 * width, len(source))
+            merge(source, keys, lo, mid, hi, target, reverse)
+        source, target = target, source
+        width *= 2
+    return source
+
+def timsort(order, keys, reverse=False):
+    """Stable sort of the row positions in `order` by `keys` with Python's built-in timsort.
+
+    Time complexity: O(n log n), O(n) on data that is already (reverse) sorted.
+    """
+    return sorted(order, key=keys.__getitem__, reverse=reverse)
+
+def _radix_codes(keys, attribute_index):
+    """Map sort keys to non-negative integers that sort in the same order.
+
+    Floats are mapped through their IEEE 754 bits; the keys of text columns
+    already are category ranks.
+    """
+    if attribute_index not in numeric_indices:
+        return keys
+    codes = []
+    for key in keys:
+        bits = struct.unpack('>Q', struct.pack('>d', key + 0.0))[0]
+        codes.append(bits ^ 0xFFFFFFFFFFFFFFFF if bits >> 63 else bits | 0x8000000000000000)
+    return codes
+
+def radix_sort(order, codes, reverse=False):
+    """Stable LSD radix sort of the row positions in `order` by non-negative integer `codes`.
+
+    Only the RADIX_BITS-bit digits needed to tell the smallest and largest code
+    apart are distributed; descending order sorts the complemented codes.
+
+    Time complexity: O(d * (n + 2 ** RADIX_BITS)) for d distributed digits.
+    """
+    if not order:
+        return list(order)
+    if reverse:
+        top = max(codes)
+        codes = [top - code for code in codes]
+    low = min(codes)
+    width = (max(codes) - low).bit_length()
+    mask = (1 << RADIX_BITS) - 1
+    order = list(order)
+    for shift in range(0, width, RADIX_BITS):
+        buckets = [[] for _ in range(1 << RADIX_BITS)]
+        for position in order:
+            buckets[((codes[position] - low) >> shift) & mask].append(position)
+        order = [position for bucket in buckets for position in bucket]
+    return order
+
+def parse_sort_command(command_list):
+    """Return ([(attribute_index, reverse), ...], algorithm) for a sort command.
+
+    Accepts 'sort <column> <asc|desc> [<column> <asc|desc> ...] [merge|timsort|radix]',
+    the first column being the primary key. Raises PenguinError subclasses for
+    invalid input.
+    """
+    tokens = list(command_list[1:])
+    algorithm = 'merge'
+    if tokens and tokens[-1] in SORT_ALGORITHMS:
+        algorithm = tokens.pop()
+    if not tokens:
+        raise MissingArgumentError("Please provide a column and order to sort by (e.g., 'sort body_mass_g asc')")
+    columns = []
+    for i in range(0, len(tokens), 2):
+        if tokens[i] not in headers:
+            raise ColumnNotFoundError("That column does not exist. Try again.")
+        if i + 1 >= len(tokens) or tokens[i + 1] not in ('asc', 'desc'):
+            raise InvalidOrderError("Please specify 'asc' or 'desc' for sorting order.")
+        columns.append((headers[tokens[i]], tokens[i + 1] == 'desc'))
+    return columns, algorithm
+
+class FilterClause(penguin_filter.FilterClause):
+    """A comparison of one column of a PenguinDataset with constant values.
+
+    Numeric columns are compared through a predicate on floats (or a NumPy
+    mask), categorical columns through the set of matching category codes, so
+    the categories are compared once instead of every row.
+    """
+
+    def _mask(self, values):
+        """Return the NumPy mask of the float array `values` for a numeric comparison."""
+        operator, numbers = self.operator, [float(value) for value in self.values]
+        if operator == '==':
+            return values == numbers[0]
+        if operator == '!=':
+            return (values != numbers[0]) & ~np.isnan(values)
+        if operator == '>':
+            return values > numbers[0]
+        if operator == '>=':
+            return values >= numbers[0]
+        if operator == '<':
+            return values < numbers[0]
+        if operator == '<=':
+            return values <= numbers[0]
+        if operator == 'between':
+            return (values >= min(numbers)) & (values <= max(numbers))
+        return np.isin(values, numbers)
+
+    def _ranges(self):
+        """Return the value ranges of a numeric clause as (low, high, include_low, include_high), or None.
 
-    mid = len(data) // 2
-    left = merge_sort(data[:mid], attribute_index, reverse)
-    right = merge_sort(data[mid:], attribute_index, reverse)
+        None means the clause cannot be answered from a sorted index ('!=').
+        """
+        numbers = [float(value) for value in self.values]
+        return {
+            '==': [(numbers[0], numbers[0], True, True)],
+            '>': [(numbers[0], None, False, True)],
+            '>=': [(numbers[0], None, True, True)],
+            '<': [(None, numbers[0], True, False)],
+            '<=': [(None, numbers[0], True, True)],
+            'between': [(min(numbers), max(numbers), True, True)],
+            'in': [(number, number, True, True) for number in sorted(set(numbers))],
+        }.get(self.operator)
 
-    return merge(left, right, attribute_index, reverse)
+    def _uses_index(self, dataset):
+        """Return True if the clause is answered from the sorted index of its column."""
+        return self.col_index in numeric_indices and dataset.indexable and self._ranges() is not None
+
+    def estimate(self, dataset):
+        """Estimate the fraction of rows matching, to evaluate the most selective clauses first.
+
+        A numeric clause whose column is already indexed is counted exactly, by binary search.
+        """
+        if self.col_index not in numeric_indices:
+            categories = dataset.categories(self.col_index)
+            return sum(1 for category in categories if self._test(category)) / len(categories) if categories else 0.0
+        if self._uses_index(dataset) and dataset.has_index(self.col_index) and len(dataset):
+            matches = 0
+            for bounds in self._ranges():
+                start, stop = dataset.index_range(self.col_index, *bounds)
+                matches += stop - start
+            return matches / len(dataset)
+        return {'==': 0.05, 'in': 0.05 * len(self.values), 'between': 0.25, '!=': 0.95}.get(self.operator, 0.5)
+
+    def evaluate(self, dataset, positions=None):
+        """Return the positions, among `positions` (all rows by default), of the rows matching.
+
+        Over all the rows of an indexable dataset, a numeric range is found by
+        binary search in the sorted index of the column, in O(log n + k log k)
+        for k matching rows (returned in row order), instead of reading every row.
+        """
+        test = self._test
+        if positions is None and self._uses_index(dataset):
+            _, index_positions = dataset.sorted_index(self.col_index)
+            matches = []
+            for bounds in self._ranges():
+                start, stop = dataset.index_range(self.col_index, *bounds)
+                matches += index_positions[start:stop]
+            return sorted(matches)
+        if self.col_index in numeric_indices:
+            if backend == 'numpy':
+                values = dataset.numeric_array(self.col_index)
+                if positions is None:
+                    return np.flatnonzero(self._mask(values)).tolist()
+                candidates = np.asarray(positions, dtype=np.intp)
+                return candidates[self._mask(values[candidates])].tolist()
+            column = dataset.numeric(self.col_index)
+            if positions is None:
+                return [position for position, value in enumerate(column) if test(value)]
+            return [position for position in positions if test(column[position])]
+        matching = {code for code, category in enumerate(dataset.categories(self.col_index)) if test(category)}
+        if backend == 'numpy':
+            codes = dataset.code_array(self.col_index)
+            if positions is None:
+                return np.flatnonzero(np.isin(codes, list(matching))).tolist()
+            candidates = np.asarray(positions, dtype=np.intp)
+            return candidates[np.isin(codes[candidates], list(matching))].tolist()
+        codes = dataset.codes(self.col_index)
+        if positions is None:
+            return [position for position, code in enumerate(codes) if code in matching]
+        return [position for position in positions if codes[position] in matching]
+
+@lru_cache(maxsize=64)
+def compile_filter(expression):
+    """Parse a filter expression once into a tree of FilterAll/FilterAny/FilterNot/FilterClause.
+
+    See penguin_filter.parse_filter for the grammar. The result has
+    evaluate(dataset) returning the positions of the matching rows, and
+    columns() giving the columns it reads. Raises PenguinError subclasses for
+    invalid expressions.
+    """
+    return penguin_filter.parse_filter(expression, FilterClause)
 
 def print_data(command_list, data):
     """Return a list of CSV filenames in the current directory.
@@ -98,57 +744,126 @@ def print_data(command_list, data):
             files.append(file)
     return files
 
-def load_file_content(filename):
-    """Reads the CSV and returns the list of rows."""
-    new_data = []
-    with open(filename, 'r') as file:
-        reader = csv.reader(file)
-        next(reader) # Skip header
-        for row in reader:
-            new_data.append(row)
-    return new_data
+def load_file_content(filename, use_cache=True):
+    """Reads the CSV and returns its rows as a PenguinDataset, every column parsed once.
+
+    With `use_cache`, the dataset is read from the CSV's cache file (see
+    read_cache) when it is up to date; otherwise the CSV is parsed and the cache
+    file is written for the next load.
+    """
+    if use_cache:
+        dataset = read_cache(filename)
+        if dataset is not None:
+            return dataset
+    csv_stat = os.stat(filename)
+    dataset = PenguinDataset.from_csv(filename)
+    if use_cache:
+        try:
+            write_cache(filename, dataset, csv_stat)
+        except OSError:
+            pass  # e.g. a read-only folder: the next load parses the CSV again
+    return dataset
+
+def _column_stats(dataset, col_index):
+    """Return the NumericStats of a numeric column of a dataset."""
+    stats = NumericStats()
+    if backend == 'numpy':
+        stats.update_array(dataset.numeric_array(col_index))
+    else:
+        stats.update(dataset.numeric(col_index))
+    return stats
+
+def _value_counts(dataset, col_index):
+    """Return a dict of value -> count of the non-missing values of a numeric column."""
+    if backend == 'numpy':
+        column = dataset.numeric_array(col_index)
+        values, value_counts = np.unique(column[~np.isnan(column)], return_counts=True)
+        return dict(zip(values.tolist(), value_counts.tolist()))
+    counts = {}
+    for value in dataset.numeric(col_index):
+        if value == value:
+            counts[value] = counts.get(value, 0) + 1
+    return counts
+
+def parse_filter_command(command_list):
+    """Return (compiled_filter, output_file) for a filter command.
+
+    The simple form ['filter', '<column>', '<value>'] keeps numeric values greater
+    than the number and text containing the value. Anything else is a filter
+    expression (see compile_filter), given as one or several items, e.g.
+    ['filter', 'body_mass_g', 'between', '3500', '4500'] or
+    ['filter', 'island in (Dream, Biscoe) and not sex == MALE']. A trailing
+    'into <file.csv>' names the output file of a streamed filter (None otherwise).
+    """
+    tokens = list(command_list[1:])
+    output = None
+    if len(tokens) >= 2 and tokens[-2] == 'into':
+        output = tokens[-1]
+        tokens = tokens[:-2]
+    if not tokens:
+        raise MissingArgumentError("Please provide a column and value to filter by (e.g., 'filter species Adelie')")
+    first_word = tokens[1].split()[0].lower() if len(tokens) == 2 and tokens[1].split() else ''
+    if len(tokens) == 2 and tokens[0] in headers and first_word not in FILTER_KEYWORDS \
+            and not first_word.startswith(FILTER_OPERATORS):
+        operator = '>' if headers[tokens[0]] in numeric_indices else 'contains'
+        return FilterClause(tokens[0], operator, [tokens[1]]), output
+    if len(tokens) == 1 and tokens[0] in headers:
+        raise MissingArgumentError("Please provide a column and value to filter by (e.g., 'filter species Adelie')")
+    return compile_filter(' '.join(tokens)), output
 
 def filter_data(command_list, data):
     """Return rows from `data` matching the filter specified in `command_list`.
 
-    Expects `command_list` like: ['filter', '<column>', '<value>'] and returns a list
-    of matching rows. Raises custom PenguinError subclasses for invalid input.
+    Expects `command_list` like: ['filter', '<column>', '<value>'] or a filter
+    expression (see parse_filter_command) and returns the matching rows, as a
+    dataset for a PenguinDataset and as a list for a list of rows. The simple
+    form keeps numeric values greater than the given number; missing values
+    never match. Raises custom PenguinError subclasses for invalid input.
 
-    Time complexity: O(n) where n is the number of rows (substring checks may
-    add additional cost proportional to field lengths).
+    A PenguinStream is filtered chunk by chunk to the output file given as
+    ['filter', ..., 'into', '<output.csv>']; the matching rows are written there
+    and their number is returned. The output replaces the file only once every
+    row was read, so it may be the streamed file itself.
+
+    Time complexity: O(n) for the first clause evaluated, then O(k) per clause for
+    the k rows still matching; text comparisons are made once per category, not
+    once per row.
     Space complexity: O(k) where k is the number of matching rows (worst-case O(n)).
     """
-    # Validate arguments
-    if len(command_list) < 3:
-        raise MissingArgumentError("Please provide a column and value to filter by (e.g., 'filter species Adelie')")
-    if command_list[1] not in headers:
-        raise ColumnNotFoundError("That column does not exist. Try again.")
-    col_index = headers[command_list[1]]
-    target_value = command_list[2]
-    filtered_data = []
+    tree, output = parse_filter_command(command_list)
+    columns = sorted(tree.columns())
 
-    for row in data:
-        if col_index in numeric_indices:
-            try:
-                if float(row[col_index]) > float(target_value):
-                    filtered_data.append(row)
-            except ValueError:
-                # signal invalid numeric filter to UI
-                raise InvalidNumberError("Please provide a valid number for filtering.")
-        else:
-            if target_value in row[col_index]:
-                filtered_data.append(row)
-    return filtered_data
+    if isinstance(data, PenguinStream):
+        if output is None:
+            raise MissingArgumentError("Please provide an output file for the rows of a streamed file (e.g., 'filter species Adelie into adelie.csv')")
+        # Written to a temporary file first, so filtering a file into itself reads it whole
+        written = 0
+        try:
+            with open(output + '.tmp', 'w', newline='') as file:
+                writer = csv.writer(file)
+                writer.writerow(list(headers))
+                for chunk in data.chunks():
+                    positions = tree.evaluate(PenguinDataset(chunk, columns, indexable=False))
+                    writer.writerows(chunk[position] for position in positions)
+                    written += len(positions)
+        except BaseException:
+            if os.path.exists(output + '.tmp'):
+                os.remove(output + '.tmp')
+            raise
+        os.replace(output + '.tmp', output)
+        return written
+    positions = tree.evaluate(as_dataset(data, columns))
+    return _select(data, positions)
 
-def describe_data(command_list, data):
-    """Return (min, max, average) for a numeric column specified in `command_list`.
+def describe_stats(command_list, data):
+    """Return the NumericStats of a numeric column specified in `command_list`.
 
-    Returns None if no valid numeric values are present. Raises custom exceptions
-    for missing or non-numeric columns.
+    Everything is computed in a single pass over the column, without keeping its
+    values; a PenguinStream is summarized chunk by chunk and the summaries merged.
+    Raises custom exceptions for missing or non-numeric columns.
 
     Time complexity: O(n) where n is the number of rows scanned.
-    Space complexity: O(m) where m is the number of numeric values collected
-    (worst-case O(n)).
+    Space complexity: O(1) besides the column, plus the O(compression) quantile digest.
     """
     if len(command_list) < 2:
         raise MissingArgumentError("Please provide a column to describe (e.g., 'describe body_mass_g')")
@@ -157,23 +872,32 @@ def describe_data(command_list, data):
     col_index = headers[command_list[1]]
     if col_index not in numeric_indices:
         raise NotNumericColumnError("Description is only available for numeric columns.")
-    values = []
-    for row in data:
-        try:
-            values.append(float(row[col_index]))
-        except ValueError:
-            continue
-    if not values:
+    if isinstance(data, PenguinStream):
+        stats = NumericStats()
+        for batch in data.batches([col_index]):
+            stats.merge(_column_stats(batch, col_index))
+        return stats
+    return _column_stats(as_dataset(data, [col_index]), col_index)
+
+def describe_data(command_list, data):
+    """Return (min, max, average) for a numeric column specified in `command_list`.
+
+    Returns None if no valid numeric values are present. Raises custom exceptions
+    for missing or non-numeric columns. See describe_stats for the other statistics.
+
+    Time complexity: O(n) where n is the number of rows scanned.
+    Space complexity: O(1) besides the column.
+    """
+    stats = describe_stats(command_list, data)
+    if not stats.count:
         return None
-    minimum = min(values)
-    maximum = max(values)
-    average = sum(values) / len(values)
-    return minimum, maximum, average
+    return stats.minimum, stats.maximum, stats.mean
 
 def unique_data(command_list, data):
     """Return a dict of value -> count for the specified column.
 
-    Raises a PenguinError subclass if the column is missing.
+    Raises a PenguinError subclass if the column is missing. A PenguinStream is
+    counted in one pass, merging the counts of its chunks.
 
     Time complexity: O(n) where n is the number of rows.
     Space complexity: O(u) where u is the number of unique values (<= n).
@@ -183,38 +907,195 @@ def unique_data(command_list, data):
     if command_list[1] not in headers:
         raise ColumnNotFoundError("That column does not exist. Try again.")
     col_index = headers[command_list[1]]
-    unique_values = {}
-    for row in data:
-        value = row[col_index]
-        unique_values[value] = unique_values.get(value, 0) + 1
-    return unique_values
+    if isinstance(data, PenguinStream):
+        unique_values = {}
+        for batch in data.batches([col_index]):
+            for value, count in unique_data(command_list, batch).items():
+                unique_values[value] = unique_values.get(value, 0) + count
+        return unique_values
+    dataset = as_dataset(data, [col_index])
+    if col_index in numeric_indices:
+        counts = _value_counts(dataset, col_index)
+        unique_values = {_format_number(value): count for value, count in counts.items()}
+        if dataset.null_count(col_index):
+            unique_values['NA'] = dataset.null_count(col_index)
+        return unique_values
+    categories = dataset.categories(col_index)
+    if backend == 'numpy':
+        codes, code_counts = np.unique(dataset.code_array(col_index), return_counts=True)
+        return {categories[code]: count for code, count in zip(codes.tolist(), code_counts.tolist())}
+    counts = [0] * len(categories)
+    for code in dataset.codes(col_index):
+        counts[code] += 1
+    return {category: count for category, count in zip(categories, counts) if count}
 
 def sort_data(command_list, data):
-    """Return (sorted_data, elapsed_seconds) after sorting by the specified column.
+    """Return (sorted_data, elapsed_seconds) after sorting by the specified columns.
+
+    Expects `command_list` like ['sort', 'species', 'asc', 'body_mass_g', 'desc', 'radix'];
+    see parse_sort_command. The keys of every column are extracted once and the
+    row positions are sorted, one stable pass per column from the last column to
+    the first, so rows equal on the first column stay ordered by the next ones.
+    The elapsed time covers parsing a list of rows, key extraction and sorting,
+    to compare algorithms.
 
-    Validates arguments and raises custom exceptions for missing column or invalid order.
+    Time complexity: O(c * n log n) for c columns (merge, timsort).
+    Space complexity: O(c * n) for the keys and the positions.
     """
-    if len(command_list) < 2:
-        raise MissingArgumentError("Please provide a column and order to sort by (e.g., 'sort body_mass_g asc')")
-    if command_list[1] not in headers:
-        raise ColumnNotFoundError("That column does not exist. Try again.")
-    if len(command_list) <= 2 or command_list[2] not in ('asc', 'desc'):
-        raise InvalidOrderError("Please specify 'asc' or 'desc' for sorting order.")
-    col_index = headers[command_list[1]]
-    is_reverse = (command_list[2] == 'desc')
-    start_time = time.time()
-    sorted_data = merge_sort(data, col_index, is_reverse)
-    end_time = time.time()
-    elapsed = end_time - start_time
+    columns, algorithm = parse_sort_command(command_list)
+    start_time = time.perf_counter()
+    dataset = as_dataset(data, [col_index for col_index, _ in columns])
+    order = range(len(dataset))
+    for col_index, is_reverse in reversed(columns):
+        keys = sort_keys(dataset, col_index)
+        if algorithm == 'radix':
+            order = radix_sort(order, _radix_codes(keys, col_index), is_reverse)
+        elif algorithm == 'timsort':
+            order = timsort(order, keys, is_reverse)
+        else:
+            order = merge_sort(order, keys, is_reverse)
+    sorted_data = _select(data, order)
+    elapsed = time.perf_counter() - start_time
     return sorted_data, elapsed
 
+AUGMENT_OPTIONS = ('duplicate', 'create', 'gaussian')
+
+
+def _numpy_rng():
+    """Return a NumPy generator seeded from `random`, so random.seed() also fixes the NumPy draws."""
+    return np.random.default_rng(random.getrandbits(64))
+
+def _uniform_columns(dataset, count):
+    """Draw `count` rows column by column for the 'create' augment option.
+
+    Numeric values are uniform between the column's minimum and maximum, and
+    categories uniform among those present. Returns (numeric, codes) for
+    PenguinDataset.extend_columns.
+    """
+    numeric, codes = {}, {}
+    if backend == 'numpy':
+        rng = _numpy_rng()
+        for index in numeric_indices:
+            column = dataset.numeric_array(index)
+            present = column[~np.isnan(column)]
+            numeric[index] = rng.uniform(present.min(), present.max(), count) if present.size else np.full(count, np.nan)
+        for index in headers.values():
+            if index not in numeric_indices:
+                codes[index] = rng.choice(np.unique(dataset.code_array(index)), count)
+        return numeric, codes
+    draw = random.random
+    for index in numeric_indices:
+        present = [value for value in dataset.numeric(index) if value == value]
+        low, high = min(present, default=math.nan), max(present, default=math.nan)
+        numeric[index] = [low + (high - low) * draw() for _ in range(count)]
+    for index in headers.values():
+        if index not in numeric_indices:
+            codes[index] = random.choices(sorted(set(dataset.codes(index))), k=count)
+    return numeric, codes
+
+def fit_species_model(dataset):
+    """Fit the model of the 'gaussian' augment option, in one pass over the dataset.
+
+    Returns {species code: (rows, MultivariateStats, frequencies)}: per species,
+    its number of rows, the mean and covariance of the numeric columns (over the
+    rows with no missing numeric value) and, for every other categorical column,
+    a Counter of its codes. The rows of each species are picked out of a block
+    of rows with itertools.compress, so the inner loops run in C.
+    """
+    species_index = headers['species']
+    others = [index for index in headers.values() if index not in numeric_indices and index != species_index]
+    species = dataset.codes(species_index)
+    counts = {code: 0 for code in set(species)}
+    fits = {code: MultivariateStats(len(numeric_indices)) for code in counts}
+    frequencies = {code: {index: Counter() for index in others} for code in counts}
+    columns = [dataset.numeric(index) for index in numeric_indices]
+    missing = any(dataset.null_count(index) for index in numeric_indices)
+    for start in range(0, len(dataset), GROUPBY_BLOCK):
+        block_species = species[start:start + GROUPBY_BLOCK]
+        block_others = [dataset.codes(index)[start:start + GROUPBY_BLOCK] for index in others]
+        block_columns = [column[start:start + GROUPBY_BLOCK] for column in columns]
+        complete = [total == total for total in map(sum, zip(*block_columns))] if missing else None
+        for code in counts:
+            rows = list(map(code.__eq__, block_species))
+            counts[code] += sum(rows)
+            for index, block_codes in zip(others, block_others):
+                frequencies[code][index].update(compress(block_codes, rows))
+            if backend != 'numpy':
+                if complete is not None:
+                    rows = [row and ok for row, ok in zip(rows, complete)]
+                fits[code].update([list(compress(column, rows)) for column in block_columns])
+    if backend == 'numpy':
+        species_array = dataset.code_array(species_index)
+        matrix = np.column_stack([dataset.numeric_array(index) for index in numeric_indices])
+        complete = ~np.isnan(matrix).any(axis=1)
+        for code, fit in fits.items():
+            fit.update_array(matrix[complete & (species_array == code)])
+    return {code: (counts[code], fits[code], frequencies[code]) for code in counts}
+
+def _gaussian_columns(dataset, count):
+    """Draw `count` rows for the 'gaussian' augment option (see fit_species_model).
+
+    Species are drawn with their frequencies in the data; each row then gets
+    numeric values from its species' multivariate Gaussian, which keeps the
+    correlations between measurements, and the other categories with their
+    frequencies within the species. Returns (numeric, codes) for
+    PenguinDataset.extend_columns.
+    """
+    model = fit_species_model(dataset)
+    species_index = headers['species']
+    others = [index for index in headers.values() if index not in numeric_indices and index != species_index]
+    species = list(model)
+    weights = [model[code][0] for code in species]
+    if backend == 'numpy':
+        rng = _numpy_rng()
+        drawn = rng.choice(species, size=count, p=np.array(weights) / sum(weights))
+        numeric = {index: np.full(count, np.nan) for index in numeric_indices}
+        codes = {index: np.zeros(count, dtype=np.uintc) for index in others}
+        codes[species_index] = drawn.astype(np.uintc)
+        for code, (_, fit, frequencies) in model.items():
+            where = np.flatnonzero(drawn == code)
+            if fit.count:
+                samples = rng.multivariate_normal(fit.mean, fit.covariance, size=where.size)
+                for i, index in enumerate(numeric_indices):
+                    numeric[index][where] = samples[:, i]
+            for index in others:
+                categories, category_counts = zip(*frequencies[index].items())
+                codes[index][where] = rng.choice(categories, size=where.size,
+                                                 p=np.array(category_counts) / sum(category_counts))
+        return numeric, codes
+    drawn = random.choices(species, weights, k=count)
+    positions = {}
+    for position, code in enumerate(drawn):
+        positions.setdefault(code, []).append(position)
+    numeric = {index: [math.nan] * count for index in numeric_indices}
+    codes = {index: [0] * count for index in others}
+    codes[species_index] = drawn
+    for code, where in positions.items():
+        _, fit, frequencies = model[code]
+        if fit.count:
+            for index, values in zip(numeric_indices, sample_gaussian(fit, len(where))):
+                column = numeric[index]
+                for position, value in zip(where, values):
+                    column[position] = value
+        for index in others:
+            categories, category_counts = zip(*frequencies[index].items())
+            column = codes[index]
+            for position, value in zip(where, random.choices(categories, category_counts, k=len(where))):
+                column[position] = value
+    return numeric, codes
+
 def augment_data(command_list, data):
     """Augment dataset either by duplicating existing rows or creating synthetic ones.
 
+    'create' draws every column independently and uniformly; 'gaussian' draws
+    realistic rows from per-species Gaussians (see fit_species_model). Both
+    draw whole columns at once and append them to a dataset without parsing.
     Returns (data, num_added, action). Raises PenguinError subclasses for invalid input.
     """
     if len(command_list) < 3:
-        raise MissingArgumentError("Please enter one of the following options: duplicate or create")
+        raise MissingArgumentError("Please enter one of the following options: duplicate, create or gaussian")
+    if isinstance(data, PenguinStream):
+        raise InvalidOptionError(STREAM_UNSUPPORTED)
     action = command_list[2]
     try:
         percent = int(command_list[1])
@@ -226,34 +1107,21 @@ def augment_data(command_list, data):
         for _ in range(num_to_add):
             data.append(random.choice(data))
         return data, num_to_add, 'duplicate'
-    elif action == 'create':
-        blueprint = {}
-        for header in range(len(headers)):
-            if header in numeric_indices:
-                blueprint[header] = [float('inf'), float('-inf')]
-            else:
-                blueprint[header] = set()
-        for row in data:
-            for header in range(len(headers)):
-                if header in numeric_indices:
-                    blueprint[header][0] = min(blueprint[header][0], float(row[header]))
-                    blueprint[header][1] = max(blueprint[header][1], float(row[header]))
-                else:
-                    blueprint[header].add(row[header])
-        for _ in range(num_to_add):
-            new_row = []
-            for header in range(len(headers)):
-                if header in numeric_indices:
-                    min_val, max_val = blueprint[header]
-                    new_value = random.uniform(min_val, max_val)
-                    new_row.append(new_value)
-                else:
-                    new_value = random.choice(list(blueprint[header]))
-                    new_row.append(new_value)
-            data.append(new_row)
-        return data, num_to_add, 'create'
+    elif action in ('create', 'gaussian'):
+        if not num_to_add:
+            return data, 0, action
+        dataset = as_dataset(data)
+        sample = _uniform_columns if action == 'create' else _gaussian_columns
+        numeric, codes = sample(dataset, num_to_add)
+        if isinstance(data, PenguinDataset):
+            data.extend_columns(numeric, codes)
+        else:
+            columns = [['NA' if value != value else float(value) for value in numeric[index]] if index in numeric_indices else
+                       [dataset.categories(index)[code] for code in codes[index]] for index in range(len(headers))]
+            data.extend(list(row) for row in zip(*columns))
+        return data, num_to_add, action
     else:
-        raise InvalidOptionError("Unknown augment option. Please use 'duplicate' or 'create'.")
+        raise InvalidOptionError(f"Unknown augment option. Please use {', '.join(AUGMENT_OPTIONS)}.")
 
 def scatter_data(command_list, data):
     """Return two lists (x_values, y_values) prepared for plotting.
@@ -268,22 +1136,52 @@ def scatter_data(command_list, data):
         raise NotNumericColumnError("Both columns must be numeric to create a scatter plot.")
     idx = headers[command_list[1]]
     idy = headers[command_list[2]]
+    dataset = as_dataset(data, [idx, idy])
     x_values = []
     y_values = []
-    for row in data:
-        try:
-            x_val = float(row[idx])
-            y_val = float(row[idy])
+    for x_val, y_val in zip(dataset.numeric(idx), dataset.numeric(idy)):
+        if x_val == x_val and y_val == y_val:
             x_values.append(x_val)
             y_values.append(y_val)
-        except ValueError:
-            continue
     return x_values, y_values
 
+def _histogram(values, bins, weights=None):
+    """Count `values` into `bins` equal-width bins spanning their minimum to maximum.
+
+    Returns (counts, edges) with len(edges) == bins + 1, the last bin including
+    its right edge. Each value counts once, or `weights[i]` times if given. Edges
+    and bin choice follow numpy.histogram exactly, so both backends give the
+    same counts.
+    """
+    first, last = (min(values), max(values)) if values else (0.0, 1.0)
+    if first == last:
+        first, last = first - 0.5, last + 0.5
+    step = (last - first) / bins
+    edges = [i * step + first for i in range(bins)] + [last]
+    norm = bins / (last - first)
+    counts = [0] * bins
+    for value, weight in zip(values, repeat(1) if weights is None else weights):
+        index = int((value - first) * norm)
+        if index == bins:
+            index -= 1
+        if value < edges[index]:
+            index -= 1
+        if index != bins - 1 and value >= edges[index + 1]:
+            index += 1
+        counts[index] += weight
+    return counts, edges
+
 def hist_data(command_list, data):
-    """Return values and bin count for a histogram.
+    """Return (counts, edges) of a histogram, counted without keeping the values.
 
-    Validates the input and raises PenguinError subclasses for invalid arguments.
+    `counts` holds the number of values per bin and `edges` the bin bounds; plot
+    with e.g. plt.hist(edges[:-1], bins=edges, weights=counts). Missing values are
+    skipped. Validates the input and raises PenguinError subclasses for invalid arguments.
+
+    A PenguinStream is read in one pass, counting each distinct value: the bin
+    edges depend on the minimum and maximum, which are only known at the end.
+    Memory grows with the number of distinct values, which stays small for
+    measurements recorded at a fixed precision.
     """
     if len(command_list) < 3:
         raise MissingArgumentError("Please provide two numeric columns to plot (e.g., 'hist flipper_length_mm body_mass_g').")
@@ -291,17 +1189,22 @@ def hist_data(command_list, data):
         raise ColumnNotFoundError("One or both of the specified columns do not exist.")
     if headers[command_list[1]] not in numeric_indices:
         raise NotNumericColumnError("Both columns must be numeric to create a histogram.")
-    if not command_list[2].isdigit():
-        raise InvalidNumberError("Bin count must be an integer.")
-    values = []
-    for row in data:
-        try:
-            val = float(row[headers[command_list[1]]])
-            values.append(val)
-        except ValueError:
-            continue
+    if not command_list[2].isdigit() or int(command_list[2]) < 1:
+        raise InvalidNumberError("Bin count must be a positive integer.")
+    col_index = headers[command_list[1]]
     bins = int(command_list[2])
-    return values, bins
+    if isinstance(data, PenguinStream):
+        counts = {}
+        for batch in data.batches([col_index]):
+            for value, count in _value_counts(batch, col_index).items():
+                counts[value] = counts.get(value, 0) + count
+        return _histogram(list(counts), bins, list(counts.values()))
+    dataset = as_dataset(data, [col_index])
+    if backend == 'numpy':
+        column = dataset.numeric_array(col_index)
+        counts, edges = np.histogram(column[~np.isnan(column)], bins=bins)
+        return counts.tolist(), edges.tolist()
+    return _histogram([value for value in dataset.numeric(col_index) if value == value], bins)
 
 def boxplot_data(command_list, data):
     """Prepare grouped numeric values for a categorical boxplot.
@@ -317,16 +1220,151 @@ def boxplot_data(command_list, data):
         raise ColumnNotFoundError("The specified column does not exist.")
     if headers[command_list[2]] not in numeric_indices:
         raise NotNumericColumnError("The column must be numeric to create a boxplot.")
+    label_index = headers[command_list[1]]
+    value_index = headers[command_list[2]]
+    dataset = as_dataset(data, [label_index, value_index])
     groups = {}
-    for row in data:
-        try:
-            value = float(row[headers[command_list[2]]])
-            label = row[headers[command_list[1]]]
+    for label, value in zip(dataset.column(label_index), dataset.numeric(value_index)):
+        if value == value:
             groups.setdefault(label, []).append(value)
-        except ValueError:
+    return groups
+
+GROUPBY_AGGREGATES = ('count', 'mean', 'min', 'max', 'std')  # besides quantiles p0 to p100, e.g. p50
+GROUPBY_BLOCK = 65536  # rows bucketed per group at a time
+
+
+def _quantile_level(name):
+    """Return the quantile (0 to 1) named by an aggregate such as 'p95', or None."""
+    if name[:1] == 'p' and name[1:].isdigit() and int(name[1:]) <= 100:
+        return int(name[1:]) / 100
+    return None
+
+def parse_groupby_command(command_list):
+    """Return (key_indices, aggregates) for a groupby command.
+
+    Every word after 'groupby' (words may also be separated by commas) is either a
+    column to group by or an aggregate: 'count' (rows per group) or
+    'name(column)' on a numeric column, name being one of GROUPBY_AGGREGATES or a
+    quantile such as p50. Aggregates are (label, name, col_index) tuples, col_index
+    None for 'count'; without any aggregate the rows are counted.
+    """
+    keys, aggregates = [], []
+    for token in ' '.join(command_list[1:]).replace(',', ' ').split():
+        if token in headers:
+            keys.append(headers[token])
+            continue
+        if token == 'count':
+            aggregates.append((token, token, None))
             continue
+        name, parenthesis, column = token.partition('(')
+        if not parenthesis or not column.endswith(')'):
+            raise InvalidOptionError(f"'{token}' is neither a column nor an aggregate like mean(body_mass_g).")
+        column = column[:-1]
+        if column not in headers:
+            raise ColumnNotFoundError("That column does not exist. Try again.")
+        if headers[column] not in numeric_indices:
+            raise NotNumericColumnError(f"'{name}' can only aggregate numeric columns.")
+        if name not in GROUPBY_AGGREGATES and _quantile_level(name) is None:
+            raise InvalidOptionError(f"Unknown aggregate '{name}'. Use {', '.join(GROUPBY_AGGREGATES)} or a quantile like p50.")
+        aggregates.append((token, name, headers[column]))
+    if not keys:
+        raise MissingArgumentError("Please provide the columns to group by (e.g., 'groupby species,island mean(body_mass_g)')")
+    return keys, aggregates or [('count', 'count', None)]
+
+def _group_stats(dataset, keys, value_columns, compression):
+    """Return {key texts: [row count, {col_index: NumericStats}]} for the groups of one dataset.
+
+    Rows get a group number from a hash table on their key codes (the CSV text
+    for numeric keys). Each value column is then bucketed per group a block of
+    rows at a time, every bucket feeding the NumericStats of its group, or cut
+    into group segments with NumPy.
+    """
+    key_columns = [dataset.column(index) if index in numeric_indices else dataset.codes(index) for index in keys]
+    group_of = {}
+    group_ids = [group_of.setdefault(key, len(group_of)) for key in zip(*key_columns)]
+    stats = [{index: NumericStats(compression) for index in value_columns} for _ in group_of]
+    if backend == 'numpy' and group_ids:
+        group_ids = np.array(group_ids, dtype=np.intp)
+        order = np.argsort(group_ids, kind='stable')
+        counts = np.bincount(group_ids, minlength=len(group_of)).tolist()
+        bounds = np.cumsum([0] + counts).tolist()
+        for index in value_columns:
+            values = dataset.numeric_array(index)[order]
+            for group, group_stats in enumerate(stats):
+                group_stats[index].update_array(values[bounds[group]:bounds[group + 1]])
+    else:
+        counts = [0] * len(group_of)
+        for group in group_ids:
+            counts[group] += 1
+        for index in value_columns:
+            column = dataset.numeric(index)
+            for start in range(0, len(group_ids), GROUPBY_BLOCK):
+                buckets = [[] for _ in group_of]
+                appends = [bucket.append for bucket in buckets]
+                for group, value in zip(group_ids[start:start + GROUPBY_BLOCK], column[start:start + GROUPBY_BLOCK]):
+                    appends[group](value)
+                for group_stats, bucket in zip(stats, buckets):
+                    if bucket:
+                        group_stats[index].update(bucket)
+    categories = {index: dataset.categories(index) for index in keys if index not in numeric_indices}
+    groups = {}
+    for key, group in group_of.items():
+        texts = tuple(categories[index][cell] if index in categories else cell for index, cell in zip(keys, key))
+        groups[texts] = [counts[group], stats[group]]
     return groups
 
+def _group_order(keys):
+    """Return a sort key ordering group keys by their values, numbers numerically and 'NA' last."""
+    def order(texts):
+        return tuple((text in NULL_VALUES, float(text) if index in numeric_indices and text not in NULL_VALUES else 0.0,
+                      text) for index, text in zip(keys, texts))
+    return order
+
+def groupby_data(command_list, data):
+    """Aggregate numeric columns per group of rows sharing the same key columns.
+
+    e.g. 'groupby species,island count mean(body_mass_g) p50(flipper_length_mm)'
+    (see parse_groupby_command). Returns (columns, rows): the output column names,
+    then one row per group, sorted by key, of the key texts followed by the
+    aggregates (None where a group has no value). Everything is computed in a
+    single pass with hash aggregation into one NumericStats per group and column;
+    a PenguinStream is aggregated chunk by chunk, merging the groups.
+
+    Time complexity: O(n * a) for n rows and a aggregated columns.
+    Space complexity: O(n) group numbers, plus O(g * a) summaries for g groups.
+    """
+    keys, aggregates = parse_groupby_command(command_list)
+    value_columns = sorted({index for _, _, index in aggregates if index is not None})
+    needs_digest = any(_quantile_level(name) is not None for _, name, _ in aggregates)
+    compression = 100 if needs_digest else None
+    if isinstance(data, PenguinStream):
+        groups = {}
+        for batch in data.batches(sorted(set(keys) | set(value_columns))):
+            for key, (count, stats) in _group_stats(batch, keys, value_columns, compression).items():
+                if key not in groups:
+                    groups[key] = [count, stats]
+                    continue
+                groups[key][0] += count
+                for index, column_stats in stats.items():
+                    groups[key][1][index].merge(column_stats)
+    else:
+        dataset = as_dataset(data, sorted(set(keys) | set(value_columns)))
+        groups = _group_stats(dataset, keys, value_columns, compression)
+    columns = [list(headers)[index] for index in keys] + [label for label, _, _ in aggregates]
+    rows = []
+    for key in sorted(groups, key=_group_order(keys)):
+        count, stats = groups[key]
+        row = list(key)
+        for _, name, index in aggregates:
+            if index is None:
+                row.append(count)
+            elif _quantile_level(name) is not None:
+                row.append(stats[index].quantile(_quantile_level(name)))
+            else:
+                row.append(stats[index].summary()[name])
+        rows.append(row)
+    return columns, rows
+
 def generate_penguin_ascii():
     """Return a random penguin ASCII art string."""
     return """
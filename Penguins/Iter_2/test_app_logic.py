@@ -1,13 +1,41 @@
+import csv
+import math
+import os
+import pickle
+import random
+import statistics
+import tempfile
 import unittest
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from Python.Penguins.Iter_2.penguin_logic import (
     filter_data,
     describe_data,
+    describe_stats,
+    NumericStats,
     unique_data,
+    sort_data,
+    hist_data,
+    groupby_data,
+    set_backend,
+    SORT_ALGORITHMS,
+    PenguinDataset,
+    PenguinStream,
+    load_file_content,
+    read_cache,
+    cache_path,
+    augment_data,
+    InvalidOptionError,
     ColumnNotFoundError,
     MissingArgumentError,
     InvalidNumberError,
     NotNumericColumnError,
+    FilterSyntaxError,
+    InvalidOrderError,
 )
 
 
@@ -42,6 +70,30 @@ class TestFilterData(unittest.TestCase):
         with self.assertRaises(ColumnNotFoundError):
             filter_data(["filter", "unknown_col", "x"], self.data)
 
+    def test_filter_expression(self):
+        # 'and' binds tighter than 'or': reading either expression left to right gives [0] and [0, 1]
+        res = filter_data('filter species == Adelie and body_mass_g between 3700 3900 or island == Biscoe'.split(),
+                          self.data)
+        self.assertEqual([row for row in res], [self.data[0], self.data[1], self.data[3]])
+        res = filter_data(["filter", 'island == Biscoe or species == Adelie and body_mass_g between 3700 3900'],
+                          self.data)
+        self.assertEqual([row for row in res], [self.data[0], self.data[1], self.data[3]])
+        res = filter_data(["filter", '(island == Biscoe or species == Adelie) and body_mass_g between 3700 3900'],
+                          self.data)
+        self.assertEqual([row for row in res], [self.data[0], self.data[1]])
+        res = filter_data(["filter", 'not (island == Biscoe) and flipper_length_mm >= 185'], self.data)
+        self.assertEqual([row for row in res], [self.data[2]])
+        res = filter_data(["filter", 'species contains "Chin" or body_mass_g > 4500'], self.data)
+        self.assertEqual([row[0] for row in res], ["Chinstrap", "Gentoo"])
+
+    def test_filter_expression_errors(self):
+        with self.assertRaises(FilterSyntaxError):
+            filter_data(["filter", "island in (Dream"], self.data)
+        with self.assertRaises(NotNumericColumnError):
+            filter_data(["filter", "species > 3"], self.data)
+        with self.assertRaises(ColumnNotFoundError):
+            filter_data(["filter", "mass == 3"], self.data)
+
 
 class TestDescribeData(unittest.TestCase):
     def setUp(self):
@@ -77,6 +129,41 @@ class TestDescribeData(unittest.TestCase):
         res = describe_data(["describe", "body_mass_g"], data)
         self.assertIsNone(res)
 
+    def test_describe_stats(self):
+        stats = describe_stats(["describe", "body_mass_g"], self.data + [["D", "13", "0", "0", "NA", "I", "F"]])
+        self.assertEqual((stats.count, stats.null_count, stats.minimum, stats.maximum), (3, 1, 100.0, 300.0))
+        self.assertAlmostEqual(stats.mean, 200.0)
+        self.assertAlmostEqual(stats.std, 100.0)
+        self.assertEqual(stats.quantile(0.5), 200.0)
+        self.assertEqual(stats.summary()["p50"], 200.0)
+
+    def test_merged_stats_match_one_pass(self):
+        rng = random.Random(7)
+        values = [rng.gauss(4200, 800) for _ in range(20000)]
+        merged = NumericStats()
+        for start in range(0, len(values), 5000):
+            part = NumericStats()
+            part.update(values[start:start + 5000])
+            merged.merge(pickle.loads(pickle.dumps(part)))
+        self.assertEqual(merged.count, len(values))
+        self.assertAlmostEqual(merged.mean, statistics.fmean(values), places=6)
+        self.assertAlmostEqual(merged.std, statistics.stdev(values), places=6)
+        self.assertEqual((merged.minimum, merged.maximum), (min(values), max(values)))
+        ordered = sorted(values)
+        for q in (0.01, 0.25, 0.5, 0.75, 0.95):
+            self.assertAlmostEqual(merged.quantile(q), ordered[int(q * len(values))], delta=20)
+
+    def test_stats_from_generator_span_slices(self):
+        rng = random.Random(3)
+        values = [rng.uniform(0, 1000) for _ in range(5000)]
+        stats = NumericStats(compression=20)
+        stats.update(value if index % 7 else math.nan for index, value in enumerate(values))
+        present = [value for index, value in enumerate(values) if index % 7]
+        self.assertEqual((stats.count, stats.null_count), (len(present), len(values) - len(present)))
+        self.assertAlmostEqual(stats.mean, statistics.fmean(present), places=6)
+        self.assertEqual((stats.minimum, stats.maximum), (min(present), max(present)))
+        self.assertAlmostEqual(stats.quantile(0.5), statistics.median(present), delta=50)
+
 
 class TestUniqueData(unittest.TestCase):
     def setUp(self):
@@ -99,5 +186,378 @@ class TestUniqueData(unittest.TestCase):
             unique_data(["unique", "unknown"], self.data)
 
 
+class TestSortData(unittest.TestCase):
+    def setUp(self):
+        self.data = [
+            ["Gentoo", "217", "50.3", "19.0", "5000", "Biscoe", "M"],
+            ["Adelie", "181", "39.1", "18.1", "3750", "Torgersen", "F"],
+            ["Chinstrap", "195", "50.0", "19.8", "3800", "Biscoe", "M"],
+            ["Adelie", "190", "40.5", "17.5", "4000", "Dream", "F"],
+            ["Adelie", "186", "39.5", "17.4", "950", "Dream", "M"],
+            ["Gentoo", "210", "46.1", "13.2", "5000", "Biscoe", "F"],
+        ]
+
+    def test_sort_numeric_not_lexicographic(self):
+        res, elapsed = sort_data(["sort", "body_mass_g", "asc"], self.data)
+        self.assertEqual([row[4] for row in res], ["950", "3750", "3800", "4000", "5000", "5000"])
+        self.assertGreaterEqual(elapsed, 0)
+
+    def test_multi_column_every_algorithm(self):
+        expected = [self.data[i] for i in (3, 1, 4, 2, 0, 5)]
+        for algorithm in SORT_ALGORITHMS:
+            res, _ = sort_data(["sort", "species", "asc", "body_mass_g", "desc", algorithm], self.data)
+            self.assertEqual(res, expected, algorithm)
+
+    def test_sort_is_stable(self):
+        for algorithm in SORT_ALGORITHMS:
+            res, _ = sort_data(["sort", "island", "desc", algorithm], self.data)
+            self.assertEqual(res, [self.data[i] for i in (1, 3, 4, 0, 2, 5)], algorithm)
+
+    def test_sort_invalid_args(self):
+        with self.assertRaises(MissingArgumentError):
+            sort_data(["sort", "merge"], self.data)
+        with self.assertRaises(ColumnNotFoundError):
+            sort_data(["sort", "nope", "asc"], self.data)
+        with self.assertRaises(InvalidOrderError):
+            sort_data(["sort", "species", "asc", "island"], self.data)
+
+
+class TestPenguinDataset(unittest.TestCase):
+    def setUp(self):
+        self.rows = [
+            ["Adelie", "181", "39.1", "18.1", "3750", "Torgersen", "F"],
+            ["Gentoo", "217", "50.3", "NA", "5000", "Biscoe", "M"],
+            ["Adelie", "190", "40.5", "17.5", "", "Dream", "NA"],
+        ]
+        self.dataset = PenguinDataset(self.rows)
+
+    def test_typed_columns(self):
+        self.assertEqual(list(self.dataset.numeric(1)), [181.0, 217.0, 190.0])
+        self.assertEqual(self.dataset.categories(0), ["Adelie", "Gentoo"])
+        self.assertEqual(list(self.dataset.codes(0)), [0, 1, 0])
+        self.assertTrue(self.dataset.is_null(4, 2))
+        self.assertFalse(self.dataset.is_null(4, 1))
+        self.assertEqual([self.dataset.null_count(i) for i in range(7)], [0, 0, 0, 1, 1, 0, 1])
+
+    def test_rows_round_trip(self):
+        self.assertEqual(len(self.dataset), 3)
+        self.assertEqual(self.dataset[0], self.rows[0])
+        self.assertEqual(self.dataset[-1], ["Adelie", "190", "40.5", "17.5", "NA", "Dream", "NA"])
+        self.assertEqual(list(self.dataset[1:]), [self.dataset[1], self.dataset[2]])
+
+    def test_commands_match_list_of_rows(self):
+        self.assertEqual(describe_data(["describe", "body_mass_g"], self.dataset),
+                         describe_data(["describe", "body_mass_g"], self.rows))
+        self.assertEqual(list(filter_data(["filter", "species", "Adel"], self.dataset)),
+                         [self.dataset[0], self.dataset[2]])
+        self.assertEqual(unique_data(["unique", "sex"], self.dataset), {"F": 1, "M": 1, "NA": 1})
+        res, _ = sort_data(["sort", "body_mass_g", "desc"], self.dataset)
+        self.assertEqual([row[4] for row in res], ["NA", "5000", "3750"])
+
+
+class TestHistData(unittest.TestCase):
+    def setUp(self):
+        self.data = [
+            ["A", "10", "0", "0", "100", "I", "M"],
+            ["B", "12", "0", "0", "150", "I", "F"],
+            ["C", "15", "0", "0", "NA", "I", "M"],
+            ["D", "20", "0", "0", "300", "I", "F"],
+        ]
+
+    def test_hist_counts_and_edges(self):
+        counts, edges = hist_data(["hist", "flipper_length_mm", "2"], self.data)
+        self.assertEqual(counts, [2, 2])
+        self.assertEqual(edges, [10.0, 15.0, 20.0])
+
+    def test_hist_skips_missing_values(self):
+        counts, edges = hist_data(["hist", "body_mass_g", "4"], self.data)
+        self.assertEqual(counts, [1, 1, 0, 1])
+        self.assertEqual(edges[0], 100.0)
+        self.assertEqual(edges[-1], 300.0)
+
+    def test_hist_invalid_bins(self):
+        with self.assertRaises(InvalidNumberError):
+            hist_data(["hist", "body_mass_g", "0"], self.data)
+
+
+class TestPenguinStream(unittest.TestCase):
+    def setUp(self):
+        self.rows = [
+            ["Adelie", "181", "39.1", "18.1", "3750", "Torgersen", "F"],
+            ["Gentoo", "217", "50.3", "19.0", "5000", "Biscoe", "M"],
+            ["Adelie", "190", "40.5", "17.5", "NA", "Dream", "F"],
+            ["Chinstrap", "195", "50.0", "19.8", "3800", "Dream", "M"],
+            ["Gentoo", "210", "46.1", "13.2", "4400", "Biscoe", "F"],
+        ]
+        handle, self.path = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(handle, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["species", "flipper_length_mm", "culmen_length_mm", "culmen_depth_mm",
+                             "body_mass_g", "island", "sex"])
+            writer.writerows(self.rows)
+        self.addCleanup(os.remove, self.path)
+        self.progress = []
+        self.stream = PenguinStream(self.path, chunk_size=2,
+                                    progress=lambda read, size: self.progress.append((read, size)))
+
+    def test_chunks_and_progress(self):
+        self.assertEqual([len(batch) for batch in self.stream.batches()], [2, 2, 1])
+        self.assertEqual(len(self.progress), 3)
+        self.assertEqual(self.progress[-1][0], self.progress[-1][1])
+
+    def test_one_pass_commands_match_memory(self):
+        for command_list, command in ((["describe", "body_mass_g"], describe_data),
+                                      (["unique", "island"], unique_data),
+                                      (["unique", "body_mass_g"], unique_data),
+                                      (["hist", "flipper_length_mm", "3"], hist_data),
+                                      (["groupby", "island", "count", "max(body_mass_g)"], groupby_data)):
+            self.assertEqual(command(command_list, self.stream), command(command_list, self.rows), command_list)
+
+    def test_filter_to_file(self):
+        handle, output = tempfile.mkstemp(suffix=".csv")
+        os.close(handle)
+        self.addCleanup(os.remove, output)
+        self.assertEqual(filter_data(["filter", "body_mass_g", "3790", "into", output], self.stream), 3)
+        with open(output, newline="") as file:
+            self.assertEqual(list(csv.reader(file))[1:], [self.rows[1], self.rows[3], self.rows[4]])
+        with self.assertRaises(MissingArgumentError):
+            filter_data(["filter", "species", "Adelie"], self.stream)
+
+    def test_filter_stream_into_itself(self):
+        self.assertEqual(filter_data(["filter", "body_mass_g", "3790", "into", self.path], self.stream), 3)
+        with open(self.path, newline="") as file:
+            self.assertEqual(list(csv.reader(file))[1:], [self.rows[1], self.rows[3], self.rows[4]])
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+    def test_commands_needing_memory(self):
+        with self.assertRaises(InvalidOptionError):
+            sort_data(["sort", "species", "asc"], self.stream)
+
+
+class TestColumnCache(unittest.TestCase):
+    def setUp(self):
+        self.rows = [
+            ["Adelie", "181", "39.1", "18.1", "3750", "Torgersen", "F"],
+            ["Gentoo", "217", "50.3", "NA", "5000", "Biscoe", "M"],
+        ]
+        handle, self.path = tempfile.mkstemp(suffix=".csv")
+        os.close(handle)
+        self.write_csv(self.rows)
+        self.addCleanup(os.remove, self.path)
+        self.addCleanup(lambda: os.path.exists(cache_path(self.path)) and os.remove(cache_path(self.path)))
+
+    def write_csv(self, rows):
+        with open(self.path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["species", "flipper_length_mm", "culmen_length_mm", "culmen_depth_mm",
+                             "body_mass_g", "island", "sex"])
+            writer.writerows(rows)
+
+    def test_second_load_reads_cache(self):
+        self.assertIsNone(read_cache(self.path))
+        first = load_file_content(self.path)
+        cached = read_cache(self.path)
+        self.assertIsNotNone(cached)
+        self.assertEqual(list(cached), list(first))
+        self.assertTrue(cached.is_null(3, 1))
+        self.assertEqual(describe_data(["describe", "body_mass_g"], cached), (3750.0, 5000.0, 4375.0))
+
+    def test_changed_csv_is_parsed_again(self):
+        load_file_content(self.path)
+        self.write_csv(self.rows + [["Chinstrap", "195", "50.0", "19.8", "3800", "Dream", "M"]])
+        os.utime(self.path, ns=(0, 0))
+        self.assertIsNone(read_cache(self.path))
+        self.assertEqual(len(load_file_content(self.path)), 3)
+        self.assertEqual(len(read_cache(self.path)), 3)
+
+    def test_cached_dataset_can_grow(self):
+        load_file_content(self.path)
+        data, count, _ = augment_data(["augment", "100", "duplicate"], load_file_content(self.path))
+        self.assertEqual((len(data), count), (4, 2))
+
+
+class TestGroupByData(unittest.TestCase):
+    def setUp(self):
+        self.data = [
+            ["Adelie", "181", "39.1", "18.1", "3750", "Torgersen", "F"],
+            ["Gentoo", "217", "50.3", "19.0", "5000", "Biscoe", "M"],
+            ["Adelie", "190", "40.5", "17.5", "3250", "Dream", "F"],
+            ["Adelie", "186", "38.0", "18.0", "NA", "Torgersen", "M"],
+            ["Adelie", "195", "39.5", "18.5", "4250", "Torgersen", "M"],
+            ["Gentoo", "210", "46.1", "13.2", "4900", "Biscoe", "F"],
+        ]
+
+    def test_aggregates_per_group(self):
+        columns, rows = groupby_data(["groupby", "species,island", "count", "mean(body_mass_g)",
+                                      "max(flipper_length_mm)", "count(body_mass_g)"], self.data)
+        self.assertEqual(columns, ["species", "island", "count", "mean(body_mass_g)", "max(flipper_length_mm)",
+                                   "count(body_mass_g)"])
+        self.assertEqual(rows, [["Adelie", "Dream", 1, 3250.0, 190.0, 1],
+                                ["Adelie", "Torgersen", 3, 4000.0, 195.0, 2],
+                                ["Gentoo", "Biscoe", 2, 4950.0, 217.0, 2]])
+
+    def test_std_and_quantiles(self):
+        _, rows = groupby_data(["groupby", "species", "std(body_mass_g) p50(body_mass_g) min(body_mass_g)"], self.data)
+        self.assertAlmostEqual(rows[0][1], 500.0)
+        self.assertEqual(rows[0][2:], [3750.0, 3250.0])
+        self.assertAlmostEqual(rows[1][1], 70.71067811865476)
+
+    def test_numeric_keys_sort_numerically(self):
+        data = [["A", "99", "1", "1", "NA", "I", "M"]] + self.data
+        columns, rows = groupby_data(["groupby", "body_mass_g"], data)
+        self.assertEqual(columns, ["body_mass_g", "count"])
+        self.assertEqual([row[0] for row in rows], ["3250", "3750", "4250", "4900", "5000", "NA"])
+        self.assertEqual(rows[-1][1], 2)
+
+    def test_groupby_invalid_args(self):
+        with self.assertRaises(MissingArgumentError):
+            groupby_data(["groupby", "mean(body_mass_g)"], self.data)
+        with self.assertRaises(ColumnNotFoundError):
+            groupby_data(["groupby", "species", "mean(mass)"], self.data)
+        with self.assertRaises(NotNumericColumnError):
+            groupby_data(["groupby", "species", "mean(island)"], self.data)
+        with self.assertRaises(InvalidOptionError):
+            groupby_data(["groupby", "species", "median(body_mass_g)"], self.data)
+        with self.assertRaises(InvalidOptionError):
+            groupby_data(["groupby", "species", "weight"], self.data)
+
+
+class TestAugmentData(unittest.TestCase):
+    def setUp(self):
+        random.seed(11)
+        self.rows = [["Adelie", str(180 + i), "39.0", "18.0", str(3000 + 20 * i + (i % 3) * 5), "Dream", "F"]
+                     for i in range(10)]
+        self.rows += [["Gentoo", str(210 + i), "47.0", "15.0", str(5000 - 30 * i), "Biscoe", "M" if i % 2 else "NA"]
+                      for i in range(10)]
+        self.rows.append(["Gentoo", "215", "47.0", "15.0", "NA", "Biscoe", "M"])
+
+    def test_create_draws_within_observed_values(self):
+        for data in (PenguinDataset(self.rows), [list(row) for row in self.rows]):
+            data, count, action = augment_data(["augment", "200", "create"], data)
+            self.assertEqual((len(data), count, action), (63, 42, "create"))
+            for row in data[21:]:
+                self.assertTrue(180 <= float(row[1]) <= 219)
+                self.assertTrue(3000 <= float(row[4]) <= 5000)
+                self.assertIn(row[5], ("Dream", "Biscoe"))
+                self.assertIn(row[6], ("F", "M", "NA"))
+
+    def test_gaussian_keeps_species_correlations(self):
+        dataset, count, _ = augment_data(["augment", "2000", "gaussian"], PenguinDataset(self.rows))
+        self.assertEqual(count, 420)
+        new = [dataset[position] for position in range(21, len(dataset))]
+        gentoo = [row for row in new if row[0] == "Gentoo"]
+        self.assertTrue(150 < len(gentoo) < 290)
+        self.assertTrue(all(row[5] == "Biscoe" for row in gentoo))
+        self.assertTrue(all(row[5] == "Dream" and row[6] == "F" for row in new if row[0] == "Adelie"))
+        for species, sign in (("Adelie", 1), ("Gentoo", -1)):
+            rows = [row for row in new if row[0] == species]
+            correlation = statistics.correlation([float(row[1]) for row in rows], [float(row[4]) for row in rows])
+            self.assertGreater(sign * correlation, 0.9, species)
+        self.assertEqual(dataset.null_count(4), 1)
+        self.assertEqual(dataset.null_count(6), 5 + sum(row[6] == "NA" for row in gentoo))
+
+    def test_gaussian_rows_without_measurements_are_missing(self):
+        rows = [list(row) for row in self.rows] + [["Chinstrap", "NA", "NA", "NA", "NA", "Dream", "F"]] * 10
+        data, count, _ = augment_data(["augment", "500", "gaussian"], rows)
+        chinstrap = [row for row in data[31:] if row[0] == "Chinstrap"]
+        self.assertTrue(chinstrap)
+        self.assertTrue(all(row[1:5] == ["NA"] * 4 for row in chinstrap))
+        self.assertEqual(PenguinDataset(data).null_count(4), 11 + len(chinstrap))
+
+    def test_nan_number_is_missing(self):
+        dataset = PenguinDataset([["Adelie", math.nan, "39.0", "18.0", "3000", "Dream", "F"]])
+        self.assertEqual((dataset.null_count(1), dataset.null_count(4)), (1, 0))
+
+    def test_augment_nothing_and_invalid_option(self):
+        data, count, _ = augment_data(["augment", "0", "gaussian"], list(self.rows))
+        self.assertEqual((len(data), count), (21, 0))
+        with self.assertRaises(InvalidOptionError):
+            augment_data(["augment", "10", "sample"], self.rows)
+
+
+class TestSortedIndex(unittest.TestCase):
+    def setUp(self):
+        self.rows = [
+            ["Adelie", "181", "39.1", "18.1", "3750", "Torgersen", "F"],
+            ["Chinstrap", "195", "50.0", "19.8", "3800", "Biscoe", "M"],
+            ["Adelie", "190", "40.5", "17.5", "NA", "Dream", "F"],
+            ["Gentoo", "217", "50.3", "19.0", "5000", "Biscoe", "M"],
+            ["Gentoo", "210", "46.1", "13.2", "3800", "Biscoe", "F"],
+        ]
+        self.dataset = PenguinDataset(self.rows)
+
+    def test_range_filters_match_list_of_rows(self):
+        for expression in ["body_mass_g between 3700 3900", "body_mass_g > 3800", "body_mass_g <= 3800",
+                           "body_mass_g in (3750, 5000)", "body_mass_g == 3800 or flipper_length_mm < 185",
+                           "body_mass_g != 3800", "species == Gentoo and body_mass_g >= 3800"]:
+            self.assertEqual(list(filter_data(["filter", expression], self.dataset)),
+                             list(filter_data(["filter", expression], list(self.dataset))), expression)
+
+    def test_index_skips_missing_values(self):
+        filter_data(["filter", "body_mass_g > 0"], self.dataset)
+        self.assertTrue(self.dataset.has_index(4))
+        values, positions = self.dataset.sorted_index(4)
+        self.assertEqual(list(values), [3750.0, 3800.0, 3800.0, 5000.0])
+        self.assertEqual(list(positions), [0, 1, 4, 3])
+
+    def test_index_follows_appended_rows(self):
+        filter_data(["filter", "body_mass_g > 0"], self.dataset)
+        self.dataset.extend([["Adelie", "185", "38.0", "18.0", "3900", "Dream", "M"],
+                             ["Adelie", "186", "38.5", "18.2", "NA", "Dream", "F"]])
+        values, positions = self.dataset.sorted_index(4)
+        self.assertEqual(list(values), [3750.0, 3800.0, 3800.0, 3900.0, 5000.0])
+        self.assertEqual(list(positions), [0, 1, 4, 5, 3])
+        res = filter_data(["filter", "body_mass_g between 3800 3900"], self.dataset)
+        self.assertEqual([row[4] for row in res], ["3800", "3800", "3900"])
+
+    def test_single_command_datasets_are_not_indexed(self):
+        dataset = PenguinDataset(self.rows, indexable=False)
+        self.assertEqual(len(filter_data(["filter", "body_mass_g > 3750"], dataset)), 3)
+        self.assertFalse(dataset.has_index(4))
+
+
+class PurePythonBackend:
+    """Runs the tests of a TestCase with the pure Python backend instead of NumPy."""
+
+    def setUp(self):
+        self.addCleanup(set_backend, set_backend("python"))
+        super().setUp()
+
+
+@unittest.skipIf(numpy is None, "without NumPy the tests above already run in pure Python")
+class TestFilterDataPurePython(PurePythonBackend, TestFilterData):
+    pass
+
+
+@unittest.skipIf(numpy is None, "without NumPy the tests above already run in pure Python")
+class TestDescribeDataPurePython(PurePythonBackend, TestDescribeData):
+    pass
+
+
+@unittest.skipIf(numpy is None, "without NumPy the tests above already run in pure Python")
+class TestUniqueDataPurePython(PurePythonBackend, TestUniqueData):
+    pass
+
+
+@unittest.skipIf(numpy is None, "without NumPy the tests above already run in pure Python")
+class TestHistDataPurePython(PurePythonBackend, TestHistData):
+    pass
+
+
+@unittest.skipIf(numpy is None, "without NumPy the tests above already run in pure Python")
+class TestSortedIndexPurePython(PurePythonBackend, TestSortedIndex):
+    pass
+
+
+@unittest.skipIf(numpy is None, "without NumPy the tests above already run in pure Python")
+class TestGroupByDataPurePython(PurePythonBackend, TestGroupByData):
+    pass
+
+
+@unittest.skipIf(numpy is None, "without NumPy the tests above already run in pure Python")
+class TestAugmentDataPurePython(PurePythonBackend, TestAugmentData):
+    pass
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,333 @@
+"""Filter expressions shared by the penguin iterations (Iter_1/app.py and Iter_2/penguin_logic.py).
+
+Holds the column schema, the penguin errors, the tokenizer and parser of filter
+expressions and the and/or/not nodes of the clause tree. The leaves are the
+FilterClause subclasses of each iteration, which read its own column storage:
+`dataset` below is anything with len(dataset) rows that the leaves know how to read.
+"""
+
+headers = {
+    "species": 0,
+    "flipper_length_mm": 1,
+    "culmen_length_mm": 2,
+    "culmen_depth_mm": 3,
+    "body_mass_g": 4,
+    "island": 5,
+    "sex": 6
+}
+numeric_indices = [1, 2, 3, 4]
+# Custom exceptions
+class PenguinError(Exception):
+    """Base class for penguin app errors."""
+    pass
+
+class ColumnNotFoundError(PenguinError):
+    pass
+
+class MissingArgumentError(PenguinError):
+    pass
+
+class InvalidNumberError(PenguinError):
+    pass
+
+class NotNumericColumnError(PenguinError):
+    pass
+
+class InvalidOrderError(PenguinError):
+    pass
+
+class InvalidOptionError(PenguinError):
+    pass
+
+class FileMissingError(PenguinError):
+    pass
+
+class PlotError(PenguinError):
+    pass
+
+class FilterSyntaxError(PenguinError):
+    pass
+
+FILTER_OPERATORS = ('==', '!=', '>=', '<=', '>', '<')
+FILTER_KEYWORDS = ('and', 'or', 'not', 'between', 'in', 'contains', 'into')
+
+
+def tokenize_filter(expression):
+    """Split a filter expression into tokens, keeping quoted text together.
+
+    Returns a list of (kind, text) pairs, kind being 'op', 'word', 'text' (a
+    quoted string, quotes removed) or one of '(', ')', ','. Raises
+    FilterSyntaxError for an unterminated quote.
+    """
+    tokens = []
+    position = 0
+    while position < len(expression):
+        char = expression[position]
+        if char.isspace():
+            position += 1
+        elif char in '(),':
+            tokens.append((char, char))
+            position += 1
+        elif char in '"\'':
+            end = expression.find(char, position + 1)
+            if end < 0:
+                raise FilterSyntaxError("Unterminated quoted value in the filter expression.")
+            tokens.append(('text', expression[position + 1:end]))
+            position = end + 1
+        elif expression.startswith(FILTER_OPERATORS, position):
+            operator = next(op for op in FILTER_OPERATORS if expression.startswith(op, position))
+            tokens.append(('op', operator))
+            position += len(operator)
+        else:
+            end = position
+            while end < len(expression) and not expression[end].isspace() and expression[end] not in '(),"\'=!<>':
+                end += 1
+            if end == position:
+                raise FilterSyntaxError(f"Unexpected '{char}' in the filter expression.")
+            tokens.append(('word', expression[position:end]))
+            position = end
+    return tokens
+
+class FilterClause:
+    """A comparison of one column with constant values, e.g. body_mass_g between 3500 4500.
+
+    The comparison is compiled once into a predicate on one value (a float, or a
+    category). Each iteration subclasses it with estimate(dataset) and
+    evaluate(dataset, positions) for its own column storage. Missing numeric values
+    never match.
+    """
+
+    def __init__(self, column, operator, values):
+        if column not in headers:
+            raise ColumnNotFoundError(f"Column '{column}' does not exist. Try again.")
+        self.column = column
+        self.col_index = headers[column]
+        self.operator = operator
+        self.values = values
+        if self.col_index in numeric_indices:
+            if operator == 'contains':
+                raise FilterSyntaxError("'contains' only applies to text columns.")
+            try:
+                numbers = [float(value) for value in values]
+            except ValueError:
+                raise InvalidNumberError(f"Please provide valid numbers to compare {column} with.")
+            self._test = self._numeric_test(operator, numbers)
+        else:
+            if operator in ('>', '<', '>=', '<=', 'between'):
+                raise NotNumericColumnError(f"'{operator}' only applies to numeric columns.")
+            self._test = self._text_test(operator, values)
+
+    @staticmethod
+    def _numeric_test(operator, numbers):
+        """Return the predicate on one float for a numeric comparison."""
+        first = numbers[0]
+        if operator == '==':
+            return lambda value: value == first
+        if operator == '!=':
+            return lambda value: value == value and value != first
+        if operator == '>':
+            return lambda value: value > first
+        if operator == '>=':
+            return lambda value: value >= first
+        if operator == '<':
+            return lambda value: value < first
+        if operator == '<=':
+            return lambda value: value <= first
+        if operator == 'between':
+            low, high = min(numbers), max(numbers)
+            return lambda value: low <= value <= high
+        allowed = set(numbers)
+        return lambda value: value in allowed
+
+    @staticmethod
+    def _text_test(operator, values):
+        """Return the predicate on one category for a text comparison."""
+        first = values[0]
+        if operator == '==':
+            return lambda category: category == first
+        if operator == '!=':
+            return lambda category: category != first
+        if operator == 'contains':
+            return lambda category: first in category
+        allowed = set(values)
+        return lambda category: category in allowed
+
+    def columns(self):
+        """Return the indices of the columns the clause reads."""
+        return {self.col_index}
+
+class FilterAll:
+    """Clauses that must all match (and); the most selective is evaluated first."""
+
+    def __init__(self, clauses):
+        self.clauses = clauses
+
+    def columns(self):
+        return set().union(*(clause.columns() for clause in self.clauses))
+
+    def estimate(self, dataset):
+        estimate = 1.0
+        for clause in self.clauses:
+            estimate *= clause.estimate(dataset)
+        return estimate
+
+    def evaluate(self, dataset, positions=None):
+        """Narrow the candidate rows clause by clause, stopping once none is left."""
+        for clause in sorted(self.clauses, key=lambda clause: clause.estimate(dataset)):
+            positions = clause.evaluate(dataset, positions)
+            if not positions:
+                return []
+        return positions
+
+class FilterAny:
+    """Clauses of which one must match (or); the least selective is evaluated first."""
+
+    def __init__(self, clauses):
+        self.clauses = clauses
+
+    def columns(self):
+        return set().union(*(clause.columns() for clause in self.clauses))
+
+    def estimate(self, dataset):
+        estimate = 1.0
+        for clause in self.clauses:
+            estimate *= 1.0 - clause.estimate(dataset)
+        return 1.0 - estimate
+
+    def evaluate(self, dataset, positions=None):
+        """Test each clause only on the rows no earlier clause matched, stopping once none is left."""
+        remaining = positions
+        matched = []
+        for clause in sorted(self.clauses, key=lambda clause: clause.estimate(dataset), reverse=True):
+            hits = clause.evaluate(dataset, remaining)
+            if hits:
+                matched += hits
+                hit_set = set(hits)
+                candidates = range(len(dataset)) if remaining is None else remaining
+                remaining = [position for position in candidates if position not in hit_set]
+                if not remaining:
+                    break
+        return sorted(matched)
+
+class FilterNot:
+    """The rows a clause does not match (not)."""
+
+    def __init__(self, clause):
+        self.clause = clause
+
+    def columns(self):
+        return self.clause.columns()
+
+    def estimate(self, dataset):
+        return 1.0 - self.clause.estimate(dataset)
+
+    def evaluate(self, dataset, positions=None):
+        candidates = range(len(dataset)) if positions is None else positions
+        excluded = set(self.clause.evaluate(dataset, positions))
+        return [position for position in candidates if position not in excluded]
+
+class _FilterParser:
+    """Recursive descent parser of the filter expression grammar:
+
+        expression := term ('or' term)*
+        term       := factor ('and' factor)*
+        factor     := 'not' factor | '(' expression ')' | clause
+        clause     := column ('==' | '!=' | '>' | '>=' | '<' | '<=') value
+                    | column 'between' value value
+                    | column 'in' '(' value (',' value)* ')'
+                    | column 'contains' value
+    """
+
+    def __init__(self, tokens, clause_class):
+        self.tokens = tokens
+        self.clause_class = clause_class
+        self.position = 0
+
+    def peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, None)
+
+    def next(self, expected=None):
+        kind, text = self.peek()
+        if kind is None:
+            raise FilterSyntaxError("The filter expression ends too early.")
+        if expected is not None and text != expected:
+            raise FilterSyntaxError(f"Expected '{expected}' but found '{text}' in the filter expression.")
+        self.position += 1
+        return kind, text
+
+    def keyword(self, word):
+        kind, text = self.peek()
+        if kind == 'word' and text.lower() == word:
+            self.position += 1
+            return True
+        return False
+
+    def expression(self):
+        clauses = [self.term()]
+        while self.keyword('or'):
+            clauses.append(self.term())
+        return clauses[0] if len(clauses) == 1 else FilterAny(clauses)
+
+    def term(self):
+        clauses = [self.factor()]
+        while self.keyword('and'):
+            clauses.append(self.factor())
+        return clauses[0] if len(clauses) == 1 else FilterAll(clauses)
+
+    def factor(self):
+        if self.keyword('not'):
+            return FilterNot(self.factor())
+        if self.peek()[0] == '(':
+            self.next()
+            clause = self.expression()
+            self.next(')')
+            return clause
+        return self.clause()
+
+    def value(self):
+        kind, text = self.next()
+        if kind not in ('word', 'text'):
+            raise FilterSyntaxError(f"Expected a value but found '{text}' in the filter expression.")
+        return text
+
+    def clause(self):
+        kind, column = self.next()
+        if kind != 'word':
+            raise FilterSyntaxError(f"Expected a column name but found '{column}' in the filter expression.")
+        if column not in headers:
+            raise ColumnNotFoundError(f"Column '{column}' does not exist. Try again.")
+        if self.peek()[0] is None:
+            raise MissingArgumentError(f"Please provide a comparison for {column} (e.g., '{column} == value').")
+        kind, operator = self.next()
+        operator = operator.lower() if kind == 'word' else operator
+        if kind == 'op':
+            return self.clause_class(column, operator, [self.value()])
+        if operator == 'between':
+            return self.clause_class(column, operator, [self.value(), self.value()])
+        if operator == 'contains':
+            return self.clause_class(column, operator, [self.value()])
+        if operator == 'in':
+            self.next('(')
+            values = [self.value()]
+            while self.peek()[0] == ',':
+                self.next()
+                values.append(self.value())
+            self.next(')')
+            return self.clause_class(column, operator, values)
+        raise FilterSyntaxError(f"Unknown comparison '{operator}' in the filter expression.")
+
+def parse_filter(expression, clause_class):
+    """Parse a filter expression into a tree of FilterAll/FilterAny/FilterNot and `clause_class` leaves.
+
+    e.g. 'species == "Adelie Penguin (Pygoscelis adeliae)" and body_mass_g between 3500 4500
+    or island in (Dream, Biscoe)' ('and' binds tighter than 'or'). `clause_class`
+    is the FilterClause subclass of the calling iteration. Raises PenguinError
+    subclasses for invalid expressions.
+    """
+    parser = _FilterParser(tokenize_filter(expression), clause_class)
+    if not parser.tokens:
+        raise MissingArgumentError("Please provide a filter expression (e.g., 'filter body_mass_g between 3500 4500')")
+    tree = parser.expression()
+    if parser.position < len(parser.tokens):
+        raise FilterSyntaxError(f"Unexpected '{parser.peek()[1]}' in the filter expression.")
+    return tree
@@ -0,0 +1,373 @@
+"""One-pass statistics shared by the penguin iterations (Iter_1/app.py and Iter_2/penguin_logic.py).
+
+NumericStats summarizes a numeric column (count, missing values, min, max,
+mean, variance) with a TDigest for its quantiles, in memory bounded by the
+digest whatever the number of values. MultivariateStats does the same for
+the mean vector and covariance matrix of several columns, and sample_gaussian
+draws rows from the Gaussian it describes (the 'gaussian' augment option).
+"""
+
+import heapq
+import math
+import random
+from bisect import bisect_left
+from itertools import islice
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only update_array needs it
+    np = None
+
+DESCRIBE_QUANTILES = (0.25, 0.5, 0.75, 0.95)  # quantiles reported by describe
+
+
+class TDigest:
+    """Mergeable sketch of a distribution, answering approximate quantiles.
+
+    Values are buffered and merged, in sorted order, into at most about
+    `compression` centroids (mean, weight), small near the tails and larger in
+    the middle (the k1 scale function of the t-digest), so quantiles near 0 and 1
+    stay accurate. Two digests, e.g. of two chunks of a file or two processes,
+    are combined with merge().
+
+    Space complexity: O(compression), whatever the number of values.
+    """
+
+    def __init__(self, compression=100):
+        self.compression = compression
+        self.total = 0
+        self.minimum = None
+        self.maximum = None
+        self._means = []
+        self._weights = []
+        self._buffer = []  # values of weight 1
+        self._weighted = []  # (value, weight) pairs
+
+    def add(self, value, weight=1):
+        """Add a value (`weight` times)."""
+        if weight == 1:
+            self._buffer.append(value)
+        else:
+            self._weighted.append((value, weight))
+        if len(self._buffer) + len(self._weighted) >= 10 * self.compression:
+            self._compress()
+
+    def update(self, values):
+        """Add every value of an iterable."""
+        values = iter(values)
+        while True:
+            self._buffer.extend(islice(values, 10 * self.compression - len(self._buffer)))
+            if len(self._buffer) < 10 * self.compression:
+                return
+            self._compress()
+
+    def merge(self, other):
+        """Add the values summarized by another digest."""
+        other._compress()
+        if not other.total:
+            return
+        self._weighted.extend(zip(other._means, other._weights))
+        self._compress()
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    def _limit(self, q):
+        """Return the largest quantile a centroid starting at quantile `q` may reach."""
+        k = self.compression / (2 * math.pi) * math.asin(2 * min(q, 1.0) - 1) + 1
+        if k >= self.compression / 4:
+            return 1.0
+        return (math.sin(2 * math.pi * k / self.compression) + 1) / 2
+
+    def _compress(self):
+        """Merge the buffered values into the centroids.
+
+        Runs of buffered values falling between two centroids are taken by
+        slices, so the loop runs about once per centroid rather than per value.
+
+        Time complexity: O(b log b + c) for b buffered values and c centroids.
+        """
+        if not self._buffer and not self._weighted:
+            return
+        values = sorted(self._buffer)
+        weighted = sorted(self._weighted)
+        self._buffer, self._weighted = [], []
+        low = min(values[0] if values else math.inf, weighted[0][0] if weighted else math.inf)
+        high = max(values[-1] if values else -math.inf, weighted[-1][0] if weighted else -math.inf)
+        self.minimum = low if self.minimum is None else min(self.minimum, low)
+        self.maximum = high if self.maximum is None else max(self.maximum, high)
+        centroids = list(heapq.merge(zip(self._means, self._weights), weighted))
+        total = self.total + len(values) + sum(weight for _, weight in weighted)
+        means, weights = [], []
+        done = current_weight = current_sum = 0
+        limit = self._limit(0.0)
+        i = j = 0
+        while i < len(centroids) or j < len(values):
+            if i < len(centroids) and (j == len(values) or centroids[i][0] <= values[j]):
+                mean, weight = centroids[i]
+                if current_weight and current_weight + weight > limit * total - done:
+                    means.append(current_sum / current_weight)
+                    weights.append(current_weight)
+                    done += current_weight
+                    limit = self._limit(done / total)
+                    current_weight = current_sum = 0
+                current_weight += weight
+                current_sum += mean * weight
+                i += 1
+            else:
+                stop = bisect_left(values, centroids[i][0], j) if i < len(centroids) else len(values)
+                room = limit * total - done - current_weight
+                if current_weight and room < 1:
+                    means.append(current_sum / current_weight)
+                    weights.append(current_weight)
+                    done += current_weight
+                    limit = self._limit(done / total)
+                    current_weight = current_sum = 0
+                    room = limit * total - done
+                taken = min(stop - j, max(1, int(room)))
+                current_weight += taken
+                current_sum += sum(values[j:j + taken])
+                j += taken
+        means.append(current_sum / current_weight)
+        weights.append(current_weight)
+        self._means, self._weights, self.total = means, weights, total
+
+    def quantile(self, q):
+        """Return the approximate value at quantile `q` (0 to 1), or None if the digest is empty.
+
+        Interpolates linearly between the centres of neighbouring centroids, and
+        between the outer centroids and the exact minimum and maximum.
+        """
+        self._compress()
+        if not self.total:
+            return None
+        target = q * self.total
+        means, weights = self._means, self._weights
+        if target <= weights[0] / 2:
+            return self.minimum + (means[0] - self.minimum) * target / (weights[0] / 2)
+        centre = weights[0] / 2
+        for i in range(len(means) - 1):
+            next_centre = centre + (weights[i] + weights[i + 1]) / 2
+            if target <= next_centre:
+                return means[i] + (means[i + 1] - means[i]) * (target - centre) / (next_centre - centre)
+            centre = next_centre
+        tail = self.total - centre
+        return means[-1] + (self.maximum - means[-1]) * min(1.0, (target - centre) / tail) if tail else means[-1]
+
+
+class NumericStats:
+    """One-pass summary of a numeric column: count, missing values, min, max, mean, variance and quantiles.
+
+    The mean and variance are updated with Welford's method and the values
+    reach the digest a bounded slice at a time, so no more than one slice of
+    values is kept; quantiles come from a TDigest, unless `compression` is None
+    (no quantile needed). Summaries of separate chunks (or of separate
+    processes, the object pickles) are combined with merge().
+
+    Space complexity: O(1) plus the O(compression) digest.
+    """
+
+    def __init__(self, compression=100):
+        self.count = 0
+        self.null_count = 0
+        self.mean = 0.0
+        self.minimum = None
+        self.maximum = None
+        self._m2 = 0.0  # sum of squared differences from the mean
+        self.digest = TDigest(compression) if compression else None
+
+    def update(self, values):
+        """Add every value of an iterable of floats; NaN counts as a missing value.
+
+        The values are read a slice of 10 * compression at a time (the size at
+        which the digest compresses its buffer), and each slice is handed to the
+        digest before the next one is read.
+
+        Time complexity: O(n) plus the digest updates.
+        Space complexity: O(compression).
+        """
+        values = iter(values)
+        size = 10 * self.digest.compression if self.digest is not None else 1000
+        count, mean, m2 = self.count, self.mean, self._m2
+        minimum, maximum = self.minimum, self.maximum
+        block = list(islice(values, size))
+        while block:
+            present = []
+            for value in block:
+                if value != value:
+                    self.null_count += 1
+                    continue
+                count += 1
+                delta = value - mean
+                mean += delta / count
+                m2 += delta * (value - mean)
+                if minimum is None or value < minimum:
+                    minimum = value
+                if maximum is None or value > maximum:
+                    maximum = value
+                present.append(value)
+            if self.digest is not None:
+                self.digest.update(present)
+            block = list(islice(values, size))
+        self.count, self.mean, self._m2 = count, mean, m2
+        self.minimum, self.maximum = minimum, maximum
+
+    def update_array(self, values):
+        """Add a NumPy float array, summarizing it vectorised and merging the result.
+
+        The digest receives the distinct values with their counts, which is
+        exact and much smaller for measured columns.
+        """
+        present = values[~np.isnan(values)]
+        batch = NumericStats(self.digest.compression if self.digest is not None else None)
+        batch.null_count = int(values.size - present.size)
+        if present.size:
+            batch.count = int(present.size)
+            batch.mean = float(present.mean())
+            batch._m2 = float(((present - batch.mean) ** 2).sum())
+            batch.minimum, batch.maximum = float(present.min()), float(present.max())
+        if present.size and batch.digest is not None:
+            distinct, counts = np.unique(present, return_counts=True)
+            for value, weight in zip(distinct.tolist(), counts.tolist()):
+                batch.digest.add(value, weight)
+        self.merge(batch)
+
+    def merge(self, other):
+        """Add the values summarized by another NumericStats (Chan et al.'s parallel update)."""
+        self.null_count += other.null_count
+        if not other.count:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.minimum = other.minimum if self.minimum is None else min(self.minimum, other.minimum)
+        self.maximum = other.maximum if self.maximum is None else max(self.maximum, other.maximum)
+        if self.digest is not None and other.digest is not None:
+            self.digest.merge(other.digest)
+
+    @property
+    def variance(self):
+        """Return the sample variance, or None with fewer than two values."""
+        return self._m2 / (self.count - 1) if self.count > 1 else None
+
+    @property
+    def std(self):
+        """Return the sample standard deviation, or None with fewer than two values."""
+        return math.sqrt(self.variance) if self.count > 1 else None
+
+    def quantile(self, q):
+        """Return the approximate value at quantile `q` (0 to 1), or None without values or digest."""
+        return self.digest.quantile(q) if self.digest is not None else None
+
+    def summary(self):
+        """Return the statistics as a dict: count, nulls, min, max, mean, std and p25/p50/p75/p95."""
+        result = {'count': self.count, 'nulls': self.null_count, 'min': self.minimum, 'max': self.maximum,
+                  'mean': self.mean if self.count else None, 'std': self.std}
+        for q in DESCRIBE_QUANTILES:
+            result[f'p{round(q * 100)}'] = self.quantile(q)
+        return result
+
+
+class MultivariateStats:
+    """One-pass mean vector and covariance matrix of several numeric columns.
+
+    Values are added a block at a time: the block's own mean and co-moments are
+    computed over its columns, then merged into the totals with the pairwise
+    update used by NumericStats.merge, so no value is kept between blocks.
+    """
+
+    def __init__(self, size):
+        self.count = 0
+        self.mean = [0.0] * size
+        self._comoment = [[0.0] * size for _ in range(size)]  # sums of products of deviations
+
+    def update(self, columns):
+        """Add a block of rows given as one list of floats per column, without missing values."""
+        count = len(columns[0])
+        if not count:
+            return
+        block = MultivariateStats(len(columns))
+        block.count = count
+        block.mean = [sum(column) / count for column in columns]
+        centred = [[value - mean for value in column] for column, mean in zip(columns, block.mean)]
+        for i, first in enumerate(centred):
+            for j in range(i + 1):
+                block._comoment[i][j] = block._comoment[j][i] = sum(map(float.__mul__, first, centred[j]))
+        self.merge(block)
+
+    def merge(self, other):
+        """Add the rows summarized by another MultivariateStats."""
+        if not other.count:
+            return
+        count = self.count + other.count
+        delta = [b - a for a, b in zip(self.mean, other.mean)]
+        weight = self.count * other.count / count
+        for i, row in enumerate(self._comoment):
+            for j in range(len(row)):
+                row[j] += other._comoment[i][j] + delta[i] * delta[j] * weight
+        self.mean = [mean + step * other.count / count for mean, step in zip(self.mean, delta)]
+        self.count = count
+
+    def update_array(self, matrix):
+        """Add a NumPy matrix of rows (one column per variable), without missing values."""
+        if not len(matrix):
+            return
+        block = MultivariateStats(matrix.shape[1])
+        block.count = len(matrix)
+        block.mean = matrix.mean(axis=0).tolist()
+        centred = matrix - matrix.mean(axis=0)
+        block._comoment = (centred.T @ centred).tolist()
+        self.merge(block)
+
+    @property
+    def covariance(self):
+        """Return the sample covariance matrix (zeros with fewer than two rows)."""
+        divisor = self.count - 1 if self.count > 1 else 1
+        return [[value / divisor for value in row] for row in self._comoment]
+
+
+def _cholesky(matrix):
+    """Return the lower triangular L with L * L^T = `matrix`, a covariance matrix.
+
+    A non-positive pivot (a constant column, or columns moving together
+    exactly) gives a zero column instead of failing.
+    """
+    size = len(matrix)
+    lower = [[0.0] * size for _ in range(size)]
+    for i in range(size):
+        for j in range(i + 1):
+            rest = matrix[i][j] - sum(lower[i][k] * lower[j][k] for k in range(j))
+            if i == j:
+                lower[i][i] = math.sqrt(rest) if rest > 0 else 0.0
+            else:
+                lower[i][j] = rest / lower[j][j] if lower[j][j] else 0.0
+    return lower
+
+def _standard_normals(count):
+    """Return `count` independent standard normal floats, drawn in bulk with the Box-Muller transform."""
+    draw = random.random
+    half = (count + 1) // 2
+    radii = [math.sqrt(-2.0 * math.log(1.0 - draw())) for _ in range(half)]
+    angles = [2.0 * math.pi * draw() for _ in range(half)]
+    normals = list(map(float.__mul__, radii, map(math.cos, angles)))
+    normals += map(float.__mul__, radii, map(math.sin, angles))
+    del normals[count:]
+    return normals
+
+def sample_gaussian(fit, count):
+    """Draw `count` rows from the multivariate Gaussian summarized by a MultivariateStats.
+
+    Independent standard normals are correlated with the Cholesky factor of
+    the covariance. Returns one list of floats per variable.
+    """
+    lower = _cholesky(fit.covariance)
+    normals = [_standard_normals(count) for _ in fit.mean]
+    columns = []
+    for i, mean in enumerate(fit.mean):
+        values = [mean] * count
+        for j in range(i + 1):
+            if lower[i][j]:
+                values = [value + lower[i][j] * normal for value, normal in zip(values, normals[j])]
+        columns.append(values)
+    return columns